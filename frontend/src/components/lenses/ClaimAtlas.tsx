@@ -2,7 +2,8 @@
 
 import { useState, useMemo } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
-import { useClaims } from '@/lib/useData'
+import { useClaims, useLinkGraph } from '@/lib/useData'
+import { useSearch } from '@/lib/search'
 import { LensLayout, DetailPanel, SpeakerBadge, ClaimTypeBadge } from './LensLayout'
 import type { Claim, ThematicCluster } from '@/lib/types'
 
@@ -113,12 +114,14 @@ function ClusterView({
 function ClaimDetail({
   claim,
   responses,
+  backlinks,
   onClose,
   onSelectClaim,
   allClaims,
 }: {
   claim: Claim
   responses: string[]
+  backlinks: { ref: string; title: string }[]
   onClose: () => void
   onSelectClaim: (claim: Claim) => void
   allClaims: Claim[]
@@ -215,6 +218,35 @@ function ClaimDetail({
           </div>
         )}
 
+        {backlinks.length > 0 && (
+          <div>
+            <h4 className="text-xs uppercase tracking-wider text-ink-tertiary mb-2">
+              Linked From the Wiki
+            </h4>
+            <div className="flex flex-wrap gap-1">
+              {backlinks.map(({ ref, title }) => {
+                const [kind, key] = ref.split('/')
+                const linkedClaim = kind === 'claims'
+                  ? allClaims.find((c) => c.id.toLowerCase() === key)
+                  : undefined
+                return linkedClaim ? (
+                  <button
+                    key={ref}
+                    onClick={() => onSelectClaim(linkedClaim)}
+                    className="text-xs font-mono bg-field-subtle px-2 py-0.5 rounded hover:bg-field-deep transition-colors"
+                  >
+                    {linkedClaim.id}
+                  </button>
+                ) : (
+                  <span key={ref} className="text-xs bg-field-subtle px-2 py-0.5 rounded" title={ref}>
+                    {title}
+                  </span>
+                )
+              })}
+            </div>
+          </div>
+        )}
+
         <div>
           <h4 className="text-xs uppercase tracking-wider text-ink-tertiary mb-2">
             Engagement Level
@@ -230,12 +262,15 @@ function ClaimDetail({
 
 export function ClaimAtlas() {
   const { data, loading, error } = useClaims()
+  const { data: linkGraph } = useLinkGraph()
   const [selectedClaim, setSelectedClaim] = useState<Claim | null>(null)
   const [filter, setFilter] = useState<{
     speaker: string | null
     type: string | null
   }>({ speaker: null, type: null })
   const [viewMode, setViewMode] = useState<'clusters' | 'list'>('clusters')
+  const [query, setQuery] = useState('')
+  const { results: searchResults } = useSearch(query, data?.claims.length || 10, ['claim'])
 
   // Build engagement map (claim -> responses)
   const engagementMap = useMemo(() => {
@@ -250,15 +285,30 @@ export function ClaimAtlas() {
     return map
   }, [data])
 
-  // Filter claims
+  // Filter claims; a search keeps the matches, best first
   const filteredClaims = useMemo(() => {
     if (!data) return []
-    return data.claims.filter((c) => {
+    const claims = data.claims.filter((c) => {
       if (filter.speaker && c.speaker !== filter.speaker) return false
       if (filter.type && c.type !== filter.type) return false
       return true
     })
-  }, [data, filter])
+    if (!searchResults) return claims
+    const rank = new Map(searchResults.map((r, i) => [r.ref, i]))
+    return claims
+      .filter((c) => rank.has(c.id))
+      .sort((a, b) => rank.get(a.id)! - rank.get(b.id)!)
+  }, [data, filter, searchResults])
+
+  // Wiki pages linking to a claim's page (claims/d13), with their titles
+  const wikiBacklinks = useMemo(() => {
+    const titles = new Map(linkGraph?.index.pages || [])
+    return (claim: Claim) =>
+      (linkGraph?.backlinks(`claims/${claim.id.toLowerCase()}`) || []).map((ref) => ({
+        ref,
+        title: titles.get(ref) || ref,
+      }))
+  }, [linkGraph])
 
   const sidebar = useMemo(() => {
     if (selectedClaim) {
@@ -266,6 +316,7 @@ export function ClaimAtlas() {
         <ClaimDetail
           claim={selectedClaim}
           responses={engagementMap.get(selectedClaim.id) || []}
+          backlinks={wikiBacklinks(selectedClaim)}
           onClose={() => setSelectedClaim(null)}
           onSelectClaim={setSelectedClaim}
           allClaims={data?.claims || []}
@@ -321,7 +372,7 @@ export function ClaimAtlas() {
         )}
       </div>
     )
-  }, [selectedClaim, data, engagementMap])
+  }, [selectedClaim, data, engagementMap, wikiBacklinks])
 
   return (
     <LensLayout
@@ -351,6 +402,14 @@ export function ClaimAtlas() {
             </div>
 
             <div className="flex gap-1 ml-auto">
+              <input
+                type="search"
+                value={query}
+                onChange={(e) => setQuery(e.target.value)}
+                placeholder="Search claims"
+                className="bg-field-subtle text-sm rounded-lg px-3 py-1.5 border-0"
+              />
+
               <select
                 value={filter.speaker || ''}
                 onChange={(e) =>
@@ -2,12 +2,13 @@
 
 import { useState, useMemo } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
-import { useFlow } from '@/lib/useData'
+import { useFlow, useResponses } from '@/lib/useData'
 import { LensLayout, DetailPanel, SpeakerBadge } from './LensLayout'
-import type { FlowPhase, InflectionPoint } from '@/lib/types'
+import type { FlowPhase, InflectionPoint, ResponseEdges } from '@/lib/types'
 
 // Design token colors for SVG (mirrors CSS custom properties)
 const MARCUS_COLOR = '#C45A3C'      // --marcus
+const DEMARTINI_COLOR = '#2E6B8A'   // --demartini
 const BORDER_COLOR = '#E8E8E6'      // --border
 const INSIGHT_COLOR = '#D4A853'     // --insight (for inflection points)
 
@@ -169,6 +170,33 @@ function EmotionalArc({
   )
 }
 
+// Direct responses: an arc from each chunk to the other speaker's reply,
+// drawn above the axis for Marcus and below it for Demartini
+function ResponseArcs({ responses, maxTime }: { responses: ResponseEdges; maxTime: number }) {
+  const { time, lag, score, speaker } = responses.edges
+  return (
+    <svg className="w-full h-24" viewBox="0 0 100 100" preserveAspectRatio="none">
+      <line x1="0" y1="50" x2="100" y2="50" stroke={BORDER_COLOR} strokeWidth="0.2" />
+      {time.map((t, i) => {
+        const x1 = (t / maxTime) * 100
+        const x2 = ((t + lag[i]) / maxTime) * 100
+        const up = speaker[i] === 'marcus'
+        const height = Math.min(45, 8 + (x2 - x1) * 6)
+        return (
+          <path
+            key={i}
+            d={`M ${x1} 50 Q ${(x1 + x2) / 2} ${up ? 50 - height : 50 + height} ${x2} 50`}
+            fill="none"
+            stroke={up ? MARCUS_COLOR : DEMARTINI_COLOR}
+            strokeOpacity={Math.max(0.15, (score[i] - 0.5) * 2)}
+            strokeWidth="0.2"
+          />
+        )
+      })}
+    </svg>
+  )
+}
+
 // Phase detail sidebar
 function PhaseDetail({ phase, onClose }: { phase: FlowPhase; onClose: () => void }) {
   return (
@@ -260,6 +288,7 @@ function InflectionDetail({
 
 export function DialecticalFlow() {
   const { data, loading, error } = useFlow()
+  const { data: responses } = useResponses()
   const [selectedPhase, setSelectedPhase] = useState<FlowPhase | null>(null)
   const [selectedInflection, setSelectedInflection] = useState<InflectionPoint | null>(null)
 
@@ -321,6 +350,18 @@ export function DialecticalFlow() {
             <p className="text-xs text-ink-tertiary mt-2">{data.emotional_arc.description}</p>
           </div>
 
+          {/* Cross-speaker responses (optional data; the lens works without it) */}
+          {responses && responses.edges.time.length > 0 && (
+            <div className="card">
+              <h3 className="text-sm font-medium text-ink-secondary mb-2">Direct Responses</h3>
+              <ResponseArcs responses={responses} maxTime={maxTime} />
+              <p className="text-xs text-ink-tertiary mt-2">
+                {responses.metadata.num_edges} moments where one speaker answers the other within{' '}
+                {Math.round(responses.metadata.window_seconds / 60)} minutes (Marcus above, Demartini below)
+              </p>
+            </div>
+          )}
+
           {/* Timeline */}
           <div className="card">
             <h3 className="text-sm font-medium text-ink-secondary mb-4">Conversation Phases</h3>
@@ -5,9 +5,9 @@ import { Canvas, useFrame } from '@react-three/fiber'
 import { OrbitControls, PerspectiveCamera, Html } from '@react-three/drei'
 import { motion, AnimatePresence } from 'framer-motion'
 import * as THREE from 'three'
-import { useLandscape } from '@/lib/useData'
+import { useLandscape, useTranscriptWindow } from '@/lib/useData'
 import { LensLayout, DetailPanel, SpeakerBadge } from './LensLayout'
-import type { LandscapePoint, LandscapeCluster } from '@/lib/types'
+import type { LandscapePoint, LandscapeCluster, TranscriptSegment } from '@/lib/types'
 
 // Temporal visibility states
 type TemporalState = 'future' | 'current' | 'past' | 'all'
@@ -466,6 +466,7 @@ function PlaybackControls({
   onReset,
   onSpeedChange,
   currentPoint,
+  currentSegment,
 }: {
   currentTime: number
   maxTime: number
@@ -476,6 +477,7 @@ function PlaybackControls({
   onReset: () => void
   onSpeedChange: (speed: number) => void
   currentPoint: LandscapePoint | null
+  currentSegment: TranscriptSegment | null
 }) {
   const formatTime = (seconds: number) => {
     const mins = Math.floor(seconds / 60)
@@ -496,6 +498,13 @@ function PlaybackControls({
         </div>
       )}
 
+      {/* Line being spoken, from the transcript shard for this window */}
+      {currentSegment && (
+        <p className="mb-3 text-xs italic text-ink-tertiary line-clamp-2">
+          {formatTime(currentSegment.start_time)} “{currentSegment.text}”
+        </p>
+      )}
+
       {/* Timeline scrubber */}
       <div className="mb-3">
         <input
@@ -594,6 +603,13 @@ export function SemanticLandscape() {
     }) || null
   }, [data, currentTime, viewMode])
 
+  // Transcript segment under the playhead (loads one time shard at a time)
+  const { segments: windowSegments } = useTranscriptWindow(viewMode === 'temporal' ? currentTime : null)
+  const currentSegment = useMemo(() => {
+    if (viewMode !== 'temporal' || !windowSegments) return null
+    return windowSegments.find((s) => s.start_time <= currentTime && s.end_time >= currentTime) || null
+  }, [windowSegments, currentTime, viewMode])
+
   // Ensure we only render the 3D canvas on the client
   useEffect(() => {
     setIsMounted(true)
@@ -670,6 +686,7 @@ export function SemanticLandscape() {
             }}
             onSpeedChange={setPlaybackSpeed}
             currentPoint={currentPlaybackPoint}
+            currentSegment={currentSegment}
           />
         )}
 
@@ -818,7 +835,7 @@ export function SemanticLandscape() {
         )}
       </div>
     )
-  }, [selectedPoint, data, showTrajectory, showClusters, autoRotate, speakerFilter, viewMode, currentTime, isPlaying, playbackSpeed, maxTime, currentPlaybackPoint])
+  }, [selectedPoint, data, showTrajectory, showClusters, autoRotate, speakerFilter, viewMode, currentTime, isPlaying, playbackSpeed, maxTime, currentPlaybackPoint, currentSegment])
 
   // Find cluster for hovered point
   const hoveredCluster = hoveredPoint && data?.clusters?.find((c) => c.id === hoveredPoint.cluster_id)
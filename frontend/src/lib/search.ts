@@ -0,0 +1,125 @@
+'use client'
+
+import { useState, useEffect } from 'react'
+import { loadBinary, loadJSON } from './useData'
+import type { SearchDocKind, SearchIndexData, SearchResult } from './types'
+
+// Client-side BM25 over the index built by pipeline/search_index.py.
+// Shards are fetched per term prefix on first use, so a query loads only
+// the postings for its own terms.
+
+type ShardTerms = Map<string, Uint8Array>  // term -> delta-encoded postings
+
+let indexPromise: Promise<SearchIndexData> | null = null
+const shardPromises: Record<string, Promise<ShardTerms>> = {}
+
+function readVarint(bytes: Uint8Array, state: { pos: number }): number {
+  let value = 0
+  let scale = 1
+  while (true) {
+    const byte = bytes[state.pos++]
+    value += (byte & 0x7f) * scale
+    if (byte < 0x80) return value
+    scale *= 128
+  }
+}
+
+function decodeShard(buffer: ArrayBuffer): ShardTerms {
+  const bytes = new Uint8Array(buffer)
+  const decoder = new TextDecoder()
+  const state = { pos: 0 }
+  const terms: ShardTerms = new Map()
+  const count = readVarint(bytes, state)
+  for (let i = 0; i < count; i++) {
+    const length = readVarint(bytes, state)
+    const term = decoder.decode(bytes.subarray(state.pos, state.pos + length))
+    state.pos += length
+    readVarint(bytes, state)  // document frequency (postings carry it implicitly)
+    const size = readVarint(bytes, state)
+    terms.set(term, bytes.subarray(state.pos, state.pos + size))
+    state.pos += size
+  }
+  return terms
+}
+
+export function loadSearchIndex(): Promise<SearchIndexData> {
+  indexPromise ??= loadJSON<SearchIndexData>('search_index.json')
+  return indexPromise
+}
+
+function loadShard(index: SearchIndexData, prefix: string): Promise<ShardTerms> {
+  const entry = index.shards[prefix]
+  if (!entry) return Promise.resolve(new Map())
+  shardPromises[prefix] ??= loadBinary(entry.file).then(decodeShard)
+  return shardPromises[prefix]
+}
+
+export function tokenize(index: SearchIndexData, text: string): string[] {
+  const { pattern, lowercase, min_length, stopwords } = index.tokenizer
+  const stop = new Set(stopwords)
+  const source = lowercase ? text.toLowerCase() : text
+  return (source.match(new RegExp(pattern, 'g')) ?? []).filter((t) => t.length >= min_length && !stop.has(t))
+}
+
+export async function search(query: string, k = 10, kinds?: SearchDocKind[]): Promise<SearchResult[]> {
+  const index = await loadSearchIndex()
+  const { k1, b, avg_length } = index.bm25
+  const allowed = kinds ? new Set(kinds.map((kind) => index.kinds.indexOf(kind))) : null
+  const terms = Array.from(new Set(tokenize(index, query)))
+  const shards = await Promise.all(terms.map((t) => loadShard(index, t.slice(0, index.prefix_length))))
+
+  const scores = new Map<number, number>()
+  terms.forEach((term, i) => {
+    const postings = shards[i].get(term)
+    if (!postings) return
+    const values: number[] = []
+    const state = { pos: 0 }
+    while (state.pos < postings.length) values.push(readVarint(postings, state))
+    const df = values.length / 2
+    const idf = Math.log(1 + (index.docs.length - df + 0.5) / (df + 0.5))
+    let docId = 0
+    for (let j = 0; j < values.length; j += 2) {
+      docId += values[j]
+      const tf = values[j + 1]
+      const doc = index.docs[docId]
+      if (allowed && !allowed.has(doc[0])) continue
+      const norm = k1 * (1 - b + (b * doc[3]) / avg_length)
+      scores.set(docId, (scores.get(docId) ?? 0) + (idf * tf * (k1 + 1)) / (tf + norm))
+    }
+  })
+
+  return Array.from(scores, ([docId, score]) => ({ docId, score }))
+    .sort((x, y) => y.score - x.score)
+    .slice(0, k)
+    .map(({ docId, score }) => {
+      const [kind, ref, title] = index.docs[docId]
+      return { kind: index.kinds[kind], ref, title, score }
+    })
+}
+
+// Results for a query (empty until the query has terms); stale queries are dropped
+export function useSearch(query: string, k = 10, kinds?: SearchDocKind[]) {
+  const [results, setResults] = useState<SearchResult[] | null>(null)
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState<Error | null>(null)
+  const kindKey = kinds?.join(',') ?? ''
+
+  useEffect(() => {
+    if (!query.trim()) {
+      setResults(null)
+      setLoading(false)
+      return
+    }
+    let current = true
+    setLoading(true)
+    search(query, k, kindKey ? (kindKey.split(',') as SearchDocKind[]) : undefined)
+      .then((found) => current && setResults(found))
+      .catch((e) => current && setError(e))
+      .finally(() => current && setLoading(false))
+    return () => {
+      current = false
+    }
+  }, [query, k, kindKey])
+
+  return { results, loading, error }
+}
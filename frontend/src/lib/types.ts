@@ -15,8 +15,8 @@ export interface LandscapePoint {
   time_range?: string
   duration?: number
   tokens?: number
-  // Claim-based clustering
-  cluster_id?: string
+  // Claim-based (string claim id) or unsupervised (numeric, -1 = noise) clustering
+  cluster_id?: string | number
   cluster_similarity?: number
   related_claims?: { claim_id: string; similarity: number }[]
   // Computed fields for compatibility
@@ -53,6 +53,19 @@ export interface ClaimLandmark {
   chunk_count: number
 }
 
+// Simplified speaker path (level 0 = every point, higher = coarser)
+export interface TrajectoryLevel {
+  level: number
+  method: 'full' | 'douglas_peucker' | 'time_bucket'
+  tolerance?: number
+  bucket_seconds?: number
+  vertices: number
+  time: number[]
+  path: number[][]
+  drift: number[]
+  velocity: number[]
+}
+
 export interface LandscapeData {
   metadata: {
     version?: string
@@ -87,12 +100,33 @@ export interface LandscapeData {
     demartini: number[][]
     raw_points: number[][]
   }
+  trajectory_levels?: Record<string, TrajectoryLevel[]>
   speaker_centroids: {
     marcus: [number, number, number]
     demartini: [number, number, number]
   }
 }
 
+// Slim landscape bundle (landscape_index.json + landscape_geometry.bin)
+export interface SlimGeometryColumn {
+  name: 'position' | 'time' | 'duration' | 'id' | 'cluster' | 'speaker'
+  dtype: '<f4' | '<u4' | '<i2' | '<u1'
+  components: number
+  byte_offset: number
+  length: number
+}
+
+export interface SlimLandscapeIndex extends Omit<LandscapeData, 'points'> {
+  count: number
+  geometry: {
+    file: string
+    byte_length: number
+    columns: SlimGeometryColumn[]
+  }
+  text_file: string
+  speakers: string[]
+}
+
 // Claims data
 export interface Claim {
   id: string
@@ -160,6 +194,26 @@ export interface EmotionalArcPoint {
   note: string
 }
 
+// Cross-speaker response edges (pipeline/response_edges.py), columnar:
+// edge i runs from chunk source[i] (spoken at time[i] by speaker[i]) to
+// chunk target[i], which starts lag[i] seconds later
+export interface ResponseEdges {
+  metadata: {
+    num_edges: number
+    window_seconds: number
+    top_k: number
+    min_similarity: number
+  }
+  edges: {
+    source: number[]
+    target: number[]
+    score: number[]
+    lag: number[]
+    time: number[]
+    speaker: string[]
+  }
+}
+
 export interface FlowData {
   metadata: {
     source: string
@@ -245,6 +299,7 @@ export interface DialogueExchange {
   warrants?: string[]
   strength?: string
   insight?: string
+  sources?: number[]  // transcript chunk ids a generated turn was grounded in
 }
 
 export interface DialogueRound {
@@ -252,6 +307,7 @@ export interface DialogueRound {
   topic: string
   dimension: string
   exchanges: DialogueExchange[]
+  generated?: { model: string; options: Record<string, number> }  // custom rounds from dialogue_engine.py
 }
 
 export interface DialogueData {
@@ -317,4 +373,104 @@ export interface Manifest {
     inflection_points: number
     arena_rounds: number
   }
+  files?: Record<string, ManifestFile>
+  shards?: Record<string, ShardIndex>
+  search_index?: string | null
+  link_graph?: string | null
+  total_size_bytes?: number
+  total_compressed_bytes?: Partial<Record<'gzip' | 'br', number>>
+}
+
+export interface ManifestFile {
+  size: number
+  hash: string
+  description: string
+  path?: string  // content-fingerprinted name, e.g. landscape.<hash>.json
+  compressed?: Partial<Record<'gzip' | 'br', number>>
+}
+
+export interface ShardIndex {
+  window_seconds: number
+  records_key: string  // array holding the records in each shard, e.g. 'points'
+  total_bytes: number
+  shards: {
+    file: string
+    episode: string
+    window: number
+    start: number
+    end: number
+    count: number
+    bytes: number
+  }[]
+}
+
+// transcript_diarized.json segment (also the records of its time shards)
+export interface TranscriptSegment {
+  speaker: 'marcus' | 'demartini' | 'unknown'
+  speaker_raw?: string
+  start_time: number
+  end_time: number
+  text: string
+  episode?: string
+}
+
+// Full-text search index (search_index.json + search.<prefix>.bin shards)
+export type SearchDocKind = 'wiki' | 'claim' | 'chunk'
+
+export interface SearchIndexData {
+  metadata: {
+    version: string
+    created_at: string
+    num_docs: number
+    num_terms: number
+    num_postings: number
+  }
+  tokenizer: {
+    pattern: string
+    lowercase: boolean
+    min_length: number
+    stopwords: string[]
+  }
+  bm25: { k1: number; b: number; avg_length: number }
+  kinds: SearchDocKind[]
+  docs: [number, string, string, number][]  // [kind code, ref, title, length in terms]
+  prefix_length: number
+  shards: Record<string, { file: string; terms: number; bytes: number }>
+}
+
+export interface SearchResult {
+  kind: SearchDocKind
+  ref: string
+  title: string
+  score: number
+}
+
+// Wikilink graph (link_graph.json + link_graph.bin, CSR adjacency)
+export interface LinkGraphIndex {
+  metadata: {
+    created_at: string
+    num_pages: number
+    num_links: number
+    num_broken: number
+    num_ambiguous: number
+  }
+  pages: [string, string][]  // [ref, title], e.g. ['concepts/shadow', 'Shadow']
+  arrays: {
+    file: string
+    byte_length: number
+    columns: {
+      name: 'forward_indptr' | 'forward_indices' | 'backward_indptr' | 'backward_indices'
+      dtype: '<u4'
+      byte_offset: number
+      length: number
+    }[]
+  }
+  broken: { source: string; target: string; count: number }[]
+  ambiguous: { slug: string; pages: string[] }[]  // slugs claimed by several pages
+}
+
+export interface LinkGraph {
+  index: LinkGraphIndex
+  links: (ref: string) => string[]
+  backlinks: (ref: string) => string[]
 }
@@ -4,14 +4,21 @@ import { useState, useEffect } from 'react'
 import type {
   Manifest,
   LandscapeData,
+  LandscapePoint,
+  SlimLandscapeIndex,
   ClaimsData,
   FlowData,
+  ResponseEdges,
   OntologyData,
   DialogueData,
+  LinkGraph,
+  LinkGraphIndex,
+  ShardIndex,
+  TranscriptSegment,
 } from './types'
 
 // Detect basePath for GitHub Pages deployment
-function getDataPath(filename: string): string {
+export function getDataPath(filename: string): string {
   if (typeof window !== 'undefined' && window.location.pathname.startsWith('/dialecticaltopology')) {
     return `/dialecticaltopology/data/${filename}`
   }
@@ -21,17 +28,43 @@ function getDataPath(filename: string): string {
 // Cache for loaded data
 const cache: Record<string, unknown> = {}
 
-async function loadJSON<T>(filename: string): Promise<T> {
-  if (cache[filename]) {
-    return cache[filename] as T
-  }
+// manifest.json maps each data file to its content-fingerprinted name
+// (landscape.json -> landscape.<hash>.json), which hosts may cache forever.
+// The manifest itself is always fetched under its plain name.
+let manifestPromise: Promise<Manifest | null> | null = null
+
+function loadManifestFiles(): Promise<Manifest | null> {
+  manifestPromise ??= fetch(getDataPath('manifest.json'))
+    .then((response) => (response.ok ? (response.json() as Promise<Manifest>) : null))
+    .catch(() => null)
+  return manifestPromise
+}
 
+// Fetch a data file by its fingerprinted name, falling back to the plain
+// name (e.g. a dev checkout where package_bundle.py has not run)
+async function fetchData(filename: string): Promise<Response> {
+  const manifest = filename === 'manifest.json' ? null : await loadManifestFiles()
+  const path = manifest?.files?.[filename]?.path
+  if (path) {
+    const response = await fetch(getDataPath(path))
+    if (response.ok) return response
+  }
   const response = await fetch(getDataPath(filename))
   if (!response.ok) {
     throw new Error(`Failed to load ${filename}: ${response.statusText}`)
   }
+  return response
+}
 
-  const data = await response.json()
+export async function loadJSON<T>(filename: string): Promise<T> {
+  if (cache[filename]) {
+    return cache[filename] as T
+  }
+
+  const data = filename === 'manifest.json' ? await loadManifestFiles() : await (await fetchData(filename)).json()
+  if (data === null) {
+    throw new Error('Failed to load manifest.json')
+  }
   cache[filename] = data
   return data as T
 }
@@ -51,36 +84,163 @@ export function useManifest() {
   return { data, loading, error }
 }
 
+export async function loadBinary(filename: string): Promise<ArrayBuffer> {
+  return (await fetchData(filename)).arrayBuffer()
+}
+
+// Time shards (pipeline/time_shards.py): manifest.shards lists, per source
+// file, one self-contained JSON per (episode, time window)
+export const DEFAULT_EPISODE = 'main'  // records without an episode field
+
+type Shard = ShardIndex['shards'][number]
+
+async function loadShardIndex(source: string): Promise<ShardIndex | null> {
+  const manifest = await loadManifestFiles()
+  return manifest?.shards?.[source] ?? null
+}
+
+// The episode's shards, the window holding `time` first, then outward from it
+function shardsNear(index: ShardIndex, time: number, episode: string): Shard[] {
+  const focus = Math.floor(time / index.window_seconds)
+  return index.shards
+    .filter((shard) => shard.episode === episode)
+    .sort((a, b) => Math.abs(a.window - focus) - Math.abs(b.window - focus) || a.window - b.window)
+}
+
+// Records of the shard covering `time`, [] for a window with no records,
+// or null when `source` is not sharded
+export async function loadShardAt<T>(source: string, time: number, episode = DEFAULT_EPISODE): Promise<T[] | null> {
+  const index = await loadShardIndex(source)
+  if (!index) return null
+  const shard = shardsNear(index, time, episode)[0]
+  if (!shard || shard.window !== Math.floor(time / index.window_seconds)) return []
+  const doc = await loadJSON<Record<string, T[]>>(shard.file)
+  return doc[index.records_key]
+}
+
+// Stream every shard of an episode, nearest `time` first; false when `source` is not sharded
+export async function loadShards<T>(
+  source: string,
+  onRecords: (records: T[]) => void,
+  time = 0,
+  episode = DEFAULT_EPISODE,
+): Promise<boolean> {
+  const index = await loadShardIndex(source)
+  if (!index) return false
+  for (const shard of shardsNear(index, time, episode)) {
+    const doc = await loadJSON<Record<string, T[]>>(shard.file)
+    onRecords(doc[index.records_key])
+  }
+  return true
+}
+
+// Slim landscape bundle: packed geometry for first paint, text fetched after
+const TYPED_ARRAYS = {
+  '<f4': Float32Array,
+  '<u4': Uint32Array,
+  '<i2': Int16Array,
+  '<u1': Uint8Array,
+} as const
+
+type SlimTextEntry = { text: string } & Partial<LandscapePoint>
+
+function previewText(text: string): string {
+  return text.length > 200 ? text.slice(0, 200) + '...' : text
+}
+
+function normalizeLandscape(rawData: LandscapeData): LandscapeData {
+  return {
+    ...rawData,
+    metadata: {
+      ...rawData.metadata,
+      n_points: rawData.metadata.num_points || rawData.metadata.n_points || rawData.points.length,
+      n_clusters: rawData.metadata.num_clusters || rawData.clusters?.length || 0,
+    },
+    points: rawData.points.map((p) => ({
+      ...p,
+      start_time: p.time || 0,
+      end_time: p.time + (p.duration || 0),
+      cluster: typeof p.cluster_id === 'number'
+        ? p.cluster_id
+        : typeof p.cluster_id === 'string' ? parseInt(p.cluster_id.replace(/\D/g, '')) || 0 : 0,
+    })),
+    // Use speaker_centroids directly if available (v2 data has it)
+    speaker_centroids: rawData.speaker_centroids || {
+      marcus: [0, 0, 0] as [number, number, number],
+      demartini: [0, 0, 0] as [number, number, number],
+    },
+  }
+}
+
+async function loadSlimLandscape(): Promise<{ data: LandscapeData; textFile: string }> {
+  const index = await loadJSON<SlimLandscapeIndex>('landscape_index.json')
+  const buffer = await loadBinary(index.geometry.file)
+
+  const columns: Record<string, ArrayLike<number>> = {}
+  for (const col of index.geometry.columns) {
+    const ArrayType = TYPED_ARRAYS[col.dtype as keyof typeof TYPED_ARRAYS]
+    columns[col.name] = new ArrayType(buffer, col.byte_offset, col.length)
+  }
+  const { position, time, duration, id, cluster, speaker } = columns
+
+  const points: LandscapePoint[] = Array.from({ length: index.count }, (_, i) => {
+    const clusterCode = cluster[i]
+    const start = time[i]
+    const length = duration[i]
+    return {
+      id: id[i],
+      x: position[3 * i],
+      y: position[3 * i + 1],
+      z: position[3 * i + 2],
+      speaker: index.speakers[speaker[i]] as LandscapePoint['speaker'],
+      text: '',
+      time: start,
+      time_label: formatTime(start),
+      duration: length > 0 ? length : undefined,
+      // -1 = noise/unclustered, as in the full landscape (normalizeLandscape keeps it)
+      cluster_id: clusterCode >= 0 ? index.clusters[clusterCode].id : -1,
+      start_time: start,
+      end_time: start + length,
+      cluster: clusterCode,
+    }
+  })
+
+  const { geometry, text_file, speakers, count, ...rest } = index
+  return { data: normalizeLandscape({ ...rest, points }), textFile: text_file }
+}
+
 export function useLandscape() {
   const [data, setData] = useState<LandscapeData | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<Error | null>(null)
 
   useEffect(() => {
-    loadJSON<LandscapeData>('landscape.json')
-      .then((rawData) => {
-        // Transform data to ensure compatibility
-        const transformed: LandscapeData = {
-          ...rawData,
-          metadata: {
-            ...rawData.metadata,
-            n_points: rawData.metadata.num_points || rawData.metadata.n_points || rawData.points.length,
-            n_clusters: rawData.metadata.num_clusters || rawData.clusters?.length || 0,
-          },
-          points: rawData.points.map((p) => ({
-            ...p,
-            start_time: p.time || 0,
-            end_time: p.time + (p.duration || 0),
-            cluster: typeof p.cluster_id === 'string' ? parseInt(p.cluster_id.replace(/\D/g, '')) || 0 : 0,
-          })),
-          // Use speaker_centroids directly if available (v2 data has it)
-          speaker_centroids: rawData.speaker_centroids || {
-            marcus: [0, 0, 0] as [number, number, number],
-            demartini: [0, 0, 0] as [number, number, number],
-          },
-        }
-        setData(transformed)
+    const mergeText = (texts: Record<string, SlimTextEntry>) =>
+      setData((current) => current && {
+        ...current,
+        points: current.points.map((p) => {
+          const entry = texts[String(p.id)]
+          return entry ? { ...p, ...entry, full_text: entry.text, text: previewText(entry.text) } : p
+        }),
       })
+
+    loadSlimLandscape()
+      .then(({ data: slim, textFile }) => {
+        setData(slim)
+        // Text is not needed to draw the landscape; merge it in when it arrives,
+        // a time shard at a time when the bundle is sharded
+        loadShards<LandscapePoint>('landscape.json', (records) => {
+          const texts: Record<string, SlimTextEntry> = {}
+          for (const { id, x, y, z, speaker, time, duration, cluster_id, full_text, ...entry } of records) {
+            texts[String(id)] = { ...entry, text: full_text || entry.text }
+          }
+          mergeText(texts)
+        })
+          .then((sharded) => sharded || loadJSON<Record<string, SlimTextEntry>>(textFile).then(mergeText))
+          .catch(setError)
+      })
+      // Older bundles without the slim files: fall back to the full landscape
+      .catch(() => loadJSON<LandscapeData>('landscape.json').then((raw) => setData(normalizeLandscape(raw))))
       .catch(setError)
       .finally(() => setLoading(false))
   }, [])
@@ -118,6 +278,21 @@ export function useFlow() {
   return { data, loading, error }
 }
 
+export function useResponses() {
+  const [data, setData] = useState<ResponseEdges | null>(null)
+  const [loading, setLoading] = useState(true)
+  const [error, setError] = useState<Error | null>(null)
+
+  useEffect(() => {
+    loadJSON<ResponseEdges>('responses.json')
+      .then(setData)
+      .catch(setError)
+      .finally(() => setLoading(false))
+  }, [])
+
+  return { data, loading, error }
+}
+
 export function useOntology() {
   const [data, setData] = useState<OntologyData | null>(null)
   const [loading, setLoading] = useState(true)
@@ -148,6 +323,68 @@ export function useDialogue() {
   return { data, loading, error }
 }
 
+// Transcript segments of the time window holding `time` (one shard), for
+// the playback views; the whole transcript when the bundle is not sharded
+export function useTranscriptWindow(time: number | null, episode = DEFAULT_EPISODE) {
+  const [segments, setSegments] = useState<TranscriptSegment[] | null>(null)
+  const [error, setError] = useState<Error | null>(null)
+
+  // Playback moves `time` every tick; look the shard up once a minute
+  const minute = time === null ? null : Math.floor(time / 60) * 60
+
+  useEffect(() => {
+    if (minute === null) return
+    let current = true
+    loadShardAt<TranscriptSegment>('transcript_diarized.json', minute, episode)
+      .then((records) => records ?? loadJSON<{ segments: TranscriptSegment[] }>('transcript_diarized.json')
+        .then((doc) => doc.segments))
+      .then((records) => current && setSegments(records))
+      .catch((e) => current && setError(e))
+    return () => {
+      current = false
+    }
+  }, [minute, episode])
+
+  return { segments, error }
+}
+
+// Wikilink graph: page i links to indices[indptr[i]..indptr[i + 1])
+async function loadLinkGraph(): Promise<LinkGraph> {
+  const index = await loadJSON<LinkGraphIndex>('link_graph.json')
+  const buffer = await loadBinary(index.arrays.file)
+  const columns: Record<string, Uint32Array> = {}
+  for (const col of index.arrays.columns) {
+    columns[col.name] = new Uint32Array(buffer, col.byte_offset, col.length)
+  }
+  const ids = new Map(index.pages.map(([ref], i) => [ref, i]))
+  const row = (direction: 'forward' | 'backward', ref: string) => {
+    const i = ids.get(ref)
+    if (i === undefined) return []
+    const indptr = columns[`${direction}_indptr`]
+    return Array.from(columns[`${direction}_indices`].subarray(indptr[i], indptr[i + 1]), (j) => index.pages[j][0])
+  }
+  return {
+    index,
+    links: (ref) => row('forward', ref),
+    backlinks: (ref) => row('backward', ref),
+  }
+}
+
+export function useLinkGraph() {
+  const [data, setData] = useState<LinkGraph | null>(null)
+  const [loading, setLoading] = useState(true)
+  const [error, setError] = useState<Error | null>(null)
+
+  useEffect(() => {
+    loadLinkGraph()
+      .then(setData)
+      .catch(setError)
+      .finally(() => setLoading(false))
+  }, [])
+
+  return { data, loading, error }
+}
+
 // Helper to format time
 export function formatTime(seconds: number): string {
   const mins = Math.floor(seconds / 60)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark custom-round generation against a stand-in model server.
+
+Starts a local server that answers POST /api/chat the way Ollama does,
+after --latency seconds, and counts the requests it is serving at once.
+Then generates --rounds rounds (dialogue_engine.generate_rounds, no
+transcript context) and times three passes:
+
+    serial    concurrency 1, empty cache
+    cold      --concurrency, empty cache
+    warm      --concurrency again, same cache
+
+and checks the engine's two guarantees: the server never sees more than
+`concurrency` requests in flight, and the warm pass never reaches the
+server (every turn is a cache hit). A violated check exits non-zero.
+
+The cache lives in a temp directory, so .cache/llm/ is not touched.
+
+Usage:
+    python pipeline/benchmarks/bench_dialogue.py
+    python pipeline/benchmarks/bench_dialogue.py --rounds 20 --concurrency 8 --latency 0.1
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dialogue_engine import OllamaClient, generate_rounds
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Answers /api/chat after a fixed delay; `calls` and `peak` count requests."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.latency = latency
+        self.calls = 0
+        self.peak = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reset(self):
+        with self._lock:
+            self.calls = self.peak = 0
+
+    def serve(self, body: dict) -> dict:
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+        try:
+            time.sleep(self.latency)
+            prompt = body["messages"][-1]["content"]
+            return {"message": {"role": "assistant",
+                                "content": json.dumps({"content": f"Reply to {len(prompt)} chars", "strength": 0.8})}}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        reply = json.dumps(self.server.serve(body)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_pass(server: StandInServer, cache_dir: Path, topics: list, concurrency: int) -> dict:
+    """Generate the rounds once; returns wall time, server calls and peak, and cache hits/misses."""
+    server.reset()
+    client = OllamaClient(server.endpoint, cache_dir=cache_dir)
+    start = time.perf_counter()
+    rounds = generate_rounds(client, topics, concurrency)
+    return {
+        "seconds": time.perf_counter() - start,
+        "rounds": len(rounds),
+        "calls": server.calls,
+        "peak": server.peak,
+        "hits": client.hits,
+        "misses": client.misses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark custom-round generation against a stand-in server")
+    parser.add_argument("--rounds", type=int, default=8, help="Rounds (distinct topics) to generate")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in server delay per request (s)")
+    args = parser.parse_args()
+
+    topics = [f"Stand-in topic {i + 1}" for i in range(args.rounds)]
+    server = StandInServer(args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"{args.rounds} rounds ({3 * args.rounds} requests), {args.latency * 1000:.0f} ms per request, "
+          f"server at {server.endpoint}")
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as serial_cache, tempfile.TemporaryDirectory() as cache:
+            results["serial"] = run_pass(server, Path(serial_cache), topics, 1)
+            results["cold"] = run_pass(server, Path(cache), topics, args.concurrency)
+            results["warm"] = run_pass(server, Path(cache), topics, args.concurrency)
+    finally:
+        server.shutdown()
+
+    header = f"{'pass':<8}{'workers':>9}{'s':>9}{'calls':>8}{'peak':>7}{'hits':>7}{'misses':>8}{'speedup':>9}"
+    print("\n" + header)
+    print("-" * len(header))
+    baseline = results["serial"]["seconds"]
+    for name, r in results.items():
+        workers = 1 if name == "serial" else args.concurrency
+        print(f"{name:<8}{workers:>9}{r['seconds']:>9.2f}{r['calls']:>8}{r['peak']:>7}{r['hits']:>7}"
+              f"{r['misses']:>8}{baseline / max(r['seconds'], 1e-9):>8.1f}x")
+
+    failures = []
+    for name in ("serial", "cold"):
+        limit = 1 if name == "serial" else args.concurrency
+        if results[name]["peak"] > limit:
+            failures.append(f"{name}: {results[name]['peak']} requests in flight, limit {limit}")
+    warm = results["warm"]
+    if warm["calls"] or warm["misses"] or warm["hits"] != 3 * args.rounds:
+        failures.append(f"warm: {warm['calls']} server calls, {warm['hits']} cache hits "
+                        f"(expected 0 and {3 * args.rounds})")
+
+    print()
+    for failure in failures:
+        print(f"  FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"  ok: at most {args.concurrency} requests in flight; warm pass served entirely from the cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Benchmark every pipeline stage on synthetic corpora.
+
+For each --scale, generates an Otter-format transcript that many times the
+size of the real episode (synthetic_transcript.py) and times:
+
+    parse         parse_transcript on the synthetic transcript
+    chunks        create_chunks
+    chunks_v2     create_chunks_v2
+    embed         offline feature-hashing embeddings of the chunks
+    embed_v2      the same for the v2 chunks
+    assign        chunk -> claim assignment (cluster_by_claims)
+    umap          3D UMAP fit (skipped when umap-learn is not installed)
+    cluster       k-means clustering and labelling of the landscape
+    wiki          generate_wiki.py, run in a scratch project
+    search        search_index.py over the scratch wiki, claims and chunks
+    links         link_graph.py over the scratch wiki
+    package       package_bundle.py, run in a scratch project
+    package_noop  package_bundle.py again with nothing changed
+
+In-process stages are measured with instrumentation.step, so their peak
+RSS is the benchmark process's high-water mark so far; wiki, search,
+links and package run as subprocesses under instrumentation.py and report
+their own peak RSS and sub-steps. Claims are the real extracted claims, replicated --claim-scale
+times. The scratch project lives in a temp directory, so nothing under
+data/ or wiki/ is touched.
+
+Results (one entry per scale) are written as JSON to --output, by default
+.cache/benchmarks/pipeline-<timestamp>.json; --compare prints the wall-time
+ratio against an earlier results file.
+
+Usage:
+    python pipeline/benchmarks/bench_pipeline.py --scale 1 10 100
+    python pipeline/benchmarks/bench_pipeline.py --scale 10 --compare .cache/benchmarks/pipeline-old.json
+"""
+
+import argparse
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serialization
+from serialization import read_json, write_json
+from instrumentation import step, format_bytes
+from parse_transcript import parse_transcript
+from create_chunks import create_chunks
+from create_chunks_v2 import create_chunks_v2
+from generate_embeddings import embed_offline
+from cluster_by_claims import assign_chunks_to_claims
+from cluster_landscape import cluster_points, apply_clusters
+from reduce_embeddings import fit_reducer, transform
+from synthetic_transcript import write_transcript, load_vocabulary
+
+PROJECT_DIR = Path(__file__).parent.parent.parent
+DATA_DIR = PROJECT_DIR / "data" / "processed"
+RESULTS_DIR = PROJECT_DIR / ".cache" / "benchmarks"
+
+# Real outputs copied unchanged into the scratch project
+STATIC_FILES = ("ontology.json", "flow.json", "responses.json", "dialogue.json")
+
+
+def scale_claims(claims_data: dict, scale: int) -> dict:
+    """Replicate the claims `scale` times with suffixed IDs (D01, D01-2, ...)."""
+    if scale <= 1:
+        return claims_data
+    claims = [
+        {**claim, "id": claim["id"] if k == 0 else f"{claim['id']}-{k + 1}"}
+        for k in range(scale)
+        for claim in claims_data["claims"]
+    ]
+    return {**claims_data, "claims": claims}
+
+
+def landscape_document(chunks: list, coords: np.ndarray, model: str) -> dict:
+    """A landscape.json-shaped document for the chunks at the given 3D coordinates."""
+    coords = coords - coords.mean(axis=0)
+    coords = coords / max(np.abs(coords).max(), 1e-9)
+    points = [{
+        "id": chunk["id"],
+        "x": float(coord[0]),
+        "y": float(coord[1]),
+        "z": float(coord[2]),
+        "speaker": chunk["speaker"],
+        "text": chunk["text"][:200] + "..." if len(chunk["text"]) > 200 else chunk["text"],
+        "full_text": chunk["text"],
+        "time": chunk["start_time"],
+        "time_label": chunk["time_label"],
+        "tokens": chunk["token_estimate"],
+    } for chunk, coord in zip(chunks, coords)]
+    return {
+        "metadata": {"version": "synthetic", "created_at": datetime.now().isoformat(),
+                     "num_points": len(points), "embedding_model": model},
+        "points": points,
+    }
+
+
+def make_project(root: Path) -> Path:
+    """Scratch project with a copy of the pipeline scripts, wiki templates and empty data dirs."""
+    project = root / "project"
+    shutil.copytree(PROJECT_DIR / "pipeline", project / "pipeline",
+                    ignore=shutil.ignore_patterns("benchmarks", "__pycache__"))
+    shutil.copytree(PROJECT_DIR / ".opal" / "templates", project / ".opal" / "templates")
+    for sub in ("data/processed", "wiki", "frontend/public/data"):
+        (project / sub).mkdir(parents=True, exist_ok=True)
+    for filename in STATIC_FILES:
+        if (DATA_DIR / filename).exists():
+            shutil.copyfile(DATA_DIR / filename, project / "data" / "processed" / filename)
+    return project
+
+
+def run_script(project: Path, script: str, *args) -> dict:
+    """Run a pipeline script in the scratch project under instrumentation; returns its root step."""
+    metrics = project / f".metrics-{Path(script).stem}.json"
+    result = subprocess.run(
+        [sys.executable, "pipeline/instrumentation.py", "--metrics", str(metrics), f"pipeline/{script}", *args],
+        cwd=project, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return {"error": (result.stdout + result.stderr).strip().splitlines()[-5:]}
+    return read_json(metrics)["steps"][0]
+
+
+def bench_scale(scale: int, claim_scale: int, seed: int, vocabulary, workdir: Path) -> dict:
+    """Run every stage once at one corpus scale."""
+    stages = {}
+    corpus = {}
+
+    def measure(name, fn, items=None):
+        with step(name) as record:
+            value = fn()
+        record = {k: v for k, v in record.items() if k != "children"}
+        if items is not None:
+            record["items"] = items(value) if callable(items) else items
+        stages[name] = record
+        return value
+
+    transcript_path = workdir / "transcript.txt"
+    corpus.update(write_transcript(transcript_path, scale, seed, vocabulary))
+
+    transcript = measure("parse", lambda: parse_transcript(str(transcript_path)),
+                         lambda t: len(t["segments"]))
+    segments = transcript["segments"]
+    chunks = measure("chunks", lambda: create_chunks(segments), len(segments))
+    chunks_v2 = measure("chunks_v2", lambda: create_chunks_v2(segments), len(segments))
+    embeddings = measure("embed", lambda: embed_offline([c["text"] for c in chunks]), len(chunks))
+    embeddings_v2 = measure("embed_v2", lambda: embed_offline([c["text"] for c in chunks_v2]), len(chunks_v2))
+
+    claims_data = scale_claims(read_json(DATA_DIR / "claims.json"), claim_scale)
+    claims = claims_data["claims"]
+    claim_embeddings = embed_offline([c["text"] for c in claims])
+    measure("assign", lambda: assign_chunks_to_claims(embeddings_v2, claim_embeddings, claims),
+            len(chunks_v2) * len(claims))
+    corpus.update(segments=len(segments), chunks=len(chunks), chunks_v2=len(chunks_v2), claims=len(claims))
+
+    try:
+        from project_umap import fit_umap
+        coords = measure("umap", lambda: fit_umap(embeddings).embedding_, len(chunks))
+    except ImportError as e:
+        stages["umap"] = {"skipped": str(e)}
+        # Linear 3D layout so the landscape can still be packaged
+        coords = transform(fit_reducer(embeddings, "pca", 3), embeddings)
+
+    landscape = landscape_document(chunks, np.asarray(coords, dtype=np.float64), "feature-hashing")
+    texts = [c["text"] for c in chunks]
+    measure("cluster", lambda: apply_clusters(landscape, cluster_points(embeddings), texts), len(chunks))
+
+    project = make_project(workdir)
+    processed = project / "data" / "processed"
+    write_json(processed / "transcript_diarized.json", transcript)
+    write_json(processed / "chunks.json", {"metadata": {"scale": scale}, "chunks": chunks})
+    write_json(processed / "embeddings_meta.json", {
+        "model": "feature-hashing", "dimensions": int(embeddings.shape[1]), "num_chunks": len(chunks),
+    })
+    write_json(processed / "landscape.json", landscape)
+    write_json(processed / "claims.json", claims_data)
+
+    for name, script in (("wiki", "generate_wiki.py"), ("search", "search_index.py"), ("links", "link_graph.py"),
+                         ("package", "package_bundle.py"), ("package_noop", "package_bundle.py")):
+        stages[name] = run_script(project, script)
+
+    return {"scale": scale, "claim_scale": claim_scale, "corpus": corpus, "stages": stages}
+
+
+def print_scale(result: dict):
+    corpus = result["corpus"]
+    print(f"\nScale {result['scale']}x: {corpus['turns']:,} turns, {corpus['words']:,} words, "
+          f"{corpus['chunks']:,} chunks, {corpus['chunks_v2']:,} v2 chunks, {corpus['claims']:,} claims")
+    header = f"  {'stage':<14}{'wall s':>9}{'cpu s':>9}{'peak rss':>10}{'items/s':>12}"
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    for name, record in result["stages"].items():
+        if "wall_seconds" not in record:
+            reason = record.get("skipped") or " / ".join(record.get("error", []))
+            print(f"  {name:<14}{'skipped' if 'skipped' in record else 'failed'}: {reason[:72]}")
+            continue
+        rate = record["items"] / max(record["wall_seconds"], 1e-9) if "items" in record else None
+        print(f"  {name:<14}{record['wall_seconds']:>9.2f}{record['cpu_seconds']:>9.2f}"
+              f"{format_bytes(record['peak_rss_bytes']):>10}{f'{rate:,.0f}' if rate else '-':>12}")
+
+
+def print_comparison(results: dict, baseline_path: Path):
+    """Wall-time ratio (baseline / current) per stage for scales present in both runs."""
+    baseline = {r["scale"]: r for r in read_json(baseline_path)["scales"]}
+    print(f"\nCompared with {baseline_path} (>1x = faster now)")
+    for result in results["scales"]:
+        old = baseline.get(result["scale"])
+        if old is None:
+            print(f"  scale {result['scale']}x not in baseline")
+            continue
+        print(f"  Scale {result['scale']}x")
+        for name, record in result["stages"].items():
+            before = old["stages"].get(name, {}).get("wall_seconds")
+            now = record.get("wall_seconds")
+            if before is None or now is None:
+                continue
+            print(f"    {name:<14}{before:>9.2f}s -> {now:>7.2f}s  {before / max(now, 1e-9):>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic corpora")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10],
+                        help="Corpus sizes as multiples of the real episode (1-1000)")
+    parser.add_argument("--claim-scale", type=int, default=1, help="Replicate the claims N times")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON (default: .cache/benchmarks/)")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    vocabulary = load_vocabulary()
+    results = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_backend": serialization.BACKEND,
+        "seed": args.seed,
+        "scales": [],
+    }
+    print(f"Pipeline benchmark: scales {args.scale}, claims x{args.claim_scale}, seed {args.seed}")
+    for scale in args.scale:
+        with tempfile.TemporaryDirectory(prefix=f"bench-{scale}x-") as tmp:
+            result = bench_scale(scale, args.claim_scale, args.seed, vocabulary, Path(tmp))
+        results["scales"].append(result)
+        print_scale(result)
+
+    output = args.output or RESULTS_DIR / f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    write_json(output, results, pretty=True)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
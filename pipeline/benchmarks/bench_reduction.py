@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark linear pre-reduction before UMAP: quality vs speed.
+
+For each method and target dimension, reports fit/transform time, the cost
+of exact k-nearest-neighbor search in the reduced space, the matrix size,
+and neighbor recall@k against exact cosine neighbors in the full space.
+Optionally times a UMAP fit when umap-learn is installed.
+
+Usage:
+    python pipeline/benchmarks/bench_reduction.py --scale 10 --dims 16 32 64
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from reduce_embeddings import METHODS, fit_reducer, transform, normalize_rows
+
+
+def synthetic_corpus(embeddings: np.ndarray, scale: int, seed: int = 0) -> np.ndarray:
+    """Tile the real embeddings with small Gaussian jitter to simulate a larger corpus."""
+    if scale <= 1:
+        return embeddings
+    rng = np.random.default_rng(seed)
+    tiled = np.tile(embeddings, (scale, 1))
+    noise = rng.standard_normal(tiled.shape).astype(np.float32) * embeddings.std() * 0.3
+    return tiled + noise
+
+
+def knn(vectors: np.ndarray, k: int, block: int = 2048) -> np.ndarray:
+    """Exact cosine kNN by blocked matrix multiply (excludes self)."""
+    data = normalize_rows(vectors.astype(np.float32))
+    neighbors = np.empty((len(data), k), dtype=np.int64)
+    for start in range(0, len(data), block):
+        sims = data[start:start + block] @ data.T
+        rows = np.arange(sims.shape[0])
+        sims[rows, rows + start] = -np.inf
+        top = np.argpartition(-sims, k, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(sims, top, axis=1), axis=1)
+        neighbors[start:start + block] = np.take_along_axis(top, order, axis=1)
+    return neighbors
+
+
+def recall_at_k(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean fraction of reference neighbors recovered per row."""
+    hits = [len(np.intersect1d(r, c, assume_unique=True)) for r, c in zip(reference, candidate)]
+    return float(np.mean(hits)) / reference.shape[1]
+
+
+def time_umap(vectors: np.ndarray) -> float | None:
+    """Time a UMAP fit if umap-learn is available."""
+    try:
+        import umap
+    except ImportError:
+        return None
+    start = time.perf_counter()
+    umap.UMAP(n_components=3, n_neighbors=15, min_dist=0.1, metric="cosine",
+              random_state=42).fit_transform(vectors)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding pre-reduction")
+    parser.add_argument("--scale", type=int, default=1, help="Replicate the corpus N times")
+    parser.add_argument("--dims", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=list(METHODS))
+    parser.add_argument("-k", type=int, default=10, help="Neighbors for recall@k")
+    parser.add_argument("--umap", action="store_true", help="Also time UMAP fits")
+    args = parser.parse_args()
+
+    embeddings_path = Path(__file__).parent.parent.parent / "data" / "processed" / "embeddings.npy"
+    embeddings = synthetic_corpus(np.load(embeddings_path), args.scale)
+    print(f"Corpus: {embeddings.shape[0]} x {embeddings.shape[1]} (scale {args.scale}x)")
+
+    start = time.perf_counter()
+    reference = knn(embeddings, args.k)
+    base_knn = time.perf_counter() - start
+    base_umap = time_umap(embeddings) if args.umap else None
+
+    header = f"{'method':<18}{'dim':>5}{'fit s':>9}{'knn s':>9}{'MB':>8}{'recall':>9}"
+    if args.umap:
+        header += f"{'umap s':>9}"
+    print("\n" + header)
+    print("-" * len(header))
+    row = f"{'none':<18}{embeddings.shape[1]:>5}{0:>9.3f}{base_knn:>9.3f}{embeddings.nbytes / 1e6:>8.1f}{1.0:>9.3f}"
+    if args.umap:
+        row += f"{base_umap:>9.2f}" if base_umap is not None else f"{'n/a':>9}"
+    print(row)
+
+    for method in args.methods:
+        for dim in args.dims:
+            start = time.perf_counter()
+            reducer = fit_reducer(embeddings, method=method, n_components=dim)
+            reduced = transform(reducer, embeddings)
+            fit_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            candidate = knn(reduced, args.k)
+            knn_time = time.perf_counter() - start
+
+            row = (f"{method:<18}{dim:>5}{fit_time:>9.3f}{knn_time:>9.3f}"
+                   f"{reduced.nbytes / 1e6:>8.1f}{recall_at_k(reference, candidate):>9.3f}")
+            if args.umap:
+                umap_time = time_umap(reduced)
+                row += f"{umap_time:>9.2f}" if umap_time is not None else f"{'n/a':>9}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
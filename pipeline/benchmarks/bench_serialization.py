@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of each pipeline output.
+
+For every JSON file in data/processed, times writing it to disk with the
+old encoding (stdlib json, indent=2), stdlib compact, the canonical
+encoder in serialization.py (orjson when installed) and the streaming
+writer, and reports the file size of each. A --scale factor replicates
+the large arrays (points/chunks) to simulate bigger corpora.
+
+Usage:
+    python pipeline/benchmarks/bench_serialization.py --scale 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serialization
+from serialization import write_json, write_json_stream
+
+STREAM_KEYS = ("points", "chunks")
+
+
+def scale_document(doc, scale: int):
+    """Replicate the large streamed array `scale` times."""
+    if scale <= 1 or not isinstance(doc, dict):
+        return doc
+    scaled = dict(doc)
+    for key in STREAM_KEYS:
+        if isinstance(doc.get(key), list):
+            scaled[key] = doc[key] * scale
+    return scaled
+
+
+def best_of(fn, repeat: int) -> float:
+    """Fastest wall time of `repeat` calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_document(doc, repeat: int) -> dict:
+    """Write times (s) and file sizes (bytes) for one document, per encoder."""
+    def stdlib(**kwargs):
+        def write(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(doc, f, ensure_ascii=False, **kwargs)
+        return write
+
+    writers = {
+        "json indent=2": stdlib(indent=2),
+        "json compact": stdlib(separators=(",", ":")),
+        f"canonical ({serialization.BACKEND})": lambda path: write_json(path, doc, pretty=False),
+    }
+    stream_key = next((k for k in STREAM_KEYS if isinstance(doc, dict) and k in doc), None)
+    if stream_key:
+        writers[f"stream '{stream_key}'"] = (
+            lambda path: write_json_stream(path, doc, stream_key, doc[stream_key], pretty=False)
+        )
+
+    fd, tmp = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        row = {}
+        for name, write in writers.items():
+            seconds = best_of(lambda: write(tmp), repeat)
+            row[name] = (seconds, os.path.getsize(tmp))
+    finally:
+        os.remove(tmp)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of pipeline outputs")
+    parser.add_argument("--scale", type=int, default=1, help="Replicate points/chunks N times")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("files", nargs="*", type=Path, help="JSON files (default: data/processed/*.json)")
+    args = parser.parse_args()
+
+    data_dir = Path(__file__).parent.parent.parent / "data" / "processed"
+    files = args.files or sorted(data_dir.glob("*.json"))
+    print(f"Backend: {serialization.BACKEND}, scale {args.scale}x, best of {args.repeat}")
+
+    header = f"{'file':<28}{'encoder':<26}{'ms':>10}{'MB':>9}{'speedup':>9}"
+    print("\n" + header)
+    print("-" * len(header))
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            doc = scale_document(json.load(f), args.scale)
+        row = bench_document(doc, args.repeat)
+        baseline = row["json indent=2"][0]
+        for i, (name, (seconds, size)) in enumerate(row.items()):
+            label = path.name if i == 0 else ""
+            print(f"{label:<28}{name:<26}{seconds * 1000:>10.1f}{size / 1e6:>9.2f}"
+                  f"{baseline / max(seconds, 1e-9):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic Otter.ai transcripts for scale testing.
+
+The output has the same layout as the merged Otter export that
+parse_transcript.py reads: a "Speaker Name  H:MM:SS" header line, the
+turn's text, a blank line, and the "Transcribed by" footer. At scale 1 it
+matches the real episode's shape (270 turns over ~105 minutes); scale N
+produces N times as many turns with timestamps running on.
+
+Turn lengths are log-normal around the real episode's mean and speakers
+mostly alternate, with the occasional unattributed "Speaker 1" crosstalk.
+Words are drawn from the real transcript's unigram frequencies when it is
+available, so chunk sizes, token estimates and concept mentions behave like
+the real corpus while every turn is still distinct text.
+
+Usage:
+    python pipeline/benchmarks/synthetic_transcript.py --scale 100 -o /tmp/transcript.txt
+"""
+
+import argparse
+import json
+import re
+import numpy as np
+from collections import Counter
+from pathlib import Path
+
+BASE_TURNS = 270           # turns in the real episode
+WORDS_PER_MINUTE = 150     # speaking rate used for timestamps
+MEAN_TURN_WORDS = 55
+CROSSTALK_RATE = 0.005     # share of turns attributed to "Speaker 1"
+SAME_SPEAKER_RATE = 0.05   # share of turns where the speaker keeps going
+SPEAKERS = ("Dr. John Demartini", "Aubrey Marcus")
+CROSSTALK_SPEAKER = "Speaker 1"
+FOOTER = "Transcribed by https://otter.ai"
+BLOCK_TURNS = 1000         # turns generated per vectorized batch
+
+REAL_TRANSCRIPT = Path(__file__).parent.parent.parent / "data" / "processed" / "transcript_diarized.json"
+FALLBACK_WORDS = (
+    "the and to of a that is you it in i this we what but so be have not are like there "
+    "evil good love pain truth perception balance order chaos moral suffering choice "
+    "awareness wisdom justice gratitude value meaning people world life nature human"
+).split()
+
+
+def load_vocabulary(path: Path = REAL_TRANSCRIPT) -> tuple[np.ndarray, np.ndarray]:
+    """Words and sampling probabilities from the real transcript (or a fallback list)."""
+    counts = Counter()
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            for segment in json.load(f)["segments"]:
+                counts.update(re.findall(r"[A-Za-z']+", segment["text"].lower()))
+    if not counts:
+        counts = Counter({word: len(FALLBACK_WORDS) - i for i, word in enumerate(FALLBACK_WORDS)})
+    words, freqs = zip(*counts.most_common())
+    freqs = np.array(freqs, dtype=np.float64)
+    return np.array(words), freqs / freqs.sum()
+
+
+def format_timestamp(seconds: int) -> str:
+    """Otter style: M:SS under an hour, H:MM:SS after."""
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def turn_text(words: np.ndarray, sentence_lengths: np.ndarray, questions: np.ndarray) -> str:
+    """Join sampled words into capitalized sentences."""
+    sentences = []
+    start = 0
+    for length, question in zip(sentence_lengths, questions):
+        sentence = " ".join(words[start:start + length])
+        start += length
+        sentences.append(sentence[:1].upper() + sentence[1:] + ("?" if question else "."))
+    return " ".join(sentences)
+
+
+def generate_turns(scale: float = 1.0, seed: int = 0, vocabulary=None):
+    """Yield (speaker, start_seconds, text) for a transcript `scale` times the real one."""
+    rng = np.random.default_rng(seed)
+    words, probs = vocabulary if vocabulary is not None else load_vocabulary()
+    n_turns = max(1, int(round(BASE_TURNS * scale)))
+
+    clock = 0.0
+    speaker = 0
+    for block_start in range(0, n_turns, BLOCK_TURNS):
+        n = min(BLOCK_TURNS, n_turns - block_start)
+        # Log-normal turn lengths: mostly short exchanges, some long monologues
+        lengths = np.maximum(3, rng.lognormal(np.log(MEAN_TURN_WORDS) - 0.4, 0.9, n).astype(int))
+        pool = rng.choice(words, size=int(lengths.sum()), p=probs)
+        switches = rng.random(n) >= SAME_SPEAKER_RATE
+        crosstalk = rng.random(n) < CROSSTALK_RATE
+        pauses = rng.exponential(1.5, n)
+
+        offset = 0
+        for i in range(n):
+            length = lengths[i]
+            turn_words = pool[offset:offset + length]
+            offset += length
+            sentence_lengths = []
+            remaining = length
+            while remaining > 0:
+                sentence_lengths.append(min(remaining, int(rng.integers(6, 22))))
+                remaining -= sentence_lengths[-1]
+            questions = rng.random(len(sentence_lengths)) < 0.15
+
+            if switches[i]:
+                speaker = 1 - speaker
+            name = CROSSTALK_SPEAKER if crosstalk[i] else SPEAKERS[speaker]
+            yield name, int(clock), turn_text(turn_words, sentence_lengths, questions)
+            clock += length / WORDS_PER_MINUTE * 60 + pauses[i]
+
+
+def write_transcript(path: Path, scale: float = 1.0, seed: int = 0, vocabulary=None) -> dict:
+    """Write an Otter-format transcript; returns turn/word/duration/byte counts."""
+    turns = words = last_start = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for speaker, start, text in generate_turns(scale, seed, vocabulary):
+            f.write(f"{speaker}  {format_timestamp(start)}\n{text}\n\n")
+            turns += 1
+            words += text.count(" ") + 1
+            last_start = start
+        f.write(f"{FOOTER}\n")
+    return {
+        "turns": turns,
+        "words": words,
+        "duration_seconds": last_start,
+        "bytes": path.stat().st_size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Otter.ai transcript")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiple of the real episode (1-1000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    stats = write_transcript(args.output, args.scale, args.seed)
+    print(f"Wrote {args.output}: {stats['turns']:,} turns, {stats['words']:,} words, "
+          f"{stats['duration_seconds'] / 3600:.1f}h, {stats['bytes'] / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,30 +5,24 @@ Creates meaningful, interpretable clusters where each cluster
 represents discussion around a specific philosophical claim.
 """
 
+import argparse
 import json
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Tuple
 
-try:
-    import ollama
-except ImportError:
-    print("Installing ollama...")
-    import subprocess
-    subprocess.check_call(["pip", "install", "ollama"])
-    import ollama
-
-try:
-    import umap
-except ImportError:
-    print("Installing umap-learn...")
-    import subprocess
-    subprocess.check_call(["pip", "install", "umap-learn"])
-    import umap
+from reduce_embeddings import METHODS, fit_reducer, transform, save_reducer, describe_reducer
+from project_umap import load_umap
+from serialization import copy_file, write_json_stream
+from instrumentation import step
 
 def get_embedding(text: str, model: str = "nomic-embed-text", max_chars: int = 8000) -> np.ndarray:
     """Get embedding for a text using Ollama. Truncates if too long."""
+    try:
+        import ollama
+    except ImportError as e:
+        raise ImportError("ollama is required for embedding: pip install ollama") from e
     # Truncate if too long (nomic-embed-text has ~8k token context)
     if len(text) > max_chars:
         text = text[:max_chars] + "..."
@@ -134,6 +128,7 @@ def build_claim_clusters(
 
 def project_umap(embeddings: np.ndarray, n_neighbors: int = 15, min_dist: float = 0.1) -> np.ndarray:
     """Project embeddings to 3D using UMAP."""
+    umap = load_umap()
     reducer = umap.UMAP(
         n_components=3,
         n_neighbors=n_neighbors,
@@ -149,45 +144,52 @@ def normalize_coordinates(coords: np.ndarray) -> np.ndarray:
     max_range = np.abs(coords).max()
     return coords / max_range if max_range > 0 else coords
 
-def main():
-    base_dir = Path(__file__).parent.parent
-    chunks_path = base_dir / 'data' / 'processed' / 'chunks_v2.json'
-    claims_path = base_dir / 'frontend' / 'public' / 'data' / 'claims.json'
-    output_path = base_dir / 'data' / 'processed' / 'landscape_v2.json'
-    frontend_output = base_dir / 'frontend' / 'public' / 'data' / 'landscape.json'
-
-    # Load chunks
-    print(f"Loading chunks from: {chunks_path}")
-    with open(chunks_path, 'r', encoding='utf-8') as f:
-        chunks_data = json.load(f)
+def build_claim_landscape(
+    chunks_data: Dict,
+    claims: List[Dict],
+    embed=embed_texts,
+    reduce: str = None,
+    reduce_dim: int = 50,
+    embedding_model: str = 'nomic-embed-text'
+) -> Tuple[Dict, Dict]:
+    """
+    Embed, assign and project chunks around claims.
+    Returns (landscape, pre-reducer or None); `embed` maps a list of texts to an array.
+    """
     chunks = chunks_data['chunks']
-    print(f"  Loaded {len(chunks)} chunks")
-
-    # Load claims
-    print(f"\nLoading claims from: {claims_path}")
-    with open(claims_path, 'r', encoding='utf-8') as f:
-        claims_data = json.load(f)
-    claims = claims_data['claims']
-    print(f"  Loaded {len(claims)} claims")
 
     # Embed chunks
     print("\nEmbedding chunks...")
     chunk_texts = [c['text'] for c in chunks]
-    chunk_embeddings = embed_texts(chunk_texts)
+    with step("embed_chunks"):
+        chunk_embeddings = embed(chunk_texts)
     print(f"  Chunk embeddings shape: {chunk_embeddings.shape}")
 
     # Embed claims
     print("\nEmbedding claims...")
     claim_texts = [c['text'] for c in claims]
-    claim_embeddings = embed_texts(claim_texts)
+    with step("embed_claims"):
+        claim_embeddings = embed(claim_texts)
     print(f"  Claim embeddings shape: {claim_embeddings.shape}")
 
+    # Optional pre-reduction: fit on chunks, apply the same transform to claims
+    reducer = None
+    pre_reduction = None
+    if reduce:
+        print(f"\nPre-reducing with {reduce} to {reduce_dim} dimensions...")
+        reducer = fit_reducer(chunk_embeddings, method=reduce, n_components=reduce_dim)
+        chunk_embeddings = transform(reducer, chunk_embeddings)
+        claim_embeddings = transform(reducer, claim_embeddings)
+        pre_reduction = describe_reducer(reducer)
+        print(f"  Reduced chunk embeddings shape: {chunk_embeddings.shape}")
+
     # Assign chunks to claims
     print("\nAssigning chunks to claims...")
-    assignments = assign_chunks_to_claims(
-        chunk_embeddings, claim_embeddings, claims,
-        similarity_threshold=0.35
-    )
+    with step("assign"):
+        assignments = assign_chunks_to_claims(
+            chunk_embeddings, claim_embeddings, claims,
+            similarity_threshold=0.35
+        )
 
     # Build claim-based clusters
     print("\nBuilding claim-based clusters...")
@@ -201,13 +203,15 @@ def main():
 
     # Project to 3D
     print("\nProjecting to 3D with UMAP...")
-    coords = project_umap(chunk_embeddings, n_neighbors=min(15, len(chunks)-1), min_dist=0.1)
+    with step("umap_chunks"):
+        coords = project_umap(chunk_embeddings, n_neighbors=min(15, len(chunks)-1), min_dist=0.1)
     coords = normalize_coordinates(coords)
 
     # Also project claims to show as landmarks
     print("Projecting claims to 3D...")
     all_embeddings = np.vstack([chunk_embeddings, claim_embeddings])
-    all_coords = project_umap(all_embeddings, n_neighbors=min(15, len(all_embeddings)-1), min_dist=0.1)
+    with step("umap_with_claims"):
+        all_coords = project_umap(all_embeddings, n_neighbors=min(15, len(all_embeddings)-1), min_dist=0.1)
     all_coords = normalize_coordinates(all_coords)
 
     chunk_coords = all_coords[:len(chunks)]
@@ -283,7 +287,6 @@ def main():
         ]
     }
 
-    # Build output
     landscape = {
         'metadata': {
             'version': 'v2',
@@ -292,7 +295,8 @@ def main():
             'num_clusters': len(clusters),
             'num_claims': len(claims),
             'umap_params': {'n_neighbors': 15, 'min_dist': 0.1},
-            'embedding_model': 'nomic-embed-text',
+            'pre_reduction': pre_reduction,
+            'embedding_model': embedding_model,
             'chunking': chunks_data['metadata']['chunking_params'],
             'statistics': chunks_data['metadata']['statistics']
         },
@@ -302,16 +306,50 @@ def main():
         'speaker_centroids': speaker_centroids
     }
 
+    return landscape, reducer
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster chunks around extracted claims")
+    parser.add_argument('--reduce', choices=METHODS, default=None,
+                        help='Optional linear pre-reduction before assignment and UMAP')
+    parser.add_argument('--reduce-dim', type=int, default=50, help='Target dimension for --reduce')
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    chunks_path = base_dir / 'data' / 'processed' / 'chunks_v2.json'
+    claims_path = base_dir / 'data' / 'processed' / 'claims.json'
+    output_path = base_dir / 'data' / 'processed' / 'landscape_v2.json'
+    frontend_output = base_dir / 'frontend' / 'public' / 'data' / 'landscape.json'
+    reducer_path = base_dir / 'data' / 'processed' / 'reducer_v2.npz'
+
+    # Load chunks
+    print(f"Loading chunks from: {chunks_path}")
+    with open(chunks_path, 'r', encoding='utf-8') as f:
+        chunks_data = json.load(f)
+    chunks = chunks_data['chunks']
+    print(f"  Loaded {len(chunks)} chunks")
+
+    # Load claims
+    print(f"\nLoading claims from: {claims_path}")
+    with open(claims_path, 'r', encoding='utf-8') as f:
+        claims_data = json.load(f)
+    claims = claims_data['claims']
+    print(f"  Loaded {len(claims)} claims")
+
+    landscape, reducer = build_claim_landscape(chunks_data, claims, reduce=args.reduce, reduce_dim=args.reduce_dim)
+    if reducer is not None:
+        save_reducer(reducer, reducer_path)
+        print(f"  Reducer saved to {reducer_path}")
+
     # Save
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(landscape, f, indent=2)
+    with step("write"):
+        write_json_stream(output_path, landscape, 'points', landscape['points'])
     print(f"\nSaved to: {output_path}")
 
-    with open(frontend_output, 'w', encoding='utf-8') as f:
-        json.dump(landscape, f)
+    copy_file(output_path, frontend_output)
     print(f"Copied to: {frontend_output}")
 
-    print(f"\nDone! New landscape has {len(points)} points in {len(clusters)} claim-based clusters")
+    print(f"\nDone! New landscape has {len(landscape['points'])} points in {len(landscape['clusters'])} claim-based clusters")
 
 if __name__ == '__main__':
     main()
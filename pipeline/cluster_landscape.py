@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Unsupervised clustering of landscape points.
+
+Clusters chunks directly from the embedding store (or the pre-reduced space
+from reduce_embeddings.py) without needing a curated claims file, then
+writes a cluster_id per point and per-cluster centroids into landscape.json.
+
+Two engines:
+- mini-batch k-means (numpy only, memory bounded by the batch size)
+- HDBSCAN (optional `hdbscan` package), reusing the k-nearest-neighbor
+  graph saved by project_umap.py as a sparse precomputed distance matrix
+"""
+
+import argparse
+import json
+import re
+import numpy as np
+from collections import Counter
+from pathlib import Path
+from datetime import datetime
+
+from reduce_embeddings import normalize_rows, load_reducer, transform
+from serialization import atomic_write, write_json_stream
+
+BASE_DIR = Path(__file__).parent.parent
+KNN_GRAPH_PATH = BASE_DIR / "data" / "processed" / "knn_graph.npz"
+
+CLUSTER_METHODS = ("kmeans", "hdbscan")
+
+STOPWORDS = set("""
+a about after again all also am an and any are as at be because been being but by can
+could did do does doing don't down for from get go going got had has have having he her
+here him his how i i'm if in into is it it's its just know like me more my no not now of
+on one or other our out over really right said say see she so some something than that
+that's the their them then there these they thing think this those through to too up us
+very was way we well were what when where which who why will with would yeah you your
+""".split())
+
+
+def default_n_clusters(n_points: int) -> int:
+    """Rule-of-thumb cluster count: sqrt(n/2), clamped to [2, 50]."""
+    return int(max(2, min(50, round(np.sqrt(n_points / 2)))))
+
+
+def _nearest_centers(data: np.ndarray, centers: np.ndarray, block: int = 8192) -> tuple[np.ndarray, np.ndarray]:
+    """Assign rows to their nearest center in blocks; returns (labels, squared distances)."""
+    center_sq = (centers ** 2).sum(axis=1)
+    labels = np.empty(len(data), dtype=np.int32)
+    dists = np.empty(len(data), dtype=np.float32)
+    for start in range(0, len(data), block):
+        rows = data[start:start + block]
+        d = (rows ** 2).sum(axis=1, keepdims=True) - 2 * rows @ centers.T + center_sq
+        labels[start:start + block] = d.argmin(axis=1)
+        dists[start:start + block] = np.maximum(d.min(axis=1), 0)
+    return labels, dists
+
+
+def _kmeans_plus_plus(data: np.ndarray, n_clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ seeding."""
+    centers = [data[rng.integers(len(data))]]
+    closest = ((data - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, n_clusters):
+        total = closest.sum()
+        idx = rng.choice(len(data), p=closest / total) if total > 0 else rng.integers(len(data))
+        centers.append(data[idx])
+        closest = np.minimum(closest, ((data - data[idx]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+def minibatch_kmeans(
+    data: np.ndarray,
+    n_clusters: int,
+    batch_size: int = 1024,
+    max_iter: int = 100,
+    init_size: int = 10000,
+    seed: int = 42,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Mini-batch k-means (Sculley 2010) with k-means++ seeding on a sample.
+
+    Each iteration touches only `batch_size` rows, so cost is independent of
+    corpus size apart from the final blocked assignment pass.
+    """
+    rng = np.random.default_rng(seed)
+    data = data.astype(np.float32)
+    n_clusters = min(n_clusters, len(data))
+
+    sample = data[rng.choice(len(data), size=min(init_size, len(data)), replace=False)]
+    centers = _kmeans_plus_plus(sample, n_clusters, rng).astype(np.float32)
+    counts = np.zeros(n_clusters, dtype=np.int64)
+
+    for _ in range(max_iter):
+        batch = data[rng.choice(len(data), size=min(batch_size, len(data)), replace=False)]
+        labels, _ = _nearest_centers(batch, centers)
+        previous = centers.copy()
+        for c in np.unique(labels):
+            members = batch[labels == c]
+            counts[c] += len(members)
+            rate = len(members) / counts[c]
+            centers[c] = (1 - rate) * centers[c] + rate * members.mean(axis=0)
+        if np.abs(centers - previous).max() < 1e-5:
+            break
+
+    labels, _ = _nearest_centers(data, centers)
+    return labels, centers
+
+
+def save_knn_graph(path: Path, indices: np.ndarray, distances: np.ndarray, space: str = "embeddings"):
+    """
+    Persist a k-nearest-neighbor graph (as computed by UMAP) for reuse.
+    `space` names the features it was built on: "embeddings" or "reduced".
+    """
+    with atomic_write(path) as f:
+        np.savez(f, indices=indices.astype(np.int32), distances=distances.astype(np.float32), space=space)
+
+
+def load_knn_graph(path: Path, n_points: int, space: str = "embeddings"):
+    """Load a saved kNN graph, or None if missing, for a different corpus or built in another space."""
+    if not path.exists():
+        return None
+    with np.load(path) as graph:
+        indices, distances = graph["indices"], graph["distances"]
+        saved_space = str(graph["space"]) if "space" in graph.files else None
+    if len(indices) != n_points or saved_space != space:
+        return None
+    return indices, distances
+
+
+def knn_to_sparse(indices: np.ndarray, distances: np.ndarray):
+    """Symmetric sparse distance matrix from a kNN graph (self-edges dropped)."""
+    from scipy.sparse import csr_matrix
+
+    n, k = indices.shape
+    rows = np.repeat(np.arange(n), k)
+    cols = indices.ravel()
+    vals = distances.ravel().astype(np.float64)
+    keep = (cols >= 0) & (cols != rows)
+    rows, cols, vals = rows[keep], cols[keep], vals[keep]
+    vals = np.maximum(vals, 1e-8)  # explicit zeros would read as missing edges
+    graph = csr_matrix((vals, (rows, cols)), shape=(n, n))
+    return graph.maximum(graph.T)
+
+
+def hdbscan_cluster(data: np.ndarray, min_cluster_size: int = 5, knn_graph=None) -> np.ndarray:
+    """HDBSCAN labels (-1 = noise), on a precomputed kNN graph when available."""
+    try:
+        import hdbscan
+    except ImportError as e:
+        raise ImportError("hdbscan is required for --method hdbscan: pip install hdbscan") from e
+
+    if knn_graph is not None and knn_graph[0].shape[0] != len(data):
+        print(f"  kNN graph has {knn_graph[0].shape[0]} rows for {len(data)} points; ignoring it")
+        knn_graph = None
+    if knn_graph is not None:
+        from scipy.sparse.csgraph import connected_components
+
+        graph = knn_to_sparse(*knn_graph)
+        n_components, _ = connected_components(graph, directed=False)
+        if n_components == 1:
+            clusterer = hdbscan.HDBSCAN(min_cluster_size=min_cluster_size, metric="precomputed")
+            return clusterer.fit_predict(graph)
+        # HDBSCAN can't build a spanning tree over a disconnected graph
+        print(f"  kNN graph has {n_components} connected components; clustering on the features instead")
+    clusterer = hdbscan.HDBSCAN(min_cluster_size=min_cluster_size, metric="euclidean", core_dist_n_jobs=-1)
+    return clusterer.fit_predict(data)
+
+
+def label_clusters(texts: list, labels: np.ndarray, top_n: int = 3) -> dict:
+    """Short labels from each cluster's most over-represented words."""
+    tokenized = [
+        [w for w in re.findall(r"[a-z']+", t.lower()) if len(w) > 3 and w not in STOPWORDS]
+        for t in texts
+    ]
+    corpus = Counter(w for words in tokenized for w in words)
+    corpus_total = sum(corpus.values()) or 1
+
+    names = {}
+    for c in np.unique(labels):
+        if c < 0:
+            continue
+        local = Counter(w for i in np.flatnonzero(labels == c) for w in tokenized[i])
+        local_total = sum(local.values()) or 1
+        scored = sorted(
+            (w for w, n in local.items() if n >= 2),
+            key=lambda w: (local[w] / local_total) / (corpus[w] / corpus_total) * np.log1p(local[w]),
+            reverse=True,
+        )
+        names[int(c)] = ", ".join(scored[:top_n]) if scored else f"Cluster {c}"
+    return names
+
+
+def build_clusters(labels: np.ndarray, coords: np.ndarray, speakers: list, names: dict) -> list:
+    """Cluster objects with 3D centroids, sizes and dominant speaker."""
+    speakers = np.asarray(speakers)
+    clusters = []
+    for c in np.unique(labels):
+        if c < 0:
+            continue
+        members = labels == c
+        speaker_counts = Counter(speakers[members].tolist())
+        clusters.append({
+            "id": int(c),
+            "label": names.get(int(c), f"Cluster {c}"),
+            "centroid": [float(v) for v in coords[members].mean(axis=0)],
+            "count": int(members.sum()),
+            "dominant_speaker": speaker_counts.most_common(1)[0][0],
+        })
+    clusters.sort(key=lambda c: c["count"], reverse=True)
+    return clusters
+
+
+def cluster_points(
+    features: np.ndarray,
+    method: str = "kmeans",
+    n_clusters: int | None = None,
+    min_cluster_size: int = 5,
+    knn_graph=None,
+) -> np.ndarray:
+    """Cluster feature rows (embeddings or reduced vectors) with the chosen engine."""
+    if method not in CLUSTER_METHODS:
+        raise ValueError(f"Unknown clustering method: {method} (expected one of {CLUSTER_METHODS})")
+    data = normalize_rows(features.astype(np.float32))
+    if method == "hdbscan":
+        return hdbscan_cluster(data, min_cluster_size=min_cluster_size, knn_graph=knn_graph)
+    return minibatch_kmeans(data, n_clusters or default_n_clusters(len(data)))[0]
+
+
+def apply_clusters(landscape: dict, labels: np.ndarray, texts: list) -> dict:
+    """Write cluster_id per point plus cluster objects into a landscape dict."""
+    points = landscape["points"]
+    coords = np.array([[p["x"], p["y"], p["z"]] for p in points])
+    for point, label in zip(points, labels):
+        point["cluster_id"] = int(label)
+    landscape["clusters"] = build_clusters(
+        labels, coords, [p["speaker"] for p in points], label_clusters(texts, labels)
+    )
+    return landscape
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unsupervised clustering of landscape points")
+    parser.add_argument("--method", choices=CLUSTER_METHODS, default="kmeans")
+    parser.add_argument("--clusters", type=int, default=None, help="k for k-means (default: sqrt(n/2))")
+    parser.add_argument("--min-cluster-size", type=int, default=5, help="HDBSCAN minimum cluster size")
+    parser.add_argument("--space", choices=("embeddings", "reduced"), default="embeddings",
+                        help="Cluster raw embeddings or the space saved in reducer.npz")
+    args = parser.parse_args()
+
+    embeddings_path = BASE_DIR / "data" / "processed" / "embeddings.npy"
+    chunks_path = BASE_DIR / "data" / "processed" / "chunks.json"
+    landscape_path = BASE_DIR / "data" / "processed" / "landscape.json"
+    reducer_path = BASE_DIR / "data" / "processed" / "reducer.npz"
+
+    print(f"Loading embeddings from: {embeddings_path}")
+    features = np.load(embeddings_path)
+    if args.space == "reduced":
+        features = transform(load_reducer(reducer_path), features)
+    print(f"Feature matrix: {features.shape}")
+
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        chunks = json.load(f)["chunks"]
+    with open(landscape_path, "r", encoding="utf-8") as f:
+        landscape = json.load(f)
+
+    knn_graph = load_knn_graph(KNN_GRAPH_PATH, len(features), args.space) if args.method == "hdbscan" else None
+    if knn_graph is not None:
+        print(f"Reusing kNN graph from: {KNN_GRAPH_PATH}")
+
+    print(f"\nClustering with {args.method}...")
+    labels = cluster_points(features, args.method, args.clusters, args.min_cluster_size, knn_graph)
+    apply_clusters(landscape, labels, [c["text"] for c in chunks])
+
+    landscape["metadata"]["clustering"] = {
+        "method": args.method,
+        "space": args.space,
+        "num_clusters": len(landscape["clusters"]),
+        "noise_points": int((labels < 0).sum()),
+        "clustered_at": datetime.now().isoformat(),
+    }
+
+    write_json_stream(landscape_path, landscape, "points", landscape["points"])
+
+    print(f"  Clusters: {len(landscape['clusters'])}")
+    for cluster in landscape["clusters"][:10]:
+        print(f"  [{cluster['id']:>2}] {cluster['count']:>4} points  {cluster['label']}")
+    print(f"\nSaved landscape to: {landscape_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+from serialization import write_json_stream
+
 def estimate_tokens(text: str) -> int:
     """Rough token estimate (words * 1.3 for English)."""
     return int(len(text.split()) * 1.3)
@@ -112,6 +114,22 @@ def analyze_chunks(chunks: list) -> dict:
         'duration_covered': chunks[-1]['end_time'] - chunks[0]['start_time'] if chunks else 0
     }
 
+def chunk_document(transcript: dict) -> dict:
+    """Chunk a parsed transcript into the chunks.json document."""
+    chunks = create_chunks(transcript['segments'])
+    return {
+        'metadata': {
+            'source': transcript['metadata']['source'],
+            'created_at': datetime.now().isoformat(),
+            'chunking_params': {
+                'min_tokens': 150,
+                'max_tokens': 450
+            },
+            'statistics': analyze_chunks(chunks)
+        },
+        'chunks': chunks
+    }
+
 def main():
     base_dir = Path(__file__).parent.parent
     input_path = base_dir / 'data' / 'processed' / 'transcript_diarized.json'
@@ -122,27 +140,13 @@ def main():
     with open(input_path, 'r', encoding='utf-8') as f:
         transcript = json.load(f)
 
-    segments = transcript['segments']
-    print(f"Processing {len(segments)} segments...")
-
-    chunks = create_chunks(segments)
-    stats = analyze_chunks(chunks)
+    print(f"Processing {len(transcript['segments'])} segments...")
 
-    result = {
-        'metadata': {
-            'source': transcript['metadata']['source'],
-            'created_at': datetime.now().isoformat(),
-            'chunking_params': {
-                'min_tokens': 150,
-                'max_tokens': 450
-            },
-            'statistics': stats
-        },
-        'chunks': chunks
-    }
+    result = chunk_document(transcript)
+    chunks = result['chunks']
+    stats = result['metadata']['statistics']
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    write_json_stream(output_path, result, 'chunks', chunks)
 
     print(f"\nChunking complete!")
     print(f"  Total chunks: {stats['total_chunks']}")
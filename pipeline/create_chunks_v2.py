@@ -9,6 +9,8 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+from serialization import write_json_stream
+
 def estimate_tokens(text: str) -> int:
     """Rough token estimate (words * 1.3 for English)."""
     return int(len(text.split()) * 1.3)
@@ -134,6 +136,26 @@ def analyze_chunks(chunks: list) -> dict:
         'total_duration': chunks[-1]['end_time'] - chunks[0]['start_time'] if chunks else 0
     }
 
+def chunk_document(transcript: dict) -> dict:
+    """Chunk a parsed transcript into the chunks_v2.json document."""
+    # Create medium-sized chunks (targeting 60-80 chunks)
+    params = {
+        'min_tokens': 300,
+        'max_tokens': 600,
+        'allow_cross_speaker': True
+    }
+    chunks = create_chunks_v2(transcript['segments'], **params)
+    return {
+        'metadata': {
+            'source': transcript['metadata']['source'],
+            'created_at': datetime.now().isoformat(),
+            'version': 'v2',
+            'chunking_params': params,
+            'statistics': analyze_chunks(chunks)
+        },
+        'chunks': chunks
+    }
+
 def main():
     base_dir = Path(__file__).parent.parent
     input_path = base_dir / 'data' / 'processed' / 'transcript_diarized.json'
@@ -144,35 +166,13 @@ def main():
     with open(input_path, 'r', encoding='utf-8') as f:
         transcript = json.load(f)
 
-    segments = transcript['segments']
-    print(f"Processing {len(segments)} segments...")
+    print(f"Processing {len(transcript['segments'])} segments...")
 
-    # Create medium-sized chunks (targeting 60-80 chunks)
-    chunks = create_chunks_v2(
-        segments,
-        min_tokens=300,
-        max_tokens=600,
-        allow_cross_speaker=True
-    )
-    stats = analyze_chunks(chunks)
-
-    result = {
-        'metadata': {
-            'source': transcript['metadata']['source'],
-            'created_at': datetime.now().isoformat(),
-            'version': 'v2',
-            'chunking_params': {
-                'min_tokens': 300,
-                'max_tokens': 600,
-                'allow_cross_speaker': True
-            },
-            'statistics': stats
-        },
-        'chunks': chunks
-    }
+    result = chunk_document(transcript)
+    chunks = result['chunks']
+    stats = result['metadata']['statistics']
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    write_json_stream(output_path, result, 'chunks', chunks)
 
     print(f"\nChunking complete!")
     print(f"  Total chunks: {stats['total_chunks']} (was 270 in v1)")
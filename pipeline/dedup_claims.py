@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Semantic near-duplicate claim deduplication.
+
+Implements the `dedup_strategy: semantic` setting in .opal/config.yaml.
+When claims from many episodes are merged into one claims.json, the same
+claim reappears with slightly different wording. This stage:
+
+1. Finds candidate pairs in sub-quadratic time with two LSH families:
+   - random-hyperplane (SimHash) bands over claim embeddings
+   - MinHash bands over word shingles of the claim text
+2. Confirms each candidate with exact cosine similarity
+3. Merges confirmed duplicates (union-find), keeping the earliest claim
+   (by episode, then timestamp) as the representative and recording every source claim as provenance
+4. Remaps engagement_map and thematic_clusters to the surviving IDs
+
+This is a standalone tool, not a run_pipeline.py stage: it only has work
+to do once several episodes' claims files exist, and it needs claim
+embeddings (Ollama, or --embeddings). Its output, claims_merged.json, is
+meant to replace claims.json once reviewed; nothing reads it directly.
+
+Usage:
+    python pipeline/dedup_claims.py ep521/claims.json ep522/claims.json --output data/processed/claims_merged.json
+    python pipeline/dedup_claims.py --embeddings claim_vectors.npy
+"""
+
+import argparse
+import json
+import re
+import zlib
+import numpy as np
+from collections import defaultdict
+from itertools import combinations
+from pathlib import Path
+from datetime import datetime
+
+from reduce_embeddings import normalize_rows
+from serialization import write_json
+
+SIMILARITY_THRESHOLD = 0.92
+HYPERPLANE_TABLES = 16     # bands of random-hyperplane bits
+HYPERPLANE_BITS = 12       # bits per band
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4           # rows per band -> 64 permutations
+SHINGLE_SIZE = 3
+MAX_BUCKET = 200           # larger buckets are split by the other bands' keys
+
+_PRIME = (1 << 31) - 1  # keeps a * x below 2**62 in uint64 arithmetic
+
+
+def hyperplane_candidates(vectors: np.ndarray, tables: int = HYPERPLANE_TABLES,
+                          bits: int = HYPERPLANE_BITS, seed: int = 42) -> set:
+    """Pairs that share a random-hyperplane signature in at least one band."""
+    rng = np.random.default_rng(seed)
+    planes = rng.standard_normal((vectors.shape[1], tables * bits)).astype(np.float32)
+    signs = (vectors @ planes > 0).reshape(len(vectors), tables, bits)
+    keys = (signs * (1 << np.arange(bits))).sum(axis=2)
+    return _banded_pairs(keys)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Hashed word shingles of a claim's text."""
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    if len(words) < size:
+        words = words + [""] * (size - len(words))
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def minhash_signatures(texts: list, num_perm: int, seed: int = 42) -> np.ndarray:
+    """MinHash signatures (num_texts x num_perm) with universal hashing."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for i, text in enumerate(texts):
+        hashed = np.fromiter(shingles(text), dtype=np.uint64) % np.uint64(_PRIME)
+        signatures[i] = ((hashed[:, None] * a + b) % np.uint64(_PRIME)).min(axis=0)
+    return signatures
+
+
+def minhash_candidates(texts: list, bands: int = MINHASH_BANDS, rows: int = MINHASH_ROWS) -> set:
+    """Pairs whose MinHash signatures agree on every row of at least one band."""
+    signatures = minhash_signatures(texts, bands * rows).reshape(len(texts), bands, rows)
+    keys = np.array([[hash(band.tobytes()) for band in sig] for sig in signatures])
+    return _banded_pairs(keys)
+
+
+def _split_bucket(members: list, keys: list, band: int) -> list:
+    """Split an oversized bucket by the other bands' keys until every part fits."""
+    parts = [members]
+    for extra in range(len(keys[0])):
+        if extra == band or all(len(part) <= MAX_BUCKET for part in parts):
+            continue
+        split = []
+        for part in parts:
+            if len(part) <= MAX_BUCKET:
+                split.append(part)
+                continue
+            sub = defaultdict(list)
+            for item in part:
+                sub[keys[item][extra]].append(item)
+            split.extend(sub.values())
+        parts = split
+    return parts
+
+
+def _banded_pairs(keys: np.ndarray) -> set:
+    """
+    Candidate pairs from (items x bands) bucket keys. A bucket over
+    MAX_BUCKET is split by the other bands' keys; a part that no band
+    separates (identical signatures, e.g. repeated text) is linked to its
+    first member instead of pairwise, so no member is dropped.
+    """
+    rows = keys.tolist()
+    pairs = set()
+    for band in range(keys.shape[1]):
+        buckets = defaultdict(list)
+        for item, row in enumerate(rows):
+            buckets[row[band]].append(item)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for part in _split_bucket(members, rows, band) if len(members) > MAX_BUCKET else [members]:
+                if len(part) <= MAX_BUCKET:
+                    pairs.update(combinations(part, 2))
+                else:
+                    pairs.update((part[0], item) for item in part[1:])
+    return pairs
+
+
+def confirm_pairs(vectors: np.ndarray, pairs: set, threshold: float = SIMILARITY_THRESHOLD) -> list:
+    """Keep candidate pairs whose exact cosine similarity meets the threshold."""
+    if not pairs:
+        return []
+    left, right = np.array(sorted(pairs)).T
+    sims = (vectors[left] * vectors[right]).sum(axis=1)
+    keep = sims >= threshold
+    return list(zip(left[keep].tolist(), right[keep].tolist(), sims[keep].tolist()))
+
+
+def find_groups(n: int, pairs: list) -> list:
+    """Connected components (union-find) of confirmed duplicate pairs."""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b, _ in pairs:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    groups = defaultdict(list)
+    for i in range(n):
+        groups[find(i)].append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def _unique(values: list) -> list:
+    return list(dict.fromkeys(values))
+
+
+def chronological_keys(claims: list) -> list:
+    """
+    Sort key per claim: (episode, timestamp, position). Timestamps restart
+    with each episode, and episodes rank in the order their claims first
+    appear, i.e. the order the claims files were given in. A claim's episode
+    is its `episode` field, else the file it was loaded from.
+    """
+    episodes = {}
+    keys = []
+    for i, claim in enumerate(claims):
+        source = (claim.get("provenance") or [{}])[0].get("source")
+        episode = episodes.setdefault(claim.get("episode", source), len(episodes))
+        keys.append((episode, claim.get("timestamp") or 0, i))
+    return keys
+
+
+def merge_group(claims: list, members: list, order: list) -> dict:
+    """Merge duplicates into the earliest claim (by `order` key), keeping provenance."""
+    members = sorted(members, key=order.__getitem__)
+    merged = dict(claims[members[0]])
+    for field in ("warrants", "evidence", "related_concepts"):
+        merged[field] = _unique([v for i in members for v in claims[i].get(field, [])])
+    merged["merged_from"] = [claims[i]["id"] for i in members[1:]]
+    merged["provenance"] = [
+        p for i in members
+        for p in claims[i].get("provenance") or [{"claim_id": claims[i]["id"], "timestamp": claims[i].get("timestamp")}]
+    ]
+    return merged
+
+
+def dedup_claims(claims: list, vectors: np.ndarray, threshold: float = SIMILARITY_THRESHOLD,
+                 same_speaker_only: bool = True) -> tuple[list, dict, dict]:
+    """Deduplicate claims. Returns (claims, id_map old->new, stats)."""
+    vectors = normalize_rows(vectors.astype(np.float32))
+    texts = [c["text"] for c in claims]
+
+    semantic = hyperplane_candidates(vectors)
+    lexical = minhash_candidates(texts)
+    candidates = semantic | lexical
+    if same_speaker_only:
+        candidates = {(a, b) for a, b in candidates if claims[a]["speaker"] == claims[b]["speaker"]}
+
+    confirmed = confirm_pairs(vectors, candidates, threshold)
+    groups = find_groups(len(claims), confirmed)
+    group_of = {i: g for g, members in enumerate(groups) for i in members}
+    weakest = defaultdict(lambda: 1.0)
+    for a, _, sim in confirmed:
+        weakest[group_of[a]] = min(weakest[group_of[a]], sim)
+
+    order = chronological_keys(claims)
+    id_map = {}
+    replacement = {}
+    dropped = set()
+    for g, members in enumerate(groups):
+        merged = merge_group(claims, members, order)
+        merged["dedup_similarity"] = round(weakest[g], 4)
+        first = min(members, key=order.__getitem__)
+        replacement[first] = merged
+        for i in members:
+            id_map[claims[i]["id"]] = merged["id"]
+            if i != first:
+                dropped.add(i)
+
+    result = [replacement.get(i, c) for i, c in enumerate(claims) if i not in dropped]
+    stats = {
+        "input_claims": len(claims),
+        "output_claims": len(result),
+        "candidate_pairs": len(candidates),
+        "semantic_candidates": len(semantic),
+        "lexical_candidates": len(lexical),
+        "confirmed_pairs": len(confirmed),
+        "merged_groups": len(groups),
+        "threshold": threshold,
+    }
+    return result, id_map, stats
+
+
+def remap_claim_ids(claims_data: dict, id_map: dict) -> dict:
+    """Point engagement_map and thematic_clusters at surviving claim IDs."""
+    engagement = {}
+    for entry in claims_data.get("engagement_map", []):
+        claim_id = id_map.get(entry["claim_id"], entry["claim_id"])
+        target = engagement.setdefault(claim_id, {"claim_id": claim_id, "responses": []})
+        for response in entry["responses"]:
+            response = dict(response, claim_id=id_map.get(response["claim_id"], response["claim_id"]))
+            if response["claim_id"] != claim_id and response not in target["responses"]:
+                target["responses"].append(response)
+    claims_data["engagement_map"] = list(engagement.values())
+
+    clusters = {}
+    for cluster in claims_data.get("thematic_clusters", []):
+        merged = clusters.setdefault(cluster["id"], dict(cluster, claims=[]))
+        merged["claims"] = _unique(merged["claims"] + [id_map.get(c, c) for c in cluster["claims"]])
+    claims_data["thematic_clusters"] = list(clusters.values())
+    return claims_data
+
+
+def load_claim_sources(paths: list) -> dict:
+    """Concatenate claims from several claims.json files with provenance.
+
+    Claim IDs that collide across files get a numeric suffix; the original
+    ID and file are kept in each claim's provenance. Thematic cluster IDs
+    are namespaced the same way, so two episodes' unrelated clusters that
+    happen to share an ID stay separate.
+    """
+    merged = {"claims": [], "engagement_map": [], "thematic_clusters": []}
+    seen = set()
+    seen_clusters = set()
+    for n, path in enumerate(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        merged.setdefault("metadata", data.get("metadata", {}))
+        renamed = {}
+        for claim in data["claims"]:
+            claim = dict(claim)
+            new_id = claim["id"] if claim["id"] not in seen else f"{claim['id']}-{n}"
+            renamed[claim["id"]] = new_id
+            seen.add(new_id)
+            claim.setdefault("provenance", [{
+                "source": str(path),
+                "claim_id": claim["id"],
+                "timestamp": claim.get("timestamp"),
+            }])
+            claim["id"] = new_id
+            merged["claims"].append(claim)
+        merged["engagement_map"].extend(
+            {"claim_id": renamed.get(e["claim_id"], e["claim_id"]),
+             "responses": [dict(r, claim_id=renamed.get(r["claim_id"], r["claim_id"])) for r in e["responses"]]}
+            for e in data.get("engagement_map", [])
+        )
+        for cluster in data.get("thematic_clusters", []):
+            cluster_id = cluster["id"] if cluster["id"] not in seen_clusters else f"{cluster['id']}-{n}"
+            seen_clusters.add(cluster_id)
+            merged["thematic_clusters"].append(
+                dict(cluster, id=cluster_id, source=str(path), claims=[renamed.get(i, i) for i in cluster["claims"]])
+            )
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge near-duplicate claims across episodes")
+    parser.add_argument("inputs", nargs="*", type=Path, help="claims.json files (default: data/processed/claims.json)")
+    parser.add_argument("--output", type=Path, default=None, help="Output path (default: data/processed/claims_merged.json)")
+    parser.add_argument("--embeddings", type=Path, default=None,
+                        help="Precomputed claim embeddings (.npy, one row per input claim)")
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD, help="Cosine similarity to merge")
+    parser.add_argument("--cross-speaker", action="store_true", help="Also merge claims made by different speakers")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    inputs = args.inputs or [base_dir / "data" / "processed" / "claims.json"]
+    output_path = args.output or base_dir / "data" / "processed" / "claims_merged.json"
+
+    print(f"Loading claims from {len(inputs)} file(s)...")
+    claims_data = load_claim_sources(inputs)
+    claims = claims_data["claims"]
+    print(f"  Loaded {len(claims)} claims")
+
+    if args.embeddings:
+        vectors = np.load(args.embeddings)
+    else:
+        from generate_embeddings import get_embedding
+        print("Embedding claims...")
+        vectors = np.array([get_embedding(c["text"]) for c in claims], dtype=np.float32)
+
+    deduped, id_map, stats = dedup_claims(claims, vectors, args.threshold, not args.cross_speaker)
+    claims_data["claims"] = deduped
+    remap_claim_ids(claims_data, id_map)
+    claims_data["metadata"] = dict(
+        claims_data.get("metadata", {}),
+        total_claims=len(deduped),
+        dedup={**stats, "strategy": "semantic", "deduplicated_at": datetime.now().isoformat()},
+    )
+
+    write_json(output_path, claims_data)
+
+    print(f"\n  Candidate pairs: {stats['candidate_pairs']} "
+          f"(hyperplane {stats['semantic_candidates']}, minhash {stats['lexical_candidates']})")
+    print(f"  Confirmed duplicates: {stats['confirmed_pairs']} in {stats['merged_groups']} groups")
+    print(f"  Claims: {stats['input_claims']} -> {stats['output_claims']}")
+    print(f"\nOutput: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Transcript context for generated Steel Man Arena rounds.
+
+Each debater turn is grounded in what that speaker actually said. For a
+round topic the assembler:
+
+1. retrieves the speaker's top chunks from the embedding store
+   (embeddings.npy + chunks.json, searched through search_chunks.ChunkIndex)
+2. drops passages that overlap one already chosen: the same chunk, an
+   overlapping time span, or repeated wording (DUPLICATE_CONTAINMENT of
+   the shorter passage's word trigrams appear in the other; the episode's
+   cold open replays lines that recur later at full length)
+3. packs the survivors, best first, into a token budget (create_chunks'
+   estimate_tokens) and lists them in transcript order
+
+Retrieval is precomputed for every topic of a run at once: the new topics
+are embedded, scored against the chunk matrix in a single matrix product,
+and both speakers' candidates are cut from the same scores. Results go to
+.cache/dialogue_context/retrieval.json. The cache is tied to the embedding
+store's files and model, so a repeated topic costs no search at all
+(unless a larger k asks for deeper candidate lists).
+
+Usage:
+    python pipeline/dialogue_context.py "Is forgiveness always possible?" --budget 600
+"""
+
+import argparse
+import time
+import numpy as np
+from pathlib import Path
+
+from create_chunks import estimate_tokens
+from generate_embeddings import OFFLINE_MODEL, get_embedding, hash_embedding
+from search_chunks import CHUNKS_PATH, EMBEDDINGS_PATH, ChunkIndex
+from serialization import read_json, write_json
+
+PROJECT_DIR = Path(__file__).parent.parent
+EMBEDDINGS_META_PATH = PROJECT_DIR / "data" / "processed" / "embeddings_meta.json"
+CACHE_PATH = PROJECT_DIR / ".cache" / "dialogue_context" / "retrieval.json"
+
+# Arena speaker -> transcript speaker
+SPEAKER_CHUNKS = {
+    "demartini_steelmanned": "demartini",
+    "marcus_steelmanned": "marcus",
+}
+
+DEFAULT_K = 6
+DEFAULT_BUDGET = 900  # estimated tokens of passages per speaker
+CANDIDATE_FACTOR = 3  # retrieve k * this so deduplication still leaves k
+DUPLICATE_CONTAINMENT = 0.4
+
+
+def topic_key(topic: str) -> str:
+    return " ".join(topic.lower().split())
+
+
+def store_fingerprint(embeddings_path: Path, chunks_path: Path, model: str) -> dict:
+    """Size and mtime of the store's files plus the embedding model; retrieval is valid while it matches."""
+    return {
+        "model": model,
+        **{name: [path.stat().st_size, path.stat().st_mtime_ns]
+           for name, path in (("embeddings", embeddings_path), ("chunks", chunks_path))},
+    }
+
+
+def shingles(text: str) -> set:
+    words = text.lower().split()
+    return {" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))}
+
+
+def overlaps(a: dict, b: dict) -> bool:
+    return a["start_time"] < b["end_time"] and b["start_time"] < a["end_time"]
+
+
+def dedupe(candidates: list, chunks: list, k: int) -> list:
+    """
+    Up to k (row, score) candidates, best first, skipping any that repeat
+    a chosen passage: same chunk, overlapping time span or repeated wording.
+    """
+    chosen = []
+    for row, score in candidates:
+        if len(chosen) >= k:
+            break
+        chunk = chunks[row]
+        words = shingles(chunk["text"])
+        duplicate = any(
+            row == other or overlaps(chunk, chunks[other])
+            or len(words & other_words) >= DUPLICATE_CONTAINMENT * min(len(words), len(other_words))
+            for other, _, other_words in chosen
+        )
+        if not duplicate:
+            chosen.append((row, score, words))
+    return [(row, score) for row, score, _ in chosen]
+
+
+def pack(passages: list, budget: int) -> list:
+    """
+    Passages (dicts with "text", best first) that fit in `budget` estimated
+    tokens, in transcript order. Passages that don't fit are skipped in
+    favour of shorter ones further down; if not even the best one fits, it
+    is cut to the budget.
+    """
+    packed, used = [], 0
+    for passage in passages:
+        tokens = estimate_tokens(passage["text"])
+        if used + tokens <= budget:
+            packed.append({**passage, "tokens": tokens})
+            used += tokens
+    if not packed and passages and budget > 0:
+        words = passages[0]["text"].split()[:int(budget / 1.3)]
+        text = " ".join(words) + "..."
+        packed.append({**passages[0], "text": text, "tokens": estimate_tokens(text)})
+    return sorted(packed, key=lambda p: p["start_time"])
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def query_embedder(model: str, embed_fn=None):
+    """
+    Embed queries in the store's space: the offline hasher for an offline
+    store, otherwise embed_fn(text, model) (get_embedding by default).
+    """
+    if model == OFFLINE_MODEL:
+        return hash_embedding
+    embed = embed_fn or get_embedding
+    return lambda text: embed(text, model)
+
+
+class ContextAssembler:
+    """Per-topic, per-speaker passages for round prompts, with cached retrieval."""
+
+    def __init__(self, index: ChunkIndex, fingerprint: dict, k: int = DEFAULT_K, budget: int = DEFAULT_BUDGET,
+                 cache_path: Path | None = CACHE_PATH):
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.index = index
+        self.k = k
+        self.budget = budget
+        self.depth = k * CANDIDATE_FACTOR
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.rows = {
+            speaker: np.array([i for i, chunk in enumerate(index.chunks) if chunk.get("speaker") == name],
+                              dtype=np.int64)
+            for speaker, name in SPEAKER_CHUNKS.items()
+        }
+        self._key = fingerprint
+        self._topics = self._load_cache()
+
+    @classmethod
+    def load(cls, embeddings_path: Path = EMBEDDINGS_PATH, chunks_path: Path = CHUNKS_PATH,
+             meta_path: Path = EMBEDDINGS_META_PATH, embed_fn=None, **kwargs):
+        """Open the embedding store; queries are embedded with the model recorded in embeddings_meta.json."""
+        model = read_json(meta_path)["model"]
+        index = ChunkIndex.load(embeddings_path, chunks_path, embed_fn=query_embedder(model, embed_fn))
+        return cls(index, store_fingerprint(embeddings_path, chunks_path, model), **kwargs)
+
+    def _load_cache(self) -> dict:
+        if not self.cache_path:
+            return {}
+        try:
+            cached = read_json(self.cache_path)
+        except (OSError, ValueError):
+            return {}
+        return cached["topics"] if cached.get("key") == self._key else {}
+
+    def _save_cache(self):
+        if self.cache_path:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(self.cache_path, {"key": self._key, "topics": self._topics})
+
+    def precompute(self, topics: list) -> int:
+        """Retrieve candidates for every uncached topic in one search; returns how many were searched."""
+        missing = list(dict.fromkeys(
+            key for key in map(topic_key, topics)
+            if self._topics.get(key, {}).get("depth", 0) < self.depth
+        ))
+        if not missing:
+            return 0
+        vectors = np.stack([self.index.embed_query(key) for key in missing])
+        scores = vectors @ self.index.matrix.T  # (topics, chunks)
+        for key, row_scores in zip(missing, scores):
+            entry = {"depth": self.depth}
+            for speaker, rows in self.rows.items():
+                depth = min(self.depth, len(rows))
+                if not depth:
+                    entry[speaker] = []
+                    continue
+                speaker_scores = row_scores[rows]
+                top = np.argpartition(-speaker_scores, depth - 1)[:depth]
+                top = top[np.argsort(-speaker_scores[top])]
+                entry[speaker] = [[int(rows[i]), round(float(speaker_scores[i]), 4)] for i in top]
+            self._topics[key] = entry
+        self._save_cache()
+        return len(missing)
+
+    def passages(self, topic: str, speaker: str) -> list:
+        """The packed passages for one speaker on one topic, in transcript order."""
+        self.precompute([topic])
+        chunks = self.index.chunks
+        chosen = dedupe(self._topics[topic_key(topic)][speaker], chunks, self.k)
+        return pack([
+            {"chunk_id": chunks[row]["id"], "score": score, "start_time": chunks[row]["start_time"],
+             "time_label": chunks[row]["time_label"], "text": chunks[row]["text"]}
+            for row, score in chosen
+        ], self.budget)
+
+    def context(self, topic: str) -> dict:
+        """{arena speaker: packed passages} for a topic."""
+        return {speaker: self.passages(topic, speaker) for speaker in SPEAKER_CHUNKS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the transcript context assembled for a round topic")
+    parser.add_argument("topic", nargs="+", help="Round topic(s)")
+    parser.add_argument("-k", type=positive_int, default=DEFAULT_K, help="Passages per speaker")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Estimated tokens per speaker")
+    args = parser.parse_args()
+
+    assembler = ContextAssembler.load(k=args.k, budget=args.budget)
+    start = time.perf_counter()
+    searched = assembler.precompute(args.topic)
+    unique = len({topic_key(t) for t in args.topic})
+    print(f"{unique} topic(s), {searched} searched, {unique - searched} cached "
+          f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+    for topic in args.topic:
+        print(f"\n{topic}")
+        for speaker, passages in assembler.context(topic).items():
+            print(f"  {speaker}: {len(passages)} passages, {sum(p['tokens'] for p in passages)} tokens")
+            for p in passages:
+                print(f"    [{p['time_label']:>7}] {p['score']:.3f}  {p['text'][:90]}...")
+
+
+if __name__ == "__main__":
+    main()
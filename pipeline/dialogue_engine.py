@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Local-LLM generation of Steel Man Arena rounds.
+
+Talks to an Ollama-compatible endpoint (POST /api/chat, non-streaming)
+rather than a hosted API, so custom rounds can be generated offline. The
+endpoint defaults to $OLLAMA_HOST, or http://localhost:11434 when that is
+unset. Anything that answers /api/chat the way Ollama does will work,
+including a stand-in server for tests.
+
+A round is three turns. The two steel-manned positions don't depend on
+each other, so they are requested concurrently. The synthesis turn reads
+both of them, so it is requested once they are back. Independent rounds
+also run concurrently. Every request goes through one pool of
+`concurrency` workers, which bounds the number of in-flight requests
+however many rounds are queued.
+
+Responses are cached on disk in .cache/llm/, one file per request, keyed
+by the SHA-256 of model + system prompt + prompt + options. A re-run, or a
+topic that repeats within a run, never reaches the model. Identical
+requests that are in flight at the same time share one call.
+
+Debater prompts can carry the speaker's own transcript passages
+(dialogue_context.py). The passages are part of the prompt, so they are
+part of the cache key.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from serialization import loads, read_json, write_json
+
+PROJECT_DIR = Path(__file__).parent.parent
+CACHE_DIR = PROJECT_DIR / ".cache" / "llm"
+
+DEFAULT_ENDPOINT = "http://localhost:11434"
+DEFAULT_MODEL = "llama3.1"
+DEFAULT_OPTIONS = {"temperature": 0.7, "seed": 521, "num_predict": 700}
+DEFAULT_CONCURRENCY = 4
+TIMEOUT_SECONDS = 300
+
+DEBATERS = ("demartini_steelmanned", "marcus_steelmanned")
+SYNTHESIS = "synthesis"
+
+DEMARTINI_VOICE = """You are presenting Dr. John Demartini's philosophical position in its STRONGEST possible form (steel-manned).
+
+Core tenets:
+- Evil is an epistemological category (incomplete perception), not ontological (real force)
+- Every event has both upsides and downsides - unity of opposites
+- Therapeutic dissolution: finding the hidden order frees people from victimhood
+- Moral labels prevent understanding; understanding enables prevention
+- Cultural relativism: no universal moral values exist across all times and places
+- The highest awareness sees events without emotional charge
+
+When responding to a topic:
+1. Present the most intellectually rigorous version of this position
+2. Ground arguments in therapeutic experience and philosophical precedent
+3. Acknowledge the grain of truth in opposing views
+4. Aim for insight, not winning"""
+
+MARCUS_VOICE = """You are presenting Aubrey Marcus's philosophical position in its STRONGEST possible form (steel-manned).
+
+Core tenets:
+- Some acts ARE fundamentally wrong regardless of perspective (torture, abuse)
+- Moral knowledge is embodied - we "know in our body" what's wrong
+- We have a sacred obligation to act against evil, not just understand it
+- The victim's perspective cannot be dissolved through the perpetrator's healing
+- Moral evolution is real - ending child sacrifice was progress, not preference
+- Both understanding AND moral judgment can coexist (both/and, not either/or)
+
+When responding to a topic:
+1. Present the most intellectually rigorous version of this position
+2. Ground arguments in somatic epistemology and lived experience
+3. Acknowledge the grain of truth in opposing views
+4. Aim for insight, not winning"""
+
+SYNTHESIS_VOICE = """You are the Synthesis voice, identifying genuine common ground and clarifying the structure of disagreement.
+
+Your role:
+- Identify where both positions are correct in different domains or time frames
+- Clarify the temporal framing: therapeutic (after harm) vs moral (during harm)
+- Note domain confusion when frameworks are misapplied
+- Distinguish psychological observations from moral judgments
+- Identify irreducible disagreements vs resolvable misunderstandings
+- Suggest practical convergence even where metaphysical divergence remains
+
+Be honest about genuine disagreements - don't force false synthesis."""
+
+VOICES = {
+    "demartini_steelmanned": DEMARTINI_VOICE,
+    "marcus_steelmanned": MARCUS_VOICE,
+    "synthesis": SYNTHESIS_VOICE,
+}
+
+DEBATER_PROMPT = """TOPIC: {topic}
+{passages}
+Present your position on this topic in its strongest form, in one or two paragraphs.
+
+Respond with JSON only:
+{{"content": "...", "warrants": ["...", "..."], "strength": "..."}}
+
+"warrants" lists what the argument rests on; "strength" says in one line why it is hard to dismiss."""
+
+PASSAGES_SECTION = """
+What you actually said in the original conversation, in order (draw on it, and stay faithful to it):
+
+{passages}
+"""
+
+SYNTHESIS_PROMPT = """TOPIC: {topic}
+
+DEMARTINI (Steel-Manned):
+{demartini}
+
+MARCUS (Steel-Manned):
+{marcus}
+
+Identify the common ground, clarify the structure of the disagreement, and note what can and cannot be resolved, in one paragraph.
+
+Respond with JSON only:
+{{"content": "...", "insight": "..."}}
+
+"insight" names the key move in a short phrase."""
+
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def endpoint_from_env() -> str:
+    """$OLLAMA_HOST (which may omit the scheme, as the Ollama CLI allows) or the default."""
+    host = os.environ.get("OLLAMA_HOST", "").strip()
+    if not host:
+        return DEFAULT_ENDPOINT
+    return host if "://" in host else f"http://{host}"
+
+
+class LLMError(RuntimeError):
+    pass
+
+
+class OllamaClient:
+    """Cached, thread-safe /api/chat client; `hits`/`misses` count cache use."""
+
+    def __init__(self, endpoint: str | None = None, model: str = DEFAULT_MODEL, options: dict | None = None,
+                 cache_dir: Path | None = CACHE_DIR, timeout: float = TIMEOUT_SECONDS):
+        self.endpoint = (endpoint or endpoint_from_env()).rstrip("/")
+        self.model = model
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> Future of the response text
+
+    def request(self, system: str, prompt: str) -> dict:
+        """The /api/chat body for one turn; everything in it goes into the cache key."""
+        return {
+            "model": self.model,
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+            "format": "json",
+            "options": self.options,
+            "stream": False,
+        }
+
+    @staticmethod
+    def cache_key(body: dict) -> str:
+        return hashlib.sha256(json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def chat(self, system: str, prompt: str) -> str:
+        """The assistant's reply, from the cache when this exact request has been made before."""
+        body = self.request(system, prompt)
+        key = self.cache_key(body)
+        with self._lock:
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = self._in_flight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            with self._lock:
+                self.hits += 1
+            return pending.result()
+
+        try:
+            text = self._cached(key)
+            with self._lock:
+                if text is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+            if text is None:
+                text = self._post(body)
+                if self.cache_dir:
+                    path = self._cache_path(key)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    write_json(path, {"request": body, "response": text})
+            pending.set_result(text)
+            return text
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def embed(self, text: str, model: str) -> list:
+        """Embedding from /api/embeddings on the same endpoint (not cached here)."""
+        reply = self._call("/api/embeddings", {"model": model, "prompt": text})
+        try:
+            return reply["embedding"]
+        except (KeyError, TypeError) as e:
+            raise LLMError(f"{self.endpoint}: unexpected reply {str(reply)[:200]}") from e
+
+    def _cached(self, key: str) -> str | None:
+        if not self.cache_dir:
+            return None
+        try:
+            return read_json(self._cache_path(key))["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _post(self, body: dict) -> str:
+        reply = self._call("/api/chat", body)
+        try:
+            return reply["message"]["content"]
+        except (KeyError, TypeError) as e:
+            raise LLMError(f"{self.endpoint}: unexpected reply {str(reply)[:200]}") from e
+
+    def _call(self, path: str, body: dict) -> dict:
+        request = urllib.request.Request(
+            f"{self.endpoint}{path}",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise LLMError(f"{self.endpoint}: HTTP {e.code}: {e.read().decode('utf-8', 'replace')[:200]}") from e
+        except urllib.error.URLError as e:
+            raise LLMError(f"{self.endpoint} unreachable ({e.reason}); is `ollama serve` running?") from e
+
+
+def parse_turn(text: str, speaker: str) -> dict:
+    """An exchange dict from a model reply; replies that aren't the requested JSON become plain content."""
+    try:
+        fields = loads(text)
+    except ValueError:
+        fields = None
+    if not isinstance(fields, dict) or not isinstance(fields.get("content"), str):
+        fields = {"content": text.strip()}
+    keys = ("warrants", "strength") if speaker in DEBATERS else ("insight",)
+    return {"speaker": speaker, "content": fields["content"].strip(),
+            **{k: fields[k] for k in keys if k in fields}}
+
+
+def generate_turn(client: OllamaClient, speaker: str, prompt: str, passages: list = ()) -> dict:
+    turn = parse_turn(client.chat(VOICES[speaker], prompt), speaker)
+    if passages:
+        turn["sources"] = [p["chunk_id"] for p in passages]
+    return turn
+
+
+def debater_prompt(topic: str, passages: list = ()) -> str:
+    """The turn prompt; `passages` are dialogue_context passages ({"time_label", "text", ...})."""
+    section = PASSAGES_SECTION.format(passages=format_passages(passages)) if passages else ""
+    return DEBATER_PROMPT.format(topic=topic, passages=section)
+
+
+def format_passages(passages: list) -> str:
+    return "\n\n".join(f"[{p['time_label']}] {p['text']}" for p in passages)
+
+
+def synthesis_prompt(topic: str, demartini: dict, marcus: dict) -> str:
+    return SYNTHESIS_PROMPT.format(topic=topic, demartini=demartini["content"], marcus=marcus["content"])
+
+
+def _start_round(pool: ThreadPoolExecutor, client: OllamaClient, topic: str, context: dict) -> Future:
+    """Submit both debater turns, then the synthesis once both are back; resolves to the exchanges."""
+    done = Future()
+    turns = [
+        pool.submit(generate_turn, client, speaker, debater_prompt(topic, context.get(speaker, ())),
+                    context.get(speaker, ()))
+        for speaker in DEBATERS
+    ]
+    remaining = [len(turns)]
+    lock = threading.Lock()
+
+    def finish(synthesis: Future):
+        try:
+            done.set_result([turns[0].result(), turns[1].result(), synthesis.result()])
+        except BaseException as e:
+            done.set_exception(e)
+
+    def turn_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            demartini, marcus = (t.result() for t in turns)
+            synthesis = pool.submit(generate_turn, client, SYNTHESIS, synthesis_prompt(topic, demartini, marcus))
+        except BaseException as e:
+            done.set_exception(e)
+            return
+        synthesis.add_done_callback(finish)
+
+    for turn in turns:
+        turn.add_done_callback(turn_done)
+    return done
+
+
+def topic_dimension(topic: str) -> str:
+    return SLUG_RE.sub("_", topic.lower()).strip("_")[:48] or "custom"
+
+
+def generate_rounds(client: OllamaClient, topics: list, concurrency: int = DEFAULT_CONCURRENCY,
+                    first_id: int = 1, contexts: dict | None = None) -> list:
+    """
+    One round per topic, in topic order. `contexts` maps a topic to
+    {speaker: passages} for the debater prompts (see dialogue_context.py).
+
+    Turns are never waited on from inside the pool (the synthesis is
+    chained with a callback), so the pool's workers only ever run
+    requests and `concurrency` is the cap on in-flight requests.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="llm") as pool:
+        pending = [_start_round(pool, client, topic, (contexts or {}).get(topic, {})) for topic in topics]
+        exchanges = [future.result() for future in pending]
+    return [
+        {
+            "id": first_id + i,
+            "topic": topic,
+            "dimension": topic_dimension(topic),
+            "exchanges": round_exchanges,
+            "generated": {"model": client.model, "options": client.options},
+        }
+        for i, (topic, round_exchanges) in enumerate(zip(topics, exchanges))
+    ]
@@ -12,12 +12,32 @@ Features:
 1. Pre-populated rounds covering key debate dimensions
 2. API spec for Google Gemini integration to generate custom dialogues
 3. User prompt templates for generating new rounds on custom topics
+4. Custom rounds generated locally through an Ollama-compatible endpoint
+   (dialogue_engine.py), concurrently and cached in .cache/llm/
+5. Each custom debater turn grounded in that speaker's own transcript
+   passages (dialogue_context.py)
+
+Usage:
+    python pipeline/generate_dialogue.py
+    python pipeline/generate_dialogue.py --topic "Is forgiveness always possible?" --topic "Is moral relativism dangerous?"
+    python pipeline/generate_dialogue.py --topics-file topics.txt --model llama3.1 --concurrency 4
+    python pipeline/generate_dialogue.py --topic "..." --context-k 4 --context-budget 600
+    python pipeline/generate_dialogue.py --topic "..." --no-context
 """
 
+import argparse
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 
+from dialogue_context import DEFAULT_BUDGET, DEFAULT_K, ContextAssembler, positive_int, topic_key
+from dialogue_engine import (
+    DEFAULT_CONCURRENCY, DEFAULT_MODEL, DEMARTINI_VOICE, MARCUS_VOICE, SYNTHESIS_VOICE,
+    OllamaClient, endpoint_from_env, generate_rounds,
+)
+from serialization import write_json
+
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data" / "processed"
 OUTPUT_DIR = Path(__file__).parent.parent / "data" / "processed"
@@ -210,49 +230,9 @@ def generate_steel_manned_dialogue():
         "description": "Configuration for Google Gemini API to generate custom dialogue rounds",
         "api_endpoint": "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent",
         "system_prompts": {
-            "demartini_voice": """You are presenting Dr. John Demartini's philosophical position in its STRONGEST possible form (steel-manned).
-
-Core tenets:
-- Evil is an epistemological category (incomplete perception), not ontological (real force)
-- Every event has both upsides and downsides - unity of opposites
-- Therapeutic dissolution: finding the hidden order frees people from victimhood
-- Moral labels prevent understanding; understanding enables prevention
-- Cultural relativism: no universal moral values exist across all times and places
-- The highest awareness sees events without emotional charge
-
-When responding to a topic:
-1. Present the most intellectually rigorous version of this position
-2. Ground arguments in therapeutic experience and philosophical precedent
-3. Acknowledge the grain of truth in opposing views
-4. Aim for insight, not winning""",
-
-            "marcus_voice": """You are presenting Aubrey Marcus's philosophical position in its STRONGEST possible form (steel-manned).
-
-Core tenets:
-- Some acts ARE fundamentally wrong regardless of perspective (torture, abuse)
-- Moral knowledge is embodied - we "know in our body" what's wrong
-- We have a sacred obligation to act against evil, not just understand it
-- The victim's perspective cannot be dissolved through the perpetrator's healing
-- Moral evolution is real - ending child sacrifice was progress, not preference
-- Both understanding AND moral judgment can coexist (both/and, not either/or)
-
-When responding to a topic:
-1. Present the most intellectually rigorous version of this position
-2. Ground arguments in somatic epistemology and lived experience
-3. Acknowledge the grain of truth in opposing views
-4. Aim for insight, not winning""",
-
-            "synthesis_voice": """You are the Synthesis voice, identifying genuine common ground and clarifying the structure of disagreement.
-
-Your role:
-- Identify where both positions are correct in different domains or time frames
-- Clarify the temporal framing: therapeutic (after harm) vs moral (during harm)
-- Note domain confusion when frameworks are misapplied
-- Distinguish psychological observations from moral judgments
-- Identify irreducible disagreements vs resolvable misunderstandings
-- Suggest practical convergence even where metaphysical divergence remains
-
-Be honest about genuine disagreements - don't force false synthesis."""
+            "demartini_voice": DEMARTINI_VOICE,
+            "marcus_voice": MARCUS_VOICE,
+            "synthesis_voice": SYNTHESIS_VOICE
         },
         "prompt_template": """TOPIC: {user_topic}
 
@@ -335,7 +315,44 @@ Whether evil has ontological status (is real) or merely epistemological status (
     return dialogue
 
 
+def read_topics(args) -> list:
+    """
+    --topic values, then --topics-file lines (blank lines and # comments
+    skipped), with whitespace collapsed and repeats dropped.
+
+    The topic goes into the prompts verbatim, so the model cache only hits
+    for the same string; normalizing here keeps "Is evil real? " and
+    "Is  evil real?" to one request. Topics that differ only in case are
+    one topic for retrieval (topic_key), so the first spelling is kept.
+    """
+    raw = list(args.topic or [])
+    if args.topics_file:
+        raw += [line for line in args.topics_file.read_text(encoding="utf-8").splitlines()
+                if not line.strip().startswith("#")]
+    topics = {}
+    for topic in raw:
+        topic = " ".join(topic.split())
+        if topic:
+            topics.setdefault(topic_key(topic), topic)
+    return list(topics.values())
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Create the steel-manned dialogue")
+    parser.add_argument("--topic", action="append", help="Generate a custom round on this topic (repeatable)")
+    parser.add_argument("--topics-file", type=Path, help="File with one custom round topic per line")
+    parser.add_argument("--endpoint", default=endpoint_from_env(),
+                        help="Ollama-compatible endpoint (default: $OLLAMA_HOST or http://localhost:11434)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model for custom rounds")
+    parser.add_argument("--temperature", type=float, default=None, help="Sampling temperature")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Requests in flight at once")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the model (responses are not cached)")
+    parser.add_argument("--no-context", action="store_true", help="Don't add transcript passages to the prompts")
+    parser.add_argument("--context-k", type=positive_int, default=DEFAULT_K, help="Transcript passages per speaker")
+    parser.add_argument("--context-budget", type=int, default=DEFAULT_BUDGET,
+                        help="Estimated tokens of passages per speaker")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("  Generative Dialogue - Steel-Manned Debate")
     print("=" * 60)
@@ -348,10 +365,33 @@ def main():
     print("\nGenerating steel-manned dialogue...")
     dialogue = generate_steel_manned_dialogue()
 
+    topics = read_topics(args)
+    if topics:
+        options = {} if args.temperature is None else {"temperature": args.temperature}
+        client_kwargs = {"cache_dir": None} if args.no_cache else {}
+        client = OllamaClient(args.endpoint, args.model, options, **client_kwargs)
+        contexts = None
+        if not args.no_context:
+            print(f"\nAssembling transcript context (top {args.context_k} passages, "
+                  f"{args.context_budget} tokens per speaker)...")
+            start = time.perf_counter()
+            assembler = ContextAssembler.load(embed_fn=client.embed, k=args.context_k, budget=args.context_budget)
+            searched = assembler.precompute(topics)
+            contexts = {topic: assembler.context(topic) for topic in topics}
+            print(f"  {searched} topic(s) searched, {len(topics) - searched} cached "
+                  f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(f"\nGenerating {len(topics)} custom round(s) with {client.model} at {client.endpoint} "
+              f"({args.concurrency} concurrent)...")
+        start = time.perf_counter()
+        custom = generate_rounds(client, topics, args.concurrency, first_id=len(dialogue["rounds"]) + 1,
+                                 contexts=contexts)
+        dialogue["rounds"].extend(custom)
+        print(f"  {len(custom)} rounds in {time.perf_counter() - start:.2f}s "
+              f"({client.misses} model calls, {client.hits} cached)")
+
     # Save
     output_path = OUTPUT_DIR / "dialogue.json"
-    with open(output_path, "w") as f:
-        json.dump(dialogue, f, indent=2)
+    write_json(output_path, dialogue)
 
     print(f"\nDialogue saved to: {output_path}")
     print(f"\n  Rounds: {len(dialogue['rounds'])}")
@@ -2,17 +2,30 @@
 """
 Generate embeddings for chunks using Ollama's nomic-embed-text model.
 Outputs embeddings.npy for UMAP projection.
+
+With --offline, chunks are embedded with a deterministic feature-hashing
+embedder instead (no Ollama needed). The vectors only capture shared
+vocabulary, not meaning, but have the same shape and dtype, so every
+downstream stage can run in CI and benchmarks.
 """
 
+import argparse
+import hashlib
 import json
+import re
 import subprocess
 import numpy as np
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 import sys
 
+from serialization import atomic_write, write_json
+
 EMBED_DIM = 768  # nomic-embed-text dimension
 MAX_CHARS = 8000  # Truncate texts longer than this
+OFFLINE_MODEL = "feature-hashing"
+TOKEN_RE = re.compile(r"[a-z0-9']+")
 
 def get_embedding(text: str, model: str = "nomic-embed-text") -> list[float]:
     """Get embedding from Ollama."""
@@ -41,19 +54,33 @@ def get_embedding(text: str, model: str = "nomic-embed-text") -> list[float]:
 
     return embedding
 
-def main():
-    base_dir = Path(__file__).parent.parent
-    chunks_path = base_dir / "data" / "processed" / "chunks.json"
-    embeddings_path = base_dir / "data" / "processed" / "embeddings.npy"
-    metadata_path = base_dir / "data" / "processed" / "embeddings_meta.json"
-
-    print(f"Loading chunks from: {chunks_path}")
-
-    with open(chunks_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    chunks = data["chunks"]
-    print(f"Generating embeddings for {len(chunks)} chunks...")
+@lru_cache(maxsize=1 << 16)
+def hash_feature(feature: str, dim: int = EMBED_DIM) -> tuple[int, float]:
+    """Bucket and sign for one feature (stable across runs and processes)."""
+    h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return h % dim, 1.0 if (h >> 63) else -1.0
+
+def hash_embedding(text: str, dim: int = EMBED_DIM) -> np.ndarray:
+    """Offline embedding: signed feature hashing of word unigrams and bigrams, L2-normalized."""
+    tokens = TOKEN_RE.findall(text[:MAX_CHARS].lower())
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        index, sign = hash_feature(feature, dim)
+        vector[index] += sign
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+def embed_offline(texts: list[str], dim: int = EMBED_DIM) -> np.ndarray:
+    """Stack hash embeddings for many texts into an (n, dim) float32 array."""
+    embeddings = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        embeddings[i] = hash_embedding(text, dim)
+    return embeddings
+
+def embed_chunks(chunks: list, offline: bool = False) -> np.ndarray:
+    """(n_chunks, EMBED_DIM) float32 embeddings of the chunk texts."""
+    if offline:
+        return embed_offline([chunk["text"] for chunk in chunks])
 
     embeddings = []
     for i, chunk in enumerate(chunks):
@@ -69,23 +96,47 @@ def main():
             embeddings.append([0.0] * EMBED_DIM)
 
     # Convert to numpy array
-    embeddings_array = np.array(embeddings, dtype=np.float32)
+    return np.array(embeddings, dtype=np.float32)
+
+def embeddings_metadata(embeddings: np.ndarray, offline: bool = False) -> dict:
+    """Contents of embeddings_meta.json for an embedding matrix."""
+    return {
+        "model": OFFLINE_MODEL if offline else "nomic-embed-text",
+        "dimensions": embeddings.shape[1],
+        "num_chunks": len(embeddings),
+        "created_at": datetime.now().isoformat(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed transcript chunks")
+    parser.add_argument("--offline", action="store_true",
+                        help=f"Use the {OFFLINE_MODEL} embedder instead of Ollama")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    chunks_path = base_dir / "data" / "processed" / "chunks.json"
+    embeddings_path = base_dir / "data" / "processed" / "embeddings.npy"
+    metadata_path = base_dir / "data" / "processed" / "embeddings_meta.json"
+
+    print(f"Loading chunks from: {chunks_path}")
+
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    chunks = data["chunks"]
+    print(f"Generating embeddings for {len(chunks)} chunks...")
+
+    embeddings_array = embed_chunks(chunks, offline=args.offline)
 
     print(f"\nEmbeddings shape: {embeddings_array.shape}")
 
     # Save embeddings
-    np.save(embeddings_path, embeddings_array)
+    with atomic_write(embeddings_path) as f:
+        np.save(f, embeddings_array)
     print(f"Saved embeddings to: {embeddings_path}")
 
     # Save metadata
-    meta = {
-        "model": "nomic-embed-text",
-        "dimensions": embeddings_array.shape[1],
-        "num_chunks": len(chunks),
-        "created_at": datetime.now().isoformat(),
-    }
-    with open(metadata_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2)
+    write_json(metadata_path, embeddings_metadata(embeddings_array, offline=args.offline))
 
     print(f"Saved metadata to: {metadata_path}")
 
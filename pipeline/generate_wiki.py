@@ -4,17 +4,60 @@ generate_wiki.py - Extract entities from claims and generate wiki entries
 
 Identifies concepts, thinkers, frameworks, and traditions from the analyzed
 debate, then generates markdown wiki entries for each using templates.
+
+Each entity type renders through its template in .opal/templates (see
+template_engine.py). The generator only builds a context dict per entity;
+the templates are compiled once per process and reused for every page, so
+editing a template changes only the pages of its entity type.
+
+Pages render across a process pool (--workers), and a page is written only
+when its content hash differs from the file on disk, so unchanged pages
+keep their mtimes. index.json is likewise left alone unless its entity
+lists change.
+
+Regeneration is incremental at the claim level. Each run stores the claims
+and a fingerprint of the generator and templates in .cache/wiki/. The next
+run diffs the claims against that snapshot by ID and re-renders only the
+affected pages:
+- the pages of added or edited claims;
+- the concept and thinker pages whose claim lists changed.
+Framework and tradition pages do not read claims, so they re-render only
+when their template changes. A changed template re-renders its entity type.
+A changed generator, a missing snapshot, or --full re-renders everything.
 """
 
+import argparse
+import hashlib
 import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from serialization import read_json, write_if_changed, write_json
+import template_engine
+from template_engine import load_template
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data" / "processed"
 WIKI_DIR = Path(__file__).parent.parent / "wiki"
 TEMPLATE_DIR = Path(__file__).parent.parent / ".opal" / "templates"
+SNAPSHOT_PATH = Path(__file__).parent.parent / ".cache" / "wiki" / "snapshot.json"
+
+ENTITY_TYPES = ["concepts", "thinkers", "frameworks", "traditions", "claims"]
+TEMPLATE_FILES = {
+    "concepts": "concept.md",
+    "thinkers": "thinker.md",
+    "frameworks": "framework.md",
+    "traditions": "tradition.md",
+    "claims": "claim.md",
+}
+# Below this many pages, starting worker processes costs more than it saves
+PARALLEL_MIN_PAGES = 200
+RELATED_CONCEPTS = 5
 
 # Entity classification rules
 THINKERS = {
@@ -323,190 +366,144 @@ def load_flow():
         return json.load(f)
 
 
-def extract_concept_usage(claims_data):
-    """Extract which concepts each speaker uses and how."""
-    concept_usage = defaultdict(lambda: {"marcus": [], "demartini": []})
+def thinker_patterns(thinkers=THINKERS):
+    """Lowercase search strings for each thinker: the key and the key with spaces."""
+    patterns = defaultdict(list)
+    for key in thinkers:
+        for pattern in dict.fromkeys([key, key.replace("_", " ")]):
+            patterns[pattern].append(key)
+    return patterns
+
+
+def compile_thinker_matcher(thinkers=THINKERS):
+    """
+    Finds every thinker mentioned anywhere in a lowercased text in one scan.
+
+    Matching is by substring, as before ("christ" matches "christianity").
+    The lookahead tries the patterns at every position, longest first. A
+    shorter pattern that also matches at that position is a prefix of the
+    longest match, so `implied` adds it.
+    """
+    patterns = thinker_patterns(thinkers)
+    ordered = sorted(patterns, key=len, reverse=True)
+    regex = re.compile("(?=(" + "|".join(re.escape(p) for p in ordered) + "))")
+    implied = {
+        p: {key for q in patterns if p.startswith(q) for key in patterns[q]}
+        for p in patterns
+    }
+
+    def match(text):
+        found = set()
+        for m in regex.finditer(text):
+            found |= implied[m.group(1)]
+        return found
+
+    return match
+
+
+def index_claims(claims_data, thinkers=THINKERS):
+    """
+    One pass over the claims, building the lookups every entry generator reads.
+
+    Returns {"concept": {key: [claims]}, "thinker": {key: [claims]},
+    "speaker": {speaker: [claims]}}, each list in claim order. A thinker is
+    linked to a claim when the claim's warrants name them.
+    """
+    find_thinkers = compile_thinker_matcher(thinkers)
+    by_concept = defaultdict(list)
+    by_thinker = defaultdict(list)
+    by_speaker = defaultdict(list)
 
     for claim in claims_data["claims"]:
-        speaker = claim["speaker"]
-        claim_id = claim["id"]
+        by_speaker[claim["speaker"]].append(claim)
+        for concept in dict.fromkeys(claim.get("related_concepts", [])):
+            by_concept[concept].append(claim)
+        for thinker in find_thinkers(" ".join(claim.get("warrants", [])).lower()):
+            by_thinker[thinker].append(claim)
+
+    return {"concept": by_concept, "thinker": by_thinker, "speaker": by_speaker}
+
+
+def extract_concept_usage(claim_index):
+    """Extract which concepts each speaker uses and how."""
+    concept_usage = defaultdict(lambda: {"marcus": [], "demartini": []})
 
-        for concept in claim.get("related_concepts", []):
+    for concept, claims in claim_index["concept"].items():
+        for claim in claims:
             text = claim["text"]
             if len(text) > 100:
                 text = text[:100] + "..."
-            concept_usage[concept][speaker].append({
-                "claim_id": claim_id,
+            concept_usage[concept][claim["speaker"]].append({
+                "claim_id": claim["id"],
                 "text": text
             })
 
     return concept_usage
 
 
+@lru_cache(maxsize=None)
 def make_link(text):
     """Make a wiki link from a concept key."""
     return "[[" + text.replace("_", " ").title() + "]]"
 
 
-def generate_concept_entry(concept_key, concept_data, usage_data, claims_data):
-    """Generate a wiki entry for a concept."""
+def related_concepts(concept_key, claim_index, k=RELATED_CONCEPTS):
+    """
+    Up to k concepts most often named by the same claims as concept_key,
+    topped up with concepts from the same domain.
+
+    This is link_graph's co-citation measure, taken from the claims rather
+    than the rendered pages (the link graph is built after the wiki).
+    """
+    counts = Counter()
+    for claim in claim_index["concept"].get(concept_key, []):
+        counts.update(c for c in dict.fromkeys(claim.get("related_concepts", [])) if c in CONCEPTS and c != concept_key)
+    related = [concept for concept, _ in counts.most_common(k)]
+    domain = CONCEPTS[concept_key].get("domain")
+    related += [
+        c for c, data in CONCEPTS.items()
+        if c != concept_key and c not in related and data.get("domain") == domain
+    ]
+    return related[:k]
 
-    title = concept_key.replace("_", " ").title()
 
-    # Find related claims
-    related_claims = []
-    for claim in claims_data["claims"]:
-        if concept_key in claim.get("related_concepts", []):
-            related_claims.append(claim["id"])
-
-    # Build Marcus and Demartini usage sections
+def concept_context(concept_key, concept_data, usage_data, claim_index):
+    """Template context for a concept page."""
+    related_claims = [claim["id"] for claim in claim_index["concept"].get(concept_key, [])]
     marcus_usage = usage_data.get("marcus", [])
     demartini_usage = usage_data.get("demartini", [])
+    domain = concept_data.get("domain", "philosophy")
+
+    return {
+        "title": concept_key.replace("_", " ").title(),
+        "marcus_count": len(marcus_usage),
+        "demartini_count": len(demartini_usage),
+        "controversy_level": concept_data.get("controversy_level", "medium"),
+        "domain": domain,
+        "domain_title": domain.title(),
+        "related_claims": related_claims,
+        "related_claims_json": json.dumps(related_claims),
+        "definition": concept_data.get("definition", "Definition pending analysis."),
+        "claim_count": len(related_claims),
+        "invoked_by": "both speakers" if marcus_usage and demartini_usage else "Marcus" if marcus_usage else "Demartini",
+        "marcus_invokes": bool(marcus_usage),
+        "marcus_usage": marcus_usage[:3],
+        "demartini_invokes": bool(demartini_usage),
+        "demartini_usage": demartini_usage[:3],
+        "related_concepts": [make_link(c) for c in related_concepts(concept_key, claim_index)],
+    }
 
-    marcus_lines = []
-    if marcus_usage:
-        marcus_lines.append("Marcus invokes this concept in his arguments:")
-        marcus_lines.append("")
-        for u in marcus_usage[:3]:
-            marcus_lines.append(f"- **{u['claim_id']}**: \"{u['text']}\"")
-    else:
-        marcus_lines.append("Marcus does not directly invoke this concept.")
-
-    demartini_lines = []
-    if demartini_usage:
-        demartini_lines.append("Demartini invokes this concept in his arguments:")
-        demartini_lines.append("")
-        for u in demartini_usage[:3]:
-            demartini_lines.append(f"- **{u['claim_id']}**: \"{u['text']}\"")
-    else:
-        demartini_lines.append("Demartini does not directly invoke this concept.")
-
-    # Related concepts
-    related_concept_links = []
-    for c in list(CONCEPTS.keys())[:5]:
-        if c != concept_key:
-            related_concept_links.append(f"- {make_link(c)}")
-
-    # Related claim links
-    claim_links = [f"- [[{c}]]" for c in related_claims]
-
-    both = "both speakers" if marcus_usage and demartini_usage else "Marcus" if marcus_usage else "Demartini"
-
-    lines = [
-        "---",
-        "type: concept",
-        f'title: "{title}"',
-        "aliases: []",
-        "tradition:",
-        "speaker_usage:",
-        f"  marcus: {len(marcus_usage)}",
-        f"  demartini: {len(demartini_usage)}",
-        f"controversy_level: {concept_data.get('controversy_level', 'medium')}",
-        f"domain: {concept_data.get('domain', 'philosophy')}",
-        f"related_claims: {json.dumps(related_claims)}",
-        "---",
-        "",
-        f"# {title}",
-        "",
-        "## Definition",
-        "",
-        concept_data.get('definition', 'Definition pending analysis.'),
-        "",
-        "",
-        "## In This Debate",
-        "",
-        f"This concept appears {len(related_claims)} times across the debate, invoked by {both}.",
-        "",
-        "",
-        "## Marcus's Usage",
-        "",
-    ]
-    lines.extend(marcus_lines)
-    lines.extend([
-        "",
-        "",
-        "## Demartini's Usage",
-        "",
-    ])
-    lines.extend(demartini_lines)
-    lines.extend([
-        "",
-        "",
-        "## Philosophical Context",
-        "",
-        f"Domain: **{concept_data.get('domain', 'philosophy').title()}**",
-        "",
-        "This concept has roots in various philosophical traditions and plays a key role in understanding the tension between the speakers' worldviews.",
-        "",
-        "",
-        "## Related Concepts",
-        "",
-    ])
-    lines.extend(related_concept_links[:5])
-    lines.extend([
-        "",
-        "",
-        "## Key Claims Involving This Concept",
-        "",
-    ])
-    lines.extend(claim_links)
-    lines.extend([
-        "",
-        "",
-        "---",
-        "",
-        "*Part of the [[Dialectical Topology]] wiki layer.*",
-    ])
-
-    return "\n".join(lines)
-
-
-def generate_thinker_entry(thinker_key, thinker_data, claims_data):
-    """Generate a wiki entry for a thinker."""
 
+def thinker_context(thinker_key, thinker_data, claim_index):
+    """Template context for a thinker page."""
     name = thinker_data["name"]
+    key_ideas = thinker_data.get("key_ideas", [])
 
-    # Find which claims reference this thinker (via warrants)
+    # Claims that reference this thinker (via warrants)
     marcus_refs = []
     demartini_refs = []
-
-    for claim in claims_data["claims"]:
-        warrants_text = " ".join(claim.get("warrants", []))
-        check_name = thinker_key.replace("_", " ")
-        if thinker_key in warrants_text.lower() or check_name in warrants_text.lower():
-            if claim["speaker"] == "marcus":
-                marcus_refs.append(claim)
-            else:
-                demartini_refs.append(claim)
-
-    # Key ideas formatted
-    key_ideas_lines = []
-    for idea in thinker_data.get('key_ideas', []):
-        key_ideas_lines.append(f"- **{idea}**")
-
-    # Marcus citations
-    marcus_lines = []
-    if marcus_refs:
-        for c in marcus_refs[:2]:
-            text = c['text'][:80]
-            marcus_lines.append(f"- **{c['id']}**: Uses {name}'s ideas to argue: \"{text}...\"")
-    else:
-        marcus_lines.append("Marcus does not directly cite this thinker.")
-
-    # Demartini citations
-    demartini_lines = []
-    if demartini_refs:
-        for c in demartini_refs[:2]:
-            text = c['text'][:80]
-            demartini_lines.append(f"- **{c['id']}**: Uses {name}'s ideas to argue: \"{text}...\"")
-    else:
-        demartini_lines.append("Demartini does not directly cite this thinker.")
-
-    # Associated concepts
-    concept_links = []
-    for idea in thinker_data.get('key_ideas', [])[:3]:
-        formatted = idea.replace(' ', '_').lower().replace('_', ' ').title()
-        concept_links.append(f"- [[{formatted}]]")
+    for claim in claim_index["thinker"].get(thinker_key, []):
+        (marcus_refs if claim["speaker"] == "marcus" else demartini_refs).append(claim)
 
     invoked = []
     if marcus_refs:
@@ -514,271 +511,247 @@ def generate_thinker_entry(thinker_key, thinker_data, claims_data):
     if demartini_refs:
         invoked.append("demartini")
 
-    both_text = "by both speakers" if marcus_refs and demartini_refs else "by Marcus" if marcus_refs else "by Demartini" if demartini_refs else "implicitly"
-    key_ideas_short = ', '.join(thinker_data.get('key_ideas', ['philosophy'])[:2])
-
-    tradition_link = make_link(thinker_data.get('tradition', 'philosophy'))
-
-    lines = [
-        "---",
-        "type: thinker",
-        f'name: "{name}"',
-        f"tradition: {thinker_data.get('tradition', '')}",
-        f'era: "{thinker_data.get("era", "")}"',
-        f"key_works: {json.dumps(thinker_data.get('key_works', []))}",
-        f"key_ideas: {json.dumps(thinker_data.get('key_ideas', []))}",
-        f"invoked_by: {json.dumps(invoked)}",
-        "---",
-        "",
-        f"# {name}",
-        "",
-        "## Background",
-        "",
-        f"{name} ({thinker_data.get('era', 'dates unknown')}) is referenced in this debate for their contributions to philosophy and ethics.",
-        "",
-        "",
-        "## Key Ideas",
-        "",
-    ]
-    lines.extend(key_ideas_lines)
-    lines.extend([
-        "",
-        "",
-        "## Relevance to This Debate",
-        "",
-        f"{name} is invoked {both_text} to support arguments about {key_ideas_short}.",
-        "",
-        "",
-        "## How They're Cited",
-        "",
-        "### Marcus",
-        "",
-    ])
-    lines.extend(marcus_lines)
-    lines.extend([
-        "",
-        "",
-        "### Demartini",
-        "",
-    ])
-    lines.extend(demartini_lines)
-    lines.extend([
-        "",
-        "",
-        "## Associated Concepts",
-        "",
-    ])
-    lines.extend(concept_links)
-    lines.extend([
-        "",
-        "",
-        "## Associated Tradition",
-        "",
-        f"- {tradition_link}",
-        "",
-        "",
-        "---",
-        "",
-        "*Part of the [[Dialectical Topology]] wiki layer.*",
-    ])
-
-    return "\n".join(lines)
-
-
-def generate_framework_entry(framework_key, framework_data, claims_data):
-    """Generate a wiki entry for a framework."""
-
-    name = framework_data["name"]
-
-    # Principles
-    principle_lines = []
-    for i, p in enumerate(framework_data.get('key_principles', []), 1):
-        principle_lines.append(f"{i}. **{p}**")
-
-    # Related frameworks
-    related_lines = []
-    for f in list(FRAMEWORKS.keys())[:4]:
-        if f != framework_key:
-            related_lines.append(f"- {make_link(f)}")
-
-    lines = [
-        "---",
-        "type: framework",
-        f'name: "{name}"',
-        f'creator: "{framework_data.get("creator", "Unknown")}"',
-        f'purpose: "{framework_data.get("purpose", "")}"',
-        "---",
-        "",
-        f"# {name}",
-        "",
-        "## Overview",
-        "",
-        f"**Purpose**: {framework_data.get('purpose', 'To be analyzed.')}",
-        "",
-        f"**Origin**: {framework_data.get('creator', 'Unknown')}",
-        "",
-        "",
-        "## Core Principles",
-        "",
-    ]
-    lines.extend(principle_lines)
-    lines.extend([
-        "",
-        "",
-        "## Role in This Debate",
-        "",
-        "This framework is central to understanding the methodological differences between the speakers. It represents a specific approach to handling the phenomena under discussion.",
-        "",
-        "",
-        "## Relationship to Other Frameworks",
-        "",
-    ])
-    lines.extend(related_lines)
-    lines.extend([
-        "",
-        "",
-        "## Claims That Invoke This Framework",
-        "",
-        "<!-- Claims that depend on or reference this framework -->",
-        "",
-        "",
-        "---",
-        "",
-        "*Part of the [[Dialectical Topology]] wiki layer.*",
-    ])
-
-    return "\n".join(lines)
-
-
-def generate_tradition_entry(tradition_key, tradition_data, claims_data):
-    """Generate a wiki entry for a tradition."""
-
-    name = tradition_data["name"]
-
-    # Key figures
-    figure_lines = [f"- [[{fig}]]" for fig in tradition_data.get('key_figures', [])]
-
-    lines = [
-        "---",
-        "type: tradition",
-        f'name: "{name}"',
-        f'period: "{tradition_data.get("period", "Unknown")}"',
-        f'core_claim: "{tradition_data.get("core_claim", "")}"',
-        "---",
-        "",
-        f"# {name}",
-        "",
-        "## Overview",
-        "",
-        f"**Period**: {tradition_data.get('period', 'Unknown')}",
-        "",
-        f"**Core Claim**: {tradition_data.get('core_claim', 'To be articulated.')}",
-        "",
-        "",
-        "## Key Figures",
-        "",
-    ]
-    lines.extend(figure_lines)
-    lines.extend([
-        "",
-        "",
-        "## Relevance to This Debate",
-        "",
-        "This tradition provides conceptual resources and historical precedents that inform the positions taken in the Marcus–Demartini debate.",
-        "",
-        "",
-        "## Concepts from This Tradition",
-        "",
-        "<!-- Concepts in our wiki that originate from or connect to this tradition -->",
-        "",
-        "",
-        "## Thinkers in This Tradition",
-        "",
-    ])
-    lines.extend(figure_lines)
-    lines.extend([
-        "",
-        "",
-        "---",
-        "",
-        "*Part of the [[Dialectical Topology]] wiki layer.*",
-    ])
-
-    return "\n".join(lines)
-
-
-def generate_claim_entry(claim):
-    """Generate a wiki entry for a claim."""
-
-    # Warrants
-    warrant_lines = [f"- {w}" for w in claim.get('warrants', [])]
-
-    # Evidence
-    evidence_lines = [f"- {e}" for e in claim.get('evidence', [])]
-
-    # Related concepts
-    concept_lines = [f"- {make_link(c)}" for c in claim.get('related_concepts', [])]
-
-    lines = [
-        "---",
-        "type: claim",
-        f'id: "{claim["id"]}"',
-        f'speaker: "{claim["speaker"]}"',
-        f'claim_type: "{claim["type"]}"',
-        f"timestamp: {claim['timestamp']}",
-        f'engagement_level: "{claim.get("engagement_level", "supporting")}"',
-        "---",
-        "",
-        f"# {claim['id']}: {claim['speaker'].title()}",
-        "",
-        "## The Claim",
-        "",
-        f'> "{claim["text"]}"',
-        "",
-        "",
-        "## Context",
-        "",
-        f"**Speaker**: {claim['speaker'].title()}",
-        f"**Timestamp**: {claim['timestamp']} seconds",
-        f"**Engagement Level**: {claim.get('engagement_level', 'supporting')}",
-        f"**Claim Type**: {claim['type'].title()}",
-        "",
-        "",
-        "## Supporting Warrants",
-        "",
-    ]
-    lines.extend(warrant_lines if warrant_lines else ["- None cited"])
-    lines.extend([
-        "",
-        "",
-        "## Evidence Cited",
-        "",
-    ])
-    lines.extend(evidence_lines if evidence_lines else ["- None cited"])
-    lines.extend([
-        "",
-        "",
-        "## Related Concepts",
-        "",
-    ])
-    lines.extend(concept_lines if concept_lines else ["- None linked"])
-    lines.extend([
-        "",
-        "",
-        "## Responses to This Claim",
-        "",
-        "<!-- Claims that directly respond to or counter this claim -->",
-        "",
-        "",
-        "---",
-        "",
-        "*Part of the [[Dialectical Topology]] wiki layer.*",
-    ])
-
-    return "\n".join(lines)
+    return {
+        "name": name,
+        "tradition": thinker_data.get("tradition", ""),
+        "era": thinker_data.get("era", ""),
+        "background_era": thinker_data.get("era", "dates unknown"),
+        "key_works_json": json.dumps(thinker_data.get("key_works", [])),
+        "key_ideas_json": json.dumps(key_ideas),
+        "invoked_by_json": json.dumps(invoked),
+        "key_ideas": key_ideas,
+        "invoked_text": "by both speakers" if marcus_refs and demartini_refs else "by Marcus" if marcus_refs else "by Demartini" if demartini_refs else "implicitly",
+        "key_ideas_short": ", ".join(thinker_data.get("key_ideas", ["philosophy"])[:2]),
+        "marcus_refs": [{"id": c["id"], "text": c["text"][:80]} for c in marcus_refs[:2]],
+        "demartini_refs": [{"id": c["id"], "text": c["text"][:80]} for c in demartini_refs[:2]],
+        "concepts": [idea.replace("_", " ").title() for idea in key_ideas[:3]],
+        "tradition_link": make_link(thinker_data.get("tradition", "philosophy")),
+    }
+
+
+def framework_context(framework_key, framework_data, claim_index):
+    """Template context for a framework page."""
+    return {
+        "name": framework_data["name"],
+        "creator": framework_data.get("creator", "Unknown"),
+        "purpose": framework_data.get("purpose", ""),
+        "purpose_text": framework_data.get("purpose", "To be analyzed."),
+        "principles": [{"n": i, "principle": p} for i, p in enumerate(framework_data.get("key_principles", []), 1)],
+        "related_frameworks": [make_link(f) for f in list(FRAMEWORKS)[:4] if f != framework_key],
+    }
+
+
+def tradition_context(tradition_key, tradition_data, claim_index):
+    """Template context for a tradition page."""
+    return {
+        "name": tradition_data["name"],
+        "period": tradition_data.get("period", "Unknown"),
+        "core_claim": tradition_data.get("core_claim", ""),
+        "core_claim_text": tradition_data.get("core_claim", "To be articulated."),
+        "key_figures": tradition_data.get("key_figures", []),
+    }
+
+
+def claim_context(claim):
+    """Template context for a claim page: the claim itself plus display fields."""
+    return {
+        **claim,
+        "speaker_title": claim["speaker"].title(),
+        "claim_type_title": claim["type"].title(),
+        "engagement_level": claim.get("engagement_level", "supporting"),
+        "related_concepts": [make_link(c) for c in claim.get("related_concepts", ())],
+    }
+
+
+def page_filename(entity_type, key):
+    """Wiki file name for an entity (claim IDs are lowercased, other keys hyphenated)."""
+    return (key.lower() if entity_type == "claims" else key.replace("_", "-")) + ".md"
+
+
+def page_path(entity_type, key):
+    return WIKI_DIR / entity_type / page_filename(entity_type, key)
+
+
+# Per-process render state, set by init_renderer (in each pool worker)
+_render_state = {}
+
+
+def init_renderer(claims_data, claim_index):
+    """Set up this process for render_page."""
+    _render_state.update(
+        claim_index=claim_index,
+        concept_usage=extract_concept_usage(claim_index),
+        claims={claim["id"]: claim for claim in claims_data["claims"]},
+        templates={entity_type: load_template(TEMPLATE_DIR / filename)
+                   for entity_type, filename in TEMPLATE_FILES.items()},
+    )
+
+
+def page_context(entity_type, key):
+    """Template context for one entity page."""
+    claim_index = _render_state["claim_index"]
+    if entity_type == "concepts":
+        return concept_context(key, CONCEPTS[key], _render_state["concept_usage"].get(key, {}), claim_index)
+    if entity_type == "thinkers":
+        return thinker_context(key, THINKERS[key], claim_index)
+    if entity_type == "frameworks":
+        return framework_context(key, FRAMEWORKS[key], claim_index)
+    if entity_type == "traditions":
+        return tradition_context(key, TRADITIONS[key], claim_index)
+    return claim_context(_render_state["claims"][key])
+
+
+def render_page(entity_type, key):
+    """Markdown for one entity page (init_renderer must have run in this process)."""
+    return _render_state["templates"][entity_type](page_context(entity_type, key))
+
+
+def render_and_write(job):
+    """Render one page and write it if it changed; returns (entity_type, changed)."""
+    entity_type, key = job
+    return entity_type, write_if_changed(page_path(entity_type, key), render_page(entity_type, key).encode("utf-8"))
+
+
+def entity_keys(claims_data):
+    """{entity_type: [key, ...]} for every page the wiki should contain."""
+    return {
+        "concepts": list(CONCEPTS),
+        "thinkers": list(THINKERS),
+        "frameworks": list(FRAMEWORKS),
+        "traditions": list(TRADITIONS),
+        "claims": [claim["id"] for claim in claims_data["claims"]],
+    }
+
+
+def renderer_fingerprint():
+    """Hashes of what shapes every page: the generator code, and each entity type's template."""
+    code = hashlib.sha256()
+    for path in (Path(__file__), Path(template_engine.__file__)):
+        code.update(path.read_bytes())
+    return {
+        "code": code.hexdigest(),
+        "templates": {
+            entity_type: hashlib.sha256((TEMPLATE_DIR / filename).read_bytes()).hexdigest()
+            for entity_type, filename in TEMPLATE_FILES.items()
+        },
+    }
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    try:
+        return read_json(path)
+    except (OSError, ValueError):
+        return None
+
+
+def claim_lists(claim_index):
+    """{"concept": {key: [claim IDs]}, "thinker": {...}}: what each concept/thinker page lists, in order."""
+    return {
+        kind: {key: [claim["id"] for claim in claims] for key, claims in claim_index[kind].items()}
+        for kind in ("concept", "thinker")
+    }
+
+
+def save_snapshot(claims_data, claim_index, fingerprint, path=SNAPSHOT_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_json(path, {
+        "fingerprint": fingerprint,
+        "claims": claims_data["claims"],
+        "lists": claim_lists(claim_index),
+    })
+
+
+def claims_affected(old_claims, new_claims, old_lists, new_lists):
+    """
+    Pages a claim edit reaches: {entity_type: set of keys}, plus removed claim IDs.
+
+    A claim page is affected when the claim is new or differs. A concept or
+    thinker page is affected when its ordered claim list differs, or when a
+    claim on it changed (its text or speaker shows on the page).
+    """
+    old_by_id = {claim["id"]: claim for claim in old_claims}
+    new_by_id = {claim["id"]: claim for claim in new_claims}
+    changed = {claim_id for claim_id, claim in new_by_id.items() if old_by_id.get(claim_id) != claim}
+    removed = set(old_by_id) - set(new_by_id)
+
+    affected = {entity_type: set() for entity_type in ENTITY_TYPES}
+    affected["claims"] = changed
+    for kind, entity_type in (("concept", "concepts"), ("thinker", "thinkers")):
+        for key in set(old_lists[kind]) | set(new_lists[kind]):
+            new_ids = new_lists[kind].get(key, [])
+            if old_lists[kind].get(key) != new_ids or changed.intersection(new_ids):
+                affected[entity_type].add(key)
+    return affected, removed
+
+
+def plan_render(claims_data, claim_index, fingerprint, snapshot, entities):
+    """
+    Which pages to render: ({entity_type: [keys]}, removed claim IDs, reason).
+
+    Everything when there is no usable snapshot; otherwise the pages the
+    claim diff and any template change reach, plus pages missing on disk.
+    """
+    if snapshot is None:
+        return entities, set(), "no snapshot"
+    if snapshot["fingerprint"]["code"] != fingerprint["code"]:
+        return entities, set(), "generator changed"
+
+    affected, removed = claims_affected(snapshot["claims"], claims_data["claims"],
+                                        snapshot["lists"], claim_lists(claim_index))
+    plan = {}
+    for entity_type in ENTITY_TYPES:
+        if snapshot["fingerprint"]["templates"].get(entity_type) != fingerprint["templates"][entity_type]:
+            plan[entity_type] = entities[entity_type]
+            continue
+        directory = WIKI_DIR / entity_type
+        on_disk = {p.name for p in directory.iterdir()} if directory.exists() else set()
+        plan[entity_type] = [
+            key for key in entities[entity_type]
+            if key in affected[entity_type] or page_filename(entity_type, key) not in on_disk
+        ]
+    return plan, removed, "claim diff"
+
+
+def render_pages(claims_data, claim_index, entities, workers=None):
+    """Render the given {entity_type: [keys]} pages; returns {entity_type: {"rendered", "changed", "unchanged"}}."""
+    jobs = [(entity_type, key) for entity_type in ENTITY_TYPES for key in entities[entity_type]]
+    workers = workers or os.cpu_count() or 1
+
+    if not jobs:
+        return tally(())
+    if workers == 1 or len(jobs) < PARALLEL_MIN_PAGES:
+        init_renderer(claims_data, claim_index)
+        return tally(map(render_and_write, jobs))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_renderer,
+                             initargs=(claims_data, claim_index)) as pool:
+        return tally(pool.map(render_and_write, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def tally(results):
+    counts = {entity_type: {"rendered": 0, "changed": 0, "unchanged": 0} for entity_type in ENTITY_TYPES}
+    for entity_type, changed in results:
+        counts[entity_type]["rendered"] += 1
+        counts[entity_type]["changed" if changed else "unchanged"] += 1
+    return counts
+
+
+def write_index(index):
+    """Write index.json unless only its timestamp would change; True if written."""
+    path = WIKI_DIR / "index.json"
+    if path.exists():
+        previous = read_json(path)
+        if {**previous, "generated_at": index["generated_at"]} == index:
+            return False
+    write_json(path, index)
+    return True
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the wiki layer from the analyzed claims")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: one per CPU)")
+    parser.add_argument("--full", action="store_true", help="Re-render every page, ignoring the claim snapshot")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("  Wiki Generation - Dialectical Topology")
     print("=" * 60)
@@ -789,76 +762,31 @@ def main():
     ontology_data = load_ontology()
     flow_data = load_flow()
 
-    # Extract concept usage patterns
-    concept_usage = extract_concept_usage(claims_data)
+    # Index claims by concept, thinker and speaker (one pass)
+    claim_index = index_claims(claims_data)
 
     # Ensure wiki directories exist
-    for entity_type in ["concepts", "thinkers", "frameworks", "traditions", "claims"]:
+    for entity_type in ENTITY_TYPES:
         (WIKI_DIR / entity_type).mkdir(parents=True, exist_ok=True)
 
-    # Track generated entities
-    generated = {
-        "concepts": 0,
-        "thinkers": 0,
-        "frameworks": 0,
-        "traditions": 0,
-        "claims": 0
-    }
-
-    # Generate concept entries
-    print("\nGenerating concept entries...")
-    for concept_key, concept_data in CONCEPTS.items():
-        entry = generate_concept_entry(
-            concept_key,
-            concept_data,
-            concept_usage.get(concept_key, {}),
-            claims_data
-        )
-        filename = concept_key.replace("_", "-") + ".md"
-        with open(WIKI_DIR / "concepts" / filename, "w") as f:
-            f.write(entry)
-        generated["concepts"] += 1
-    print(f"  Generated {generated['concepts']} concept entries")
-
-    # Generate thinker entries
-    print("\nGenerating thinker entries...")
-    for thinker_key, thinker_data in THINKERS.items():
-        entry = generate_thinker_entry(thinker_key, thinker_data, claims_data)
-        filename = thinker_key.replace("_", "-") + ".md"
-        with open(WIKI_DIR / "thinkers" / filename, "w") as f:
-            f.write(entry)
-        generated["thinkers"] += 1
-    print(f"  Generated {generated['thinkers']} thinker entries")
-
-    # Generate framework entries
-    print("\nGenerating framework entries...")
-    for framework_key, framework_data in FRAMEWORKS.items():
-        entry = generate_framework_entry(framework_key, framework_data, claims_data)
-        filename = framework_key.replace("_", "-") + ".md"
-        with open(WIKI_DIR / "frameworks" / filename, "w") as f:
-            f.write(entry)
-        generated["frameworks"] += 1
-    print(f"  Generated {generated['frameworks']} framework entries")
-
-    # Generate tradition entries
-    print("\nGenerating tradition entries...")
-    for tradition_key, tradition_data in TRADITIONS.items():
-        entry = generate_tradition_entry(tradition_key, tradition_data, claims_data)
-        filename = tradition_key.replace("_", "-") + ".md"
-        with open(WIKI_DIR / "traditions" / filename, "w") as f:
-            f.write(entry)
-        generated["traditions"] += 1
-    print(f"  Generated {generated['traditions']} tradition entries")
-
-    # Generate claim entries
-    print("\nGenerating claim entries...")
-    for claim in claims_data["claims"]:
-        entry = generate_claim_entry(claim)
-        filename = claim["id"].lower() + ".md"
-        with open(WIKI_DIR / "claims" / filename, "w") as f:
-            f.write(entry)
-        generated["claims"] += 1
-    print(f"  Generated {generated['claims']} claim entries")
+    # Diff the claims against the last run to find the pages they reach
+    entities = entity_keys(claims_data)
+    fingerprint = renderer_fingerprint()
+    snapshot = None if args.full else load_snapshot()
+    plan, removed, reason = plan_render(claims_data, claim_index, fingerprint, snapshot, entities)
+
+    # Render those pages, writing only the ones whose content changed
+    print(f"\nRendering entries ({'--full' if args.full else reason})...")
+    counts = render_pages(claims_data, claim_index, plan, args.workers)
+    for entity_type in ENTITY_TYPES:
+        c = counts[entity_type]
+        print(f"  {entity_type:<11} {c['rendered']:>5} rendered, {c['changed']:>5} changed, "
+              f"{c['unchanged']:>5} unchanged, {len(entities[entity_type]) - c['rendered']:>5} skipped")
+    for claim_id in sorted(removed):
+        page_path("claims", claim_id).unlink(missing_ok=True)
+    if removed:
+        print(f"  Removed {len(removed)} pages of deleted claims")
+    generated = {entity_type: len(entities[entity_type]) for entity_type in ENTITY_TYPES}
 
     # Generate index
     print("\nGenerating wiki index...")
@@ -870,25 +798,27 @@ def main():
             "thinkers": list(THINKERS.keys()),
             "frameworks": list(FRAMEWORKS.keys()),
             "traditions": list(TRADITIONS.keys()),
-            "claims": [c["id"] for c in claims_data["claims"]]
+            "claims": entities["claims"]
         },
         "counts": generated
     }
-
-    with open(WIKI_DIR / "index.json", "w") as f:
-        json.dump(index, f, indent=2)
+    print(f"  index.json {'written' if write_index(index) else 'unchanged'}")
+    save_snapshot(claims_data, claim_index, fingerprint)
 
     # Summary
     total = sum(generated.values())
+    rendered = sum(c["rendered"] for c in counts.values())
+    changed = sum(c["changed"] for c in counts.values())
+    claims_by_speaker = ", ".join(f"{s}: {len(c)}" for s, c in sorted(claim_index["speaker"].items()))
     print("\n" + "=" * 60)
     print("  Wiki Generation Complete")
     print("=" * 60)
-    print(f"\n  Total entities generated: {total}")
+    print(f"\n  Total entities: {total} ({rendered} rendered, {changed} changed)")
     print(f"    - Concepts: {generated['concepts']}")
     print(f"    - Thinkers: {generated['thinkers']}")
     print(f"    - Frameworks: {generated['frameworks']}")
     print(f"    - Traditions: {generated['traditions']}")
-    print(f"    - Claims: {generated['claims']}")
+    print(f"    - Claims: {generated['claims']} ({claims_by_speaker})")
     print(f"\n  Output: {WIKI_DIR}")
 
 
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+In-process pipeline: parse through landscape in a single process.
+
+run_pipeline.py runs every stage as its own script, so each stage re-reads
+its predecessor's output from disk. Here the stage functions hand their
+results to each other in memory:
+
+    parse_transcript -> chunk_document (v1) -> embed_chunks -> build_landscape
+                     -> chunk_document (v2) -> build_claim_landscape
+
+The artifacts are the same files the scripts write. An ArtifactWriter
+writes them atomically on background threads while the next stage
+computes. Stage results must not be mutated after they are handed to the
+writer. The stage functions only build new objects, so this holds.
+
+After the writes land, the stages are recorded in _index/pipeline-state.json
+as if run_pipeline.py had run them, so the runner only re-runs what comes
+after (responses, packaging, ...). A stage run on other inputs or settings
+than the runner's defaults (--transcript, --offline, ...) is left stale. Only the claim-based landscape is copied
+to the frontend, because it is the one the frontend reads last.
+
+Usage:
+    python pipeline/inprocess.py                      # full run
+    python pipeline/inprocess.py --offline            # feature-hashing embeddings, no Ollama
+    python pipeline/inprocess.py --transcript t.txt   # another Otter export
+"""
+
+import argparse
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import create_chunks
+import create_chunks_v2
+from parse_transcript import parse_transcript
+from generate_embeddings import embed_chunks, embed_offline, embeddings_metadata, OFFLINE_MODEL
+from project_umap import build_landscape
+from cluster_by_claims import build_claim_landscape, embed_texts
+from cluster_landscape import CLUSTER_METHODS, KNN_GRAPH_PATH, save_knn_graph
+from reduce_embeddings import METHODS, save_reducer
+from serialization import atomic_write, copy_file, read_json, write_json, write_json_stream
+from instrumentation import step
+
+PROJECT_DIR = Path(__file__).parent.parent
+PROCESSED_DIR = PROJECT_DIR / "data" / "processed"
+FRONTEND_DATA_DIR = PROJECT_DIR / "frontend" / "public" / "data"
+TRANSCRIPT_PATH = PROJECT_DIR / ".claude" / "merged-transcript.txt"
+
+# run_pipeline.py stages this module replaces
+STAGE_NAMES = ("parse", "chunks", "chunks_v2", "embeddings", "landscape", "clustering")
+
+
+class ArtifactWriter:
+    """Writes artifacts on background threads; leaving the context waits for every write."""
+
+    def __init__(self, workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact")
+        self._pending = []
+        self.written = {}  # path -> (bytes, seconds)
+
+    def submit(self, path: Path, write, *args):
+        """Run write(*args) in the background; it must write `path` (and may write more)."""
+        def timed():
+            start = time.perf_counter()
+            write(*args)
+            self.written[path] = (path.stat().st_size, time.perf_counter() - start)
+        self._pending.append(self._pool.submit(timed))
+
+    def json(self, path: Path, doc: dict, stream_key: str | None = None, copies: tuple = ()):
+        def write():
+            if stream_key:
+                write_json_stream(path, doc, stream_key, doc[stream_key])
+            else:
+                write_json(path, doc)
+            for dst in copies:
+                copy_file(path, dst)
+        self.submit(path, write)
+
+    def npy(self, path: Path, array: np.ndarray):
+        def write():
+            with atomic_write(path) as f:
+                np.save(f, array)
+        self.submit(path, write)
+
+    def wait(self) -> float:
+        """Block until every submitted write is done; returns seconds spent waiting."""
+        start = time.perf_counter()
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()  # re-raises a failed write
+        return time.perf_counter() - start
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.wait()
+        finally:
+            self._pool.shutdown(wait=True)
+        return False
+
+
+def run(
+    transcript_path: Path = TRANSCRIPT_PATH,
+    claims: list | None = None,
+    writer: ArtifactWriter | None = None,
+    offline: bool = False,
+    reduce: str | None = None,
+    reduce_dim: int = 50,
+    cluster_method: str = "kmeans",
+) -> dict:
+    """
+    Run parse -> landscapes in memory and return every stage's result.
+
+    Artifacts go to `writer` as soon as they exist; with writer=None nothing
+    is written. `claims` defaults to data/processed/claims.json.
+    """
+    results = {"seconds": {}}
+
+    @contextmanager
+    def stage(name):
+        with step(name) as record:
+            yield
+        results["seconds"][name] = record["wall_seconds"]
+
+    print(f"Parsing transcript: {transcript_path}")
+    with stage("parse"):
+        transcript = parse_transcript(str(transcript_path))
+    if writer:
+        writer.json(PROCESSED_DIR / "transcript_diarized.json", transcript)
+    print(f"  {len(transcript['segments'])} segments")
+
+    with stage("chunks"):
+        chunks_data = create_chunks.chunk_document(transcript)
+    if writer:
+        writer.json(PROCESSED_DIR / "chunks.json", chunks_data, stream_key="chunks")
+    with stage("chunks_v2"):
+        chunks_v2_data = create_chunks_v2.chunk_document(transcript)
+    if writer:
+        writer.json(PROCESSED_DIR / "chunks_v2.json", chunks_v2_data, stream_key="chunks")
+    print(f"  {len(chunks_data['chunks'])} chunks, {len(chunks_v2_data['chunks'])} v2 chunks")
+
+    print(f"Embedding chunks ({OFFLINE_MODEL if offline else 'ollama'})...")
+    with stage("embeddings"):
+        embeddings = embed_chunks(chunks_data["chunks"], offline=offline)
+        meta = embeddings_metadata(embeddings, offline=offline)
+    if writer:
+        writer.npy(PROCESSED_DIR / "embeddings.npy", embeddings)
+        writer.json(PROCESSED_DIR / "embeddings_meta.json", meta)
+
+    with stage("landscape"):
+        landscape, reducer, knn_graph = build_landscape(
+            embeddings, chunks_data["chunks"], reduce, reduce_dim, cluster_method,
+            embedding_model=meta["model"],
+        )
+    if writer:
+        writer.json(PROCESSED_DIR / "landscape.json", landscape, stream_key="points")
+        if reducer is not None:
+            writer.submit(PROCESSED_DIR / "reducer.npz", save_reducer, reducer, PROCESSED_DIR / "reducer.npz")
+        writer.submit(KNN_GRAPH_PATH, save_knn_graph, KNN_GRAPH_PATH, *knn_graph,
+                      "reduced" if reduce else "embeddings")
+
+    if claims is None:
+        claims = read_json(PROCESSED_DIR / "claims.json")["claims"]
+    with stage("clustering"):
+        landscape_v2, reducer_v2 = build_claim_landscape(
+            chunks_v2_data, claims, embed=embed_offline if offline else embed_texts,
+            reduce=reduce, reduce_dim=reduce_dim, embedding_model=meta["model"],
+        )
+    if writer:
+        writer.json(PROCESSED_DIR / "landscape_v2.json", landscape_v2, stream_key="points",
+                    copies=(FRONTEND_DATA_DIR / "landscape.json",))
+        if reducer_v2 is not None:
+            path = PROCESSED_DIR / "reducer_v2.npz"
+            writer.submit(path, save_reducer, reducer_v2, path)
+
+    results.update(
+        transcript=transcript,
+        chunks=chunks_data,
+        chunks_v2=chunks_v2_data,
+        embeddings=embeddings,
+        landscape=landscape,
+        landscape_v2=landscape_v2,
+    )
+    return results
+
+
+def default_stages(transcript_path: Path, offline: bool, reduce: str | None, cluster_method: str) -> tuple:
+    """
+    The stages this run produced as run_pipeline.py would have (its scripts
+    run without arguments): another transcript, offline embeddings or a
+    non-default reduction/clusterer leave the affected stages stale.
+    """
+    skip = set()
+    if transcript_path.resolve() != TRANSCRIPT_PATH.resolve():
+        skip.add("parse")
+    if offline:
+        skip.add("embeddings")
+    if reduce or cluster_method != "kmeans":
+        skip.add("landscape")
+    if reduce:
+        skip.add("clustering")
+    return tuple(name for name in STAGE_NAMES if name not in skip)
+
+
+def record_stages(seconds: dict, names: tuple = STAGE_NAMES):
+    """Mark the given in-process stages current in the runner's state file."""
+    from run_pipeline import STAGES, load_state, save_state, record_stage
+
+    state = load_state()
+    cache = state.setdefault("hash_cache", {})
+    for stage in STAGES:
+        if stage["name"] in names:
+            record_stage(state, stage, cache, seconds.get(stage["name"]))
+    save_state(state)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run parse through landscape in one process")
+    parser.add_argument("--transcript", type=Path, default=TRANSCRIPT_PATH, help="Otter.ai transcript export")
+    parser.add_argument("--offline", action="store_true", help=f"Embed with {OFFLINE_MODEL} instead of Ollama")
+    parser.add_argument("--reduce", choices=METHODS, default=None, help="Optional linear pre-reduction")
+    parser.add_argument("--reduce-dim", type=int, default=50, help="Target dimension for --reduce")
+    parser.add_argument("--cluster-method", choices=CLUSTER_METHODS, default="kmeans")
+    parser.add_argument("--writers", type=int, default=2, help="Background writer threads")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with ArtifactWriter(args.writers) as writer:
+        results = run(args.transcript, writer=writer, offline=args.offline, reduce=args.reduce,
+                      reduce_dim=args.reduce_dim, cluster_method=args.cluster_method)
+        compute = time.perf_counter() - start
+        waited = writer.wait()
+    stages = default_stages(args.transcript, args.offline, args.reduce, args.cluster_method)
+    record_stages(results["seconds"], stages)
+    if len(stages) < len(STAGE_NAMES):
+        print(f"Not marked current (non-default inputs or settings): "
+              f"{', '.join(n for n in STAGE_NAMES if n not in stages)}")
+
+    print(f"\n{'stage':<14}{'seconds':>9}")
+    for name, seconds in results["seconds"].items():
+        print(f"{name:<14}{seconds:>9.2f}")
+    print(f"\n{len(writer.written)} artifacts, {sum(b for b, _ in writer.written.values()):,} bytes "
+          f"written in the background ({sum(s for _, s in writer.written.values()):.2f}s of writer time)")
+    print(f"Compute {compute:.2f}s + final write wait {waited:.2f}s = {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Per-stage and per-step resource instrumentation.
+
+Stage scripts mark their sub-steps with
+
+    from instrumentation import step
+    with step("fit_umap"):
+        ...
+
+and each step records wall time, CPU time, peak RSS and bytes read/written
+(and peak traced allocations when tracemalloc is on). Outside an
+instrumented run the records are kept in memory and never written, so
+`step` costs a few syscalls and nothing else.
+
+The runner executes every stage through this module:
+
+    python pipeline/instrumentation.py --metrics out.json [--profile out.prof] \\
+        [--tracemalloc] pipeline/project_umap.py [args...]
+
+which measures the whole stage as the root step, optionally wraps it in
+cProfile, and writes the step tree to `--metrics` as JSON.
+"""
+
+import argparse
+import resource
+import runpy
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROC_IO = Path("/proc/self/io")
+PROC_STATUS = Path("/proc/self/status")
+# ru_maxrss is KiB on Linux, bytes on macOS
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+_stack = []
+_roots = []
+
+
+def io_counters() -> tuple[int, int] | None:
+    """(bytes read, bytes written) by this process via read/write syscalls, if available."""
+    try:
+        fields = dict(line.split(": ") for line in PROC_IO.read_text().splitlines())
+    except (OSError, ValueError):
+        return None
+    return int(fields["rchar"]), int(fields["wchar"])
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process so far, in bytes."""
+    # VmHWM starts over at exec; ru_maxrss keeps the forking parent's peak
+    try:
+        for line in PROC_STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+
+def _traced_peak(tracemalloc) -> int:
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    return peak
+
+
+@contextmanager
+def step(name: str):
+    """Measure a block as a named step (nested steps become children)."""
+    tracemalloc = sys.modules.get("tracemalloc")
+    tracing = tracemalloc is not None and tracemalloc.is_tracing()
+    if tracing and _stack:
+        # Allocation peak so far belongs to the enclosing step
+        _stack[-1]["_traced"] = max(_stack[-1]["_traced"], _traced_peak(tracemalloc))
+
+    record = {"name": name, "children": [], "_traced": 0}
+    (_stack[-1]["children"] if _stack else _roots).append(record)
+    _stack.append(record)
+    io_start = io_counters()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    finally:
+        record["wall_seconds"] = round(time.perf_counter() - wall, 4)
+        record["cpu_seconds"] = round(time.process_time() - cpu, 4)
+        record["peak_rss_bytes"] = peak_rss()
+        io_end = io_counters()
+        if io_start and io_end:
+            record["bytes_read"] = io_end[0] - io_start[0]
+            record["bytes_written"] = io_end[1] - io_start[1]
+        traced = record.pop("_traced")
+        if tracing:
+            record["peak_traced_bytes"] = max(traced, _traced_peak(tracemalloc))
+        _stack.pop()
+        if tracing and _stack:
+            _stack[-1]["_traced"] = max(_stack[-1]["_traced"], record["peak_traced_bytes"])
+        if not record["children"]:
+            del record["children"]
+
+
+def recorded_steps() -> list:
+    """Top-level step records collected in this process."""
+    return _roots
+
+
+def format_bytes(n: int | None) -> str:
+    if n is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+
+
+def format_step_table(steps: list, indent: str = "  ") -> list:
+    """Indented rows of wall/CPU/RSS/IO for a step tree."""
+    rows = []
+
+    def walk(records, depth):
+        for r in records:
+            label = f"{'  ' * depth}{r['name']}"
+            row = (f"{indent}{label:<30}{r['wall_seconds']:>9.2f}{r['cpu_seconds']:>9.2f}"
+                   f"{format_bytes(r['peak_rss_bytes']):>10}{format_bytes(r.get('bytes_read')):>10}"
+                   f"{format_bytes(r.get('bytes_written')):>10}")
+            if "peak_traced_bytes" in r:
+                row += f"{format_bytes(r['peak_traced_bytes']):>10}"
+            rows.append(row)
+            walk(r.get("children", []), depth + 1)
+
+    walk(steps, 0)
+    return rows
+
+
+def table_header(indent: str = "  ", traced: bool = False) -> str:
+    header = f"{indent}{'step':<30}{'wall s':>9}{'cpu s':>9}{'peak rss':>10}{'read':>10}{'written':>10}"
+    return header + (f"{'traced':>10}" if traced else "")
+
+
+def run_script(script: Path, args: list, metrics_path: Path, profile_path: Path | None = None,
+               trace_memory: bool = False, profile_lines: int = 25):
+    """Run a stage script as __main__ under instrumentation; writes the step tree as JSON."""
+    from serialization import write_json
+
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+    profiler = None
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    sys.argv = [str(script), *args]
+    exit_code = 1  # an uncaught exception still leaves metrics behind
+    try:
+        with step(script.stem):
+            if profiler:
+                profiler.enable()
+            try:
+                runpy.run_path(str(script), run_name="__main__")
+                exit_code = 0
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            finally:
+                if profiler:
+                    profiler.disable()
+    finally:
+        if profiler:
+            import pstats
+            profiler.dump_stats(profile_path)
+            print(f"\nProfile written to {profile_path} (top {profile_lines} by cumulative time):")
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(profile_lines)
+        write_json(metrics_path, {"exit_code": exit_code, "steps": recorded_steps()})
+    return exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a pipeline script with resource instrumentation")
+    parser.add_argument("--metrics", type=Path, required=True, help="Write the step tree (JSON) here")
+    parser.add_argument("--profile", type=Path, default=None, help="Write cProfile stats (.prof) here")
+    parser.add_argument("--tracemalloc", action="store_true", help="Record peak traced allocations per step")
+    parser.add_argument("script", type=Path)
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    # Use the importable module, not __main__, so the script's `step` calls
+    # land in the same step tree
+    import instrumentation
+    sys.exit(instrumentation.run_script(args.script, args.args, args.metrics, args.profile, args.tracemalloc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Wikilink and backlink graph for the wiki layer.
+
+Every [[Target]] (also [[Target|label]] and [[Target#section]]) in the wiki
+markdown is an edge. Targets resolve by name the way Obsidian resolves
+them: the slug of the link text ("Cosmic Balance" -> cosmic-balance) is
+matched against each page's file name and the slug of its title. Links
+that match no page are reported as broken.
+
+File names win over titles. When several pages share a slug
+(concepts/nonduality and traditions/nonduality), a link resolves to the
+one in the linking page's own directory, falling back to the first in
+sorted order; every such slug is listed under "ambiguous" in
+link_graph.json so a page can be renamed or the link spelled out.
+
+The graph is written in compressed sparse row form, like the slim landscape
+geometry:
+
+- link_graph.bin   packed little-endian uint32 columns: forward_indptr,
+                   forward_indices, backward_indptr, backward_indices
+- link_graph.json  page table ([ref, title]), column layout, broken
+                   and ambiguous links, and counts
+
+Page i links to forward_indices[forward_indptr[i]:forward_indptr[i + 1]].
+The backward pair is the same for pages linking *to* i.
+
+Parsing is incremental. Each page's raw link targets are cached in
+.cache/link_graph/parsed.json, keyed on the file's size and mtime, so a
+rebuild re-reads only the pages that changed. Resolution and the CSR
+arrays are rebuilt every time, which costs milliseconds even at tens of
+thousands of pages.
+
+LinkGraph is the Python query API (links, backlinks, co-cited pages).
+
+Usage:
+    python pipeline/link_graph.py                    # build data/processed/links/
+    python pipeline/link_graph.py --page concepts/shadow
+"""
+
+import argparse
+import re
+import time
+import numpy as np
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from serialization import read_json, write_if_changed, write_json
+
+PROJECT_DIR = Path(__file__).parent.parent
+WIKI_DIR = PROJECT_DIR / "wiki"
+LINKS_DIR = PROJECT_DIR / "data" / "processed" / "links"
+CACHE_PATH = PROJECT_DIR / ".cache" / "link_graph" / "parsed.json"
+
+INDEX_FILE = "link_graph.json"
+ARRAYS_FILE = "link_graph.bin"
+COLUMNS = ("forward_indptr", "forward_indices", "backward_indptr", "backward_indices")
+
+WIKILINK_RE = re.compile(r"\[\[([^\[\]|#]+)(?:[|#][^\[\]]*)?\]\]")
+TITLE_RE = re.compile(r"^# (.+)$", re.MULTILINE)
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def slug(text: str) -> str:
+    """Link-resolution key: "Ho'oponopono" -> "ho-oponopono", "D06" -> "d06"."""
+    return SLUG_RE.sub("-", text.lower()).strip("-")
+
+
+def parse_page(text: str) -> dict:
+    """Title and raw link targets (in order, with repeats) of one page."""
+    title = TITLE_RE.search(text)
+    return {
+        "title": title.group(1).strip() if title else None,
+        "links": [m.group(1).strip() for m in WIKILINK_RE.finditer(text)],
+    }
+
+
+def parse_wiki(wiki_dir: Path = WIKI_DIR, cache: dict | None = None) -> tuple[dict, int]:
+    """
+    {page ref: parse_page result} for every page under wiki_dir.
+
+    `cache` ({ref: {"size", "mtime_ns", ...parsed}}) is reused for pages
+    whose size and mtime are unchanged and updated in place for the rest.
+    Returns (pages, number of pages parsed this run).
+    """
+    cache = {} if cache is None else cache
+    pages = {}
+    parsed = 0
+    for path in sorted(wiki_dir.glob("*/*.md")):
+        ref = f"{path.parent.name}/{path.stem}"
+        stat = path.stat()
+        entry = cache.get(ref)
+        if not entry or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                     **parse_page(path.read_text(encoding="utf-8"))}
+            cache[ref] = entry
+            parsed += 1
+        pages[ref] = {"title": entry["title"], "links": entry["links"]}
+    for ref in set(cache) - set(pages):
+        del cache[ref]
+    return pages, parsed
+
+
+def build_graph(pages: dict) -> dict:
+    """Resolve links and build forward/backward CSR arrays over the pages."""
+    refs = sorted(pages)
+    ids = {ref: i for i, ref in enumerate(refs)}
+    directories = [ref.split("/", 1)[0] for ref in refs]
+    by_file, by_title = defaultdict(list), defaultdict(list)
+    for ref in refs:
+        by_file[slug(ref.split("/", 1)[1])].append(ids[ref])
+        if pages[ref]["title"]:
+            by_title[slug(pages[ref]["title"])].append(ids[ref])
+
+    def resolve(key: str, directory: str) -> int | None:
+        # File names win over titles; within either, the linking page's directory wins
+        for candidates in (by_file.get(key), by_title.get(key)):
+            if candidates:
+                local = [i for i in candidates if directories[i] == directory]
+                return (local or candidates)[0]
+        return None
+
+    ambiguous = {}
+    for key in sorted(set(by_file) | set(by_title)):
+        claimed = sorted(set(by_file.get(key, [])) | set(by_title.get(key, [])))
+        if len(claimed) > 1:
+            ambiguous[key] = [refs[i] for i in claimed]
+
+    sources, targets = [], []
+    broken = Counter()
+    for ref in refs:
+        seen = set()
+        for target in pages[ref]["links"]:
+            page = resolve(slug(target), directories[ids[ref]])
+            if page is None:
+                broken[(ref, target)] += 1
+            elif page not in seen:
+                seen.add(page)
+                sources.append(ids[ref])
+                targets.append(page)
+
+    n = len(refs)
+    sources = np.array(sources, dtype=np.uint32)
+    targets = np.array(targets, dtype=np.uint32)
+
+    def csr(rows, cols):
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.uint32)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return indptr, cols[order].astype(np.uint32)
+
+    forward_indptr, forward_indices = csr(sources, targets)
+    backward_indptr, backward_indices = csr(targets, sources)
+    return {
+        "refs": refs,
+        "titles": [pages[ref]["title"] or ref for ref in refs],
+        "arrays": {
+            "forward_indptr": forward_indptr,
+            "forward_indices": forward_indices,
+            "backward_indptr": backward_indptr,
+            "backward_indices": backward_indices,
+        },
+        "broken": [{"source": source, "target": target, "count": count}
+                   for (source, target), count in sorted(broken.items())],
+        "ambiguous": [{"slug": key, "pages": claimed} for key, claimed in ambiguous.items()],
+    }
+
+
+def pack_arrays(arrays: dict) -> tuple[bytes, list]:
+    """Pack the CSR columns into one buffer; returns (bytes, layout)."""
+    layout, parts, offset = [], [], 0
+    for name in COLUMNS:
+        data = np.ascontiguousarray(arrays[name], dtype="<u4")
+        layout.append({"name": name, "dtype": "<u4", "byte_offset": offset, "length": int(data.size)})
+        parts.append(data.tobytes())
+        offset += data.nbytes
+    return b"".join(parts), layout
+
+
+def write_graph(graph: dict, out_dir: Path = LINKS_DIR) -> dict:
+    """Write link_graph.bin and link_graph.json; returns the JSON document."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    data, layout = pack_arrays(graph["arrays"])
+    write_if_changed(out_dir / ARRAYS_FILE, data)
+
+    edges = int(graph["arrays"]["forward_indices"].size)
+    index = {
+        "metadata": {
+            "created_at": datetime.now().isoformat(),
+            "num_pages": len(graph["refs"]),
+            "num_links": edges,
+            "num_broken": sum(b["count"] for b in graph["broken"]),
+            "num_ambiguous": len(graph["ambiguous"]),
+        },
+        "pages": [[ref, title] for ref, title in zip(graph["refs"], graph["titles"])],
+        "arrays": {"file": ARRAYS_FILE, "byte_length": len(data), "columns": layout},
+        "broken": graph["broken"],
+        "ambiguous": graph["ambiguous"],
+    }
+    # Keep the file (and its packaged copy) when only the timestamp would change
+    path = out_dir / INDEX_FILE
+    if path.exists():
+        previous = read_json(path)
+        if {**previous, "metadata": {**previous["metadata"], "created_at": index["metadata"]["created_at"]}} == index:
+            return previous
+    write_json(path, index)
+    return index
+
+
+class LinkGraph:
+    """Forward links, backlinks and co-citation over a written link graph."""
+
+    def __init__(self, links_dir: Path = LINKS_DIR):
+        links_dir = Path(links_dir)
+        self.index = read_json(links_dir / INDEX_FILE)
+        self.refs = [ref for ref, _ in self.index["pages"]]
+        self.ids = {ref: i for i, ref in enumerate(self.refs)}
+        buffer = (links_dir / self.index["arrays"]["file"]).read_bytes()
+        self.arrays = {
+            col["name"]: np.frombuffer(buffer, dtype=col["dtype"], count=col["length"], offset=col["byte_offset"])
+            for col in self.index["arrays"]["columns"]
+        }
+
+    def _row(self, direction: str, ref: str) -> np.ndarray:
+        i = self.ids[ref]
+        indptr = self.arrays[f"{direction}_indptr"]
+        return self.arrays[f"{direction}_indices"][indptr[i]:indptr[i + 1]]
+
+    def links(self, ref: str) -> list:
+        """Pages `ref` links to."""
+        return [self.refs[j] for j in self._row("forward", ref)]
+
+    def backlinks(self, ref: str) -> list:
+        """Pages linking to `ref`."""
+        return [self.refs[j] for j in self._row("backward", ref)]
+
+    def related(self, ref: str, k: int = 5) -> list:
+        """Pages most often linked from the same pages as `ref` (co-citation), with counts."""
+        counts = Counter()
+        for source in self._row("backward", ref):
+            counts.update(int(j) for j in self._row("forward", self.refs[source]))
+        counts.pop(self.ids[ref], None)
+        return [(self.refs[j], n) for j, n in counts.most_common(k)]
+
+
+def load_cache(path: Path = CACHE_PATH) -> dict:
+    try:
+        return read_json(path)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict, path: Path = CACHE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_json(path, cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the wikilink/backlink graph")
+    parser.add_argument("--output", type=Path, default=LINKS_DIR, help="Graph directory")
+    parser.add_argument("--full", action="store_true", help="Ignore the parse cache and re-read every page")
+    parser.add_argument("--page", help="Show links, backlinks and related pages for one page (e.g. concepts/shadow)")
+    args = parser.parse_args()
+
+    if args.page:
+        graph = LinkGraph(args.output)
+        print(f"{args.page}")
+        print(f"  links to:    {', '.join(graph.links(args.page)) or '-'}")
+        print(f"  linked from: {', '.join(graph.backlinks(args.page)) or '-'}")
+        print(f"  co-cited:    {', '.join(f'{ref} ({n})' for ref, n in graph.related(args.page)) or '-'}")
+        return
+
+    print("Building link graph...")
+    start = time.perf_counter()
+    cache = {} if args.full else load_cache()
+    pages, parsed = parse_wiki(WIKI_DIR, cache)
+    graph = build_graph(pages)
+    index = write_graph(graph, args.output)
+    save_cache(cache)
+
+    meta = index["metadata"]
+    print(f"  {meta['num_pages']:,} pages ({parsed:,} parsed, {meta['num_pages'] - parsed:,} cached), "
+          f"{meta['num_links']:,} links in {time.perf_counter() - start:.2f}s")
+    if graph["broken"]:
+        targets = Counter()
+        for b in graph["broken"]:
+            targets[b["target"]] += b["count"]
+        print(f"  {meta['num_broken']:,} broken links to {len(targets):,} missing pages:")
+        for target, count in targets.most_common(10):
+            print(f"    [[{target}]] x{count}")
+        if len(targets) > 10:
+            print(f"    ... and {len(targets) - 10:,} more (see {INDEX_FILE})")
+    else:
+        print("  No broken links")
+    for entry in graph["ambiguous"]:
+        print(f"  ambiguous [[{entry['slug']}]]: {', '.join(entry['pages'])}")
+    print(f"  Output: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,43 @@
 package_bundle.py - Package all processed data for frontend
 
 Copies all data files to frontend/public/data/ and generates a manifest
-for the frontend to load. Also creates a compressed bundle for distribution.
+for the frontend to load. Every served file gets precompressed .gz and .br
+siblings (maximum compression, built in parallel) that static hosts can
+serve directly; a sibling is only kept when it is smaller than the file.
+
+Served files are also content-fingerprinted: landscape.json is published
+as landscape.<hash>.json (a hardlink, reflink or copy of the same bytes),
+manifest.json maps each file to its fingerprinted path, and the frontend
+resolves names through the manifest. frontend/public/_headers marks the
+fingerprinted paths immutable and the manifest no-cache for hosts that
+read it (Netlify, Cloudflare Pages); GitHub Pages ignores it but still
+gets cache busting from the names. data/bundle/ mirrors the plain files
+for distribution, linked rather than copied where the filesystem allows.
+
+Packaging is incremental. Files are compared by content hash and only
+copied when they changed, and a file is recompressed only when it changed
+or lacks an up-to-date sibling for an available codec, so an unchanged
+file is never rewritten, recompressed, or re-downloaded.
 """
 
-import json
+import argparse
+import gzip
+import os
+import re
 import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import hashlib
 
+from serialization import atomic_write, copy_file, read_json, write_json
+from slim_landscape import write_slim_landscape, INDEX_FILE, GEOMETRY_FILE, TEXT_FILE
+from time_shards import SHARD_SECONDS, SHARD_SOURCES, shard_document
+from search_index import SEARCH_DIR, INDEX_FILE as SEARCH_INDEX_FILE, shard_file
+from link_graph import LINKS_DIR, INDEX_FILE as LINK_GRAPH_FILE, ARRAYS_FILE as LINK_ARRAYS_FILE
+from instrumentation import step
+
 # Paths
 PROJECT_DIR = Path(__file__).parent.parent
 DATA_DIR = PROJECT_DIR / "data" / "processed"
@@ -19,21 +47,275 @@ WIKI_DIR = PROJECT_DIR / "wiki"
 FRONTEND_DATA_DIR = PROJECT_DIR / "frontend" / "public" / "data"
 BUNDLE_DIR = PROJECT_DIR / "data" / "bundle"
 
+# Processed files packaged under another name: the claim-based landscape
+# (cluster_by_claims.py) supersedes the embedding-cluster one when present
+PACKAGED_SOURCES = {"landscape.json": "landscape_v2.json"}
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+HASH_CHUNK_BYTES = 1 << 20
+FINGERPRINT_LENGTH = 8
+HEADERS_PATH = FRONTEND_DATA_DIR.parent / "_headers"  # Netlify / Cloudflare Pages header rules
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+FINGERPRINT_RE = re.compile(r"^(?P<stem>.+)\.[0-9a-f]{%d}(?P<suffix>\.[^.]+)(?P<sibling>\.gz|\.br)?$" % FINGERPRINT_LENGTH)
+
+FICLONE = 0x40049409  # Linux ioctl: share extents (reflink) on btrfs/XFS
+
+_hash_cache = {}
+
 
 def compute_hash(filepath):
-    """Compute MD5 hash of a file for cache busting."""
-    with open(filepath, "rb") as f:
-        return hashlib.md5(f.read()).hexdigest()[:8]
+    """Content hash of a file for cache busting, read in fixed-size chunks."""
+    stat = os.stat(filepath)
+    key = (str(filepath), stat.st_size, stat.st_mtime_ns)
+    if key not in _hash_cache:
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for block in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                digest.update(block)
+        _hash_cache[key] = digest.hexdigest()[:FINGERPRINT_LENGTH]
+    return _hash_cache[key]
+
+
+def same_content(a: Path, b: Path) -> bool:
+    """True when both files exist with identical bytes (size check first)."""
+    return b.exists() and a.stat().st_size == b.stat().st_size and compute_hash(a) == compute_hash(b)
 
 
-def copy_with_stats(src, dst):
-    """Copy a file and return size stats."""
+def copy_if_changed(src: Path, dst: Path) -> bool:
+    """Copy src over dst only when the content differs; returns True if copied.
+
+    The copy goes through a temp file and a rename, so a fingerprinted or
+    bundle file that shares dst's inode keeps its old content.
+    """
+    if same_content(src, dst):
+        return False
+    copy_file(src, dst, HASH_CHUNK_BYTES)
+    shutil.copystat(src, dst)
+    return True
+
+
+def link_or_copy(src: Path, dst: Path):
+    """Mirror src at dst without duplicating bytes where the filesystem allows.
+
+    Tries a hardlink, then a reflink (copy-on-write clone), then a plain copy.
+    """
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+    try:
+        import fcntl
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return "reflink"
+    except (ImportError, OSError):
+        dst.unlink(missing_ok=True)
     shutil.copy2(src, dst)
-    size = dst.stat().st_size
-    return size
+    return "copy"
+
+
+def mirror(src: Path, dst: Path) -> str | None:
+    """Make dst hold src's bytes (see link_or_copy); returns the method, or None if already current."""
+    if same_content(src, dst):
+        return None
+    dst.unlink(missing_ok=True)
+    return link_or_copy(src, dst)
+
+
+def fingerprinted_name(filename: str, file_hash: str) -> str:
+    """landscape.json -> landscape.<hash>.json"""
+    path = Path(filename)
+    return f"{path.stem}.{file_hash}{path.suffix}"
+
+
+def remove_stale_fingerprints(directory: Path, current: set) -> int:
+    """Delete fingerprinted files (and siblings) superseded by a new hash."""
+    removed = 0
+    for path in directory.iterdir():
+        match = FINGERPRINT_RE.match(path.name)
+        if match and path.name[:len(path.name) - len(match["sibling"] or "")] not in current:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def write_cache_headers(path: Path, fingerprinted: list, url_prefix: str = "/data"):
+    """Immutable caching for fingerprinted files; revalidate the manifest."""
+    lines = [f"{url_prefix}/manifest.json*", f"  Cache-Control: {REVALIDATE_CACHE}", ""]
+    for name in sorted(fingerprinted):
+        lines += [f"{url_prefix}/{name}*", f"  Cache-Control: {IMMUTABLE_CACHE}", ""]
+    with atomic_write(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+def load_previous_manifest(path: Path) -> dict:
+    """The manifest from the last packaging run, or {} on first run."""
+    try:
+        return read_json(path)
+    except (OSError, ValueError):
+        return {}
+
+
+def outputs_current(previous: dict, source: Path, outputs: list) -> bool:
+    """True if source and every derived output match the hashes of the last run."""
+    files = previous.get("files", {})
+    return (
+        files.get(source.name, {}).get("hash") == compute_hash(source)
+        and all(
+            (FRONTEND_DATA_DIR / name).exists()
+            and files.get(name, {}).get("hash") == compute_hash(FRONTEND_DATA_DIR / name)
+            for name in outputs
+        )
+    )
+
+
+SIBLING_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def sibling_path(path: Path, codec: str) -> Path:
+    return path.with_name(path.name + SIBLING_SUFFIXES[codec])
+
+
+def existing_compression(path: Path) -> dict:
+    """Sizes of .gz/.br siblings left by an earlier run."""
+    siblings = {codec: sibling_path(path, codec) for codec in SIBLING_SUFFIXES}
+    return {codec: p.stat().st_size for codec, p in siblings.items() if p.exists()}
+
+
+def compression_current(path: Path, codecs: list, previous_hash: str | None, current_hash: str) -> bool:
+    """
+    True if path is unchanged since the last run and has a sibling at least
+    as new as itself for every available codec. The check reads the disk,
+    not the manifest: siblings are not committed, so a fresh checkout has a
+    manifest that records compression but no siblings. Files too small to
+    gain from compression never keep a sibling and are simply recompressed.
+    """
+    if previous_hash != current_hash:
+        return False
+    mtime = path.stat().st_mtime_ns
+    return all(
+        (sibling := sibling_path(path, codec)).exists() and sibling.stat().st_mtime_ns >= mtime
+        for codec in codecs
+    )
+
+
+def remove_siblings(directory: Path, keep: set | None = None) -> int:
+    """Delete .gz/.br siblings whose file is not in keep (all of them if keep is None)."""
+    removed = 0
+    for suffix in SIBLING_SUFFIXES.values():
+        for path in directory.glob(f"*{suffix}"):
+            if keep is None or path.name[:-len(suffix)] not in keep:
+                path.unlink()
+                removed += 1
+    return removed
+
+
+def record_file(stats: dict, filename: str, description: str, changed: bool):
+    """Add a packaged frontend file to the stats and print its status."""
+    path = FRONTEND_DATA_DIR / filename
+    size = path.stat().st_size
+    stats["files_copied" if changed else "files_unchanged"] += 1
+    stats["total_bytes"] += size
+    stats["file_details"][filename] = {
+        "size": size,
+        "hash": compute_hash(path),
+        "description": description
+    }
+    status = "✓" if changed else "="
+    print(f"  {status} {filename} ({size:,} bytes{'' if changed else ', unchanged'})")
+
+
+def load_brotli():
+    """Import the optional brotli module; None if it is not installed."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def write_sibling(path: Path, codec: str, packed: bytes, size: int) -> bool:
+    """Write a compressed sibling only if it is smaller than the raw file; drop a stale one otherwise."""
+    sibling = sibling_path(path, codec)
+    if len(packed) >= size:
+        sibling.unlink(missing_ok=True)
+        return False
+    with atomic_write(sibling) as f:
+        f.write(packed)
+    return True
+
+
+def compress_file(path: Path) -> dict:
+    """Write max-compression .gz and .br siblings of path; returns sizes and timings.
+
+    Small files (short shards, tiny postings lists) often grow under
+    compression; those get no sibling and are served as-is.
+    """
+    data = path.read_bytes()
+    result = {"file": path.name, "size": len(data)}
+
+    start = time.perf_counter()
+    # mtime=0 keeps the .gz byte-identical across runs for unchanged input
+    packed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    result["gzip"] = {"size": len(packed), "seconds": time.perf_counter() - start,
+                      "written": write_sibling(path, "gzip", packed, len(data))}
+
+    brotli = load_brotli()
+    if brotli is not None:
+        start = time.perf_counter()
+        packed = brotli.compress(data, quality=BROTLI_QUALITY)
+        result["br"] = {"size": len(packed), "seconds": time.perf_counter() - start,
+                        "written": write_sibling(path, "br", packed, len(data))}
+    return result
+
+
+def compress_files(paths: list, workers: int | None = None) -> dict:
+    """Compress files across a process pool; returns {filename: compress_file result}."""
+    if not paths:
+        return {}
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    if workers <= 1:
+        return {r["file"]: r for r in map(compress_file, paths)}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return {r["file"]: r for r in pool.map(compress_file, paths)}
+
+
+def print_compression_report(results: dict, wall_seconds: float):
+    """Per-file compression ratios and encode times."""
+    width = max([len(name) for name in results] + [24]) + 2
+    header = f"    {'file':<{width}}{'raw':>11}{'gzip':>11}{'br':>11}{'ratio':>8}{'cpu s':>8}"
+    print(header)
+    print("    " + "-" * (len(header) - 4))
+    totals = {"size": 0, "gzip": 0, "br": 0, "seconds": 0.0}
+    has_br = any("br" in r for r in results.values())
+    for name, r in sorted(results.items(), key=lambda item: -item[1]["size"]):
+        best = min(r[c]["size"] for c in ("gzip", "br") if c in r)
+        seconds = sum(r[c]["seconds"] for c in ("gzip", "br") if c in r)
+        br = f"{r['br']['size']:>11,}" if "br" in r else f"{'-':>11}"
+        print(f"    {name:<{width}}{r['size']:>11,}{r['gzip']['size']:>11,}{br}"
+              f"{r['size'] / max(best, 1):>7.1f}x{seconds:>8.2f}")
+        totals["size"] += r["size"]
+        totals["gzip"] += r["gzip"]["size"]
+        totals["br"] += r.get("br", r["gzip"])["size"]
+        totals["seconds"] += seconds
+    best_total = min(totals["gzip"], totals["br"]) if has_br else totals["gzip"]
+    br_total = f"{totals['br']:>11,}" if has_br else f"{'-':>11}"
+    print(f"    {'total':<{width}}{totals['size']:>11,}{totals['gzip']:>11,}{br_total}"
+          f"{totals['size'] / max(best_total, 1):>7.1f}x{totals['seconds']:>8.2f}")
+    print(f"    Wall time: {wall_seconds:.2f}s")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Package processed data for the frontend")
+    parser.add_argument("--no-compress", action="store_true", help="Skip (and remove) .gz/.br siblings")
+    parser.add_argument("--workers", type=int, default=None, help="Compression processes (default: one per CPU)")
+    parser.add_argument("--shard-seconds", type=float, default=SHARD_SECONDS, help="Time-shard window width")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("  Bundle Packaging - Dialectical Topology")
     print("=" * 60)
@@ -52,47 +334,179 @@ def main():
         "claims.json": "42 extracted philosophical claims",
         "ontology.json": "8-dimension philosophical analysis",
         "flow.json": "Conversation flow with inflection points",
+        "responses.json": "Cross-speaker response edges for the flow lens",
         "dialogue.json": "Steel Man Arena content"
     }
 
     stats = {
         "files_copied": 0,
+        "files_unchanged": 0,
         "total_bytes": 0,
         "file_details": {}
     }
+    previous_manifest = load_previous_manifest(FRONTEND_DATA_DIR / "manifest.json")
+    previous = previous_manifest.get("files", {})
 
     print("\nCopying data files to frontend...")
-    for filename, description in data_files.items():
-        src = DATA_DIR / filename
-        if src.exists():
-            dst = FRONTEND_DATA_DIR / filename
-            size = copy_with_stats(src, dst)
-            file_hash = compute_hash(dst)
-            stats["files_copied"] += 1
-            stats["total_bytes"] += size
-            stats["file_details"][filename] = {
-                "size": size,
-                "hash": file_hash,
-                "description": description
-            }
-            print(f"  ✓ {filename} ({size:,} bytes)")
-        else:
-            print(f"  ✗ {filename} (not found)")
+    with step("copy_data"):
+        for filename, description in data_files.items():
+            src = DATA_DIR / PACKAGED_SOURCES.get(filename, filename)
+            if not src.exists():
+                src = DATA_DIR / filename
+            if src.exists():
+                changed = copy_if_changed(src, FRONTEND_DATA_DIR / filename)
+                record_file(stats, filename, description, changed)
+            else:
+                print(f"  ✗ {filename} (not found)")
 
     # Copy wiki index
     print("\nCopying wiki index...")
     wiki_index_src = WIKI_DIR / "index.json"
     if wiki_index_src.exists():
-        dst = FRONTEND_DATA_DIR / "wiki_index.json"
-        size = copy_with_stats(wiki_index_src, dst)
-        stats["files_copied"] += 1
-        stats["total_bytes"] += size
-        stats["file_details"]["wiki_index.json"] = {
-            "size": size,
-            "hash": compute_hash(dst),
-            "description": "Wiki entity index"
+        changed = copy_if_changed(wiki_index_src, FRONTEND_DATA_DIR / "wiki_index.json")
+        record_file(stats, "wiki_index.json", "Wiki entity index", changed)
+
+    # Full-text search index: the index document plus one shard per term prefix
+    print("\nCopying search index...")
+    search_index = None
+    if (SEARCH_DIR / SEARCH_INDEX_FILE).exists():
+        search_index = read_json(SEARCH_DIR / SEARCH_INDEX_FILE)
+        search_files = {SEARCH_INDEX_FILE: f"Search index ({search_index['metadata']['num_docs']:,} documents)"}
+        for prefix, shard in search_index["shards"].items():
+            search_files[shard["file"]] = f"Search postings for terms starting '{prefix}'"
+        for filename, description in search_files.items():
+            changed = copy_if_changed(SEARCH_DIR / filename, FRONTEND_DATA_DIR / filename)
+            record_file(stats, filename, description, changed)
+        for stale in FRONTEND_DATA_DIR.glob(shard_file("*")):
+            if stale.name not in search_files:
+                stale.unlink()
+    else:
+        print(f"  ✗ {SEARCH_INDEX_FILE} (not found; run search_index.py)")
+
+    # Wikilink graph: page table and broken links plus packed CSR adjacency
+    print("\nCopying link graph...")
+    link_files = {
+        LINK_GRAPH_FILE: "Wiki pages and broken links",
+        LINK_ARRAYS_FILE: "Packed CSR forward/backlink adjacency",
+    }
+    for filename, description in link_files.items():
+        src = LINKS_DIR / filename
+        if src.exists():
+            changed = copy_if_changed(src, FRONTEND_DATA_DIR / filename)
+            record_file(stats, filename, description, changed)
+        else:
+            print(f"  ✗ {filename} (not found; run link_graph.py)")
+
+    # Split the landscape into geometry (first paint) and on-demand text
+    print("\nBuilding slim landscape bundle...")
+    landscape_src = FRONTEND_DATA_DIR / "landscape.json"
+    if landscape_src.exists():
+        slim_descriptions = {
+            INDEX_FILE: "Landscape layout, clusters and trajectories",
+            GEOMETRY_FILE: "Packed float32/int landscape geometry",
+            TEXT_FILE: "Chunk text keyed by ID (loaded on demand)",
         }
-        print(f"  ✓ wiki_index.json ({size:,} bytes)")
+        # The slim files are derived from landscape.json alone
+        if not outputs_current(previous_manifest, landscape_src, list(slim_descriptions)):
+            with step("slim_landscape"):
+                write_slim_landscape(read_json(landscape_src), FRONTEND_DATA_DIR)
+        for filename, description in slim_descriptions.items():
+            changed = previous.get(filename, {}).get("hash") != compute_hash(FRONTEND_DATA_DIR / filename)
+            record_file(stats, filename, description, changed)
+        first_paint = sum(stats["file_details"][name]["size"] for name in (INDEX_FILE, GEOMETRY_FILE))
+        print(f"  First paint: {first_paint:,} bytes (landscape.json: {landscape_src.stat().st_size:,} bytes)")
+
+    # Time-shard the large documents for progressive loading
+    print(f"\nTime-sharding ({args.shard_seconds:.0f}s windows)...")
+    shards = {}
+    for filename in SHARD_SOURCES:
+        src = FRONTEND_DATA_DIR / filename
+        if filename not in stats["file_details"]:
+            continue
+        shard_index = previous_manifest.get("shards", {}).get(filename)
+        reuse = (
+            shard_index is not None
+            and shard_index["window_seconds"] == args.shard_seconds
+            and outputs_current(previous_manifest, src, [s["file"] for s in shard_index["shards"]])
+        )
+        if not reuse:
+            with step(f"shard {filename}"):
+                shard_index = shard_document(filename, src, FRONTEND_DATA_DIR, args.shard_seconds)
+        shards[filename] = shard_index
+        for shard in shard_index["shards"]:
+            description = f"{filename} records {shard['start']:.0f}-{shard['end']:.0f}s ({shard['episode']})"
+            changed = previous.get(shard["file"], {}).get("hash") != compute_hash(FRONTEND_DATA_DIR / shard["file"])
+            record_file(stats, shard["file"], description, changed)
+
+    # Publish every served file under a content-fingerprinted name too
+    print("\nFingerprinting served files...")
+    link_methods = {}
+    for filename, details in stats["file_details"].items():
+        details["path"] = fingerprinted_name(filename, details["hash"])
+        method = mirror(FRONTEND_DATA_DIR / filename, FRONTEND_DATA_DIR / details["path"])
+        if method:
+            link_methods[method] = link_methods.get(method, 0) + 1
+    fingerprinted = {d["path"] for d in stats["file_details"].values()}
+    removed = remove_stale_fingerprints(FRONTEND_DATA_DIR, fingerprinted)
+    linked = ", ".join(f"{n} by {method}" for method, n in link_methods.items()) or "none"
+    print(f"  ✓ {sum(link_methods.values())} new fingerprinted files ({linked}), "
+          f"{len(fingerprinted) - sum(link_methods.values())} unchanged, {removed} stale removed")
+
+    # Mirror the plain files into the distribution bundle
+    print("\nCreating distribution bundle...")
+    link_methods = {}
+    for filename in stats["file_details"]:
+        method = mirror(FRONTEND_DATA_DIR / filename, BUNDLE_DIR / filename)
+        if method:
+            link_methods[method] = link_methods.get(method, 0) + 1
+    # Drop files no longer packaged (old shards, fingerprinted names and siblings from older runs)
+    stale = [path for path in BUNDLE_DIR.iterdir()
+             if path.is_file() and path.name not in stats["file_details"] and path.name != "manifest.json"]
+    for path in stale:
+        path.unlink()
+    linked = ", ".join(f"{n} by {method}" for method, n in link_methods.items()) or "none"
+    print(f"  ✓ {sum(link_methods.values())} files updated ({linked}), "
+          f"{len(stats['file_details']) - sum(link_methods.values())} unchanged, {len(stale)} stale removed")
+
+    # Precompress the served files; unchanged files keep their siblings
+    print("\nCompressing frontend data...")
+    compression = {}
+    compress_seconds = 0.0
+    if args.no_compress:
+        print(f"  Skipped; removed {remove_siblings(FRONTEND_DATA_DIR)} existing siblings")
+    else:
+        codecs = ["gzip"]
+        if load_brotli() is None:
+            print("  brotli not installed (pip install brotli); writing .gz siblings only")
+        else:
+            codecs.append("br")
+        pending = [
+            FRONTEND_DATA_DIR / filename for filename, details in stats["file_details"].items()
+            if not compression_current(FRONTEND_DATA_DIR / filename, codecs,
+                                       previous.get(filename, {}).get("hash"), details["hash"])
+        ]
+        start = time.perf_counter()
+        with step("compress"):
+            compression = compress_files(pending, args.workers)
+        compress_seconds = time.perf_counter() - start
+        for filename, details in stats["file_details"].items():
+            details["compressed"] = existing_compression(FRONTEND_DATA_DIR / filename)
+            # The fingerprinted name gets the same siblings
+            for codec in SIBLING_SUFFIXES:
+                src = sibling_path(FRONTEND_DATA_DIR / filename, codec)
+                dst = sibling_path(FRONTEND_DATA_DIR / details["path"], codec)
+                if src.exists():
+                    mirror(src, dst)
+                else:
+                    dst.unlink(missing_ok=True)
+        removed = remove_siblings(FRONTEND_DATA_DIR, set(stats["file_details"]) | fingerprinted | {"manifest.json"})
+        skipped = sum(1 for r in compression.values() for c in SIBLING_SUFFIXES if c in r and not r[c]["written"])
+        print(f"  ✓ Compressed {len(compression)} files (changed or missing siblings) in {compress_seconds:.2f}s "
+              f"({skipped} siblings skipped as no smaller, {removed} stale removed)")
+    compressed_totals = {}
+    for details in stats["file_details"].values():
+        for codec, size in details.get("compressed", {}).items():
+            compressed_totals[codec] = compressed_totals.get(codec, 0) + size
 
     # Generate frontend manifest
     print("\nGenerating frontend manifest...")
@@ -124,6 +538,11 @@ def main():
                 "name": "Semantic Landscape",
                 "description": "3D terrain of meaning - explore the conversation's conceptual topology",
                 "data_file": "landscape.json",
+                "slim_files": {
+                    "index": INDEX_FILE,
+                    "geometry": GEOMETRY_FILE,
+                    "text": TEXT_FILE
+                },
                 "component": "SemanticLandscape"
             },
             {
@@ -165,23 +584,25 @@ def main():
             "arena_rounds": 5
         },
         "files": stats["file_details"],
-        "total_size_bytes": stats["total_bytes"]
+        # Per-document shard index: time range, record count and size of each shard
+        "shards": shards,
+        "search_index": SEARCH_INDEX_FILE if search_index else None,
+        "link_graph": LINK_GRAPH_FILE if LINK_GRAPH_FILE in stats["file_details"] else None,
+        "total_size_bytes": stats["total_bytes"],
+        "total_compressed_bytes": compressed_totals
     }
 
     manifest_path = FRONTEND_DATA_DIR / "manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+    write_json(manifest_path, manifest)
     print(f"  ✓ manifest.json")
 
-    # Also save to bundle directory
-    shutil.copy2(manifest_path, BUNDLE_DIR / "manifest.json")
+    if not args.no_compress:
+        compress_file(manifest_path)
+    write_cache_headers(HEADERS_PATH, sorted(fingerprinted))
+    print(f"  ✓ {HEADERS_PATH.name} (immutable caching for fingerprinted files)")
 
-    # Copy all data to bundle directory
-    print("\nCreating distribution bundle...")
-    for filename in stats["file_details"].keys():
-        src = FRONTEND_DATA_DIR / filename
-        if src.exists():
-            shutil.copy2(src, BUNDLE_DIR / filename)
+    # Also save to bundle directory
+    copy_file(manifest_path, BUNDLE_DIR / "manifest.json")
 
     # Summary
     print("\n" + "=" * 60)
@@ -189,7 +610,8 @@ def main():
     print("=" * 60)
     print(f"\n  Frontend data: {FRONTEND_DATA_DIR}")
     print(f"  Distribution bundle: {BUNDLE_DIR}")
-    print(f"\n  Files packaged: {stats['files_copied']}")
+    print(f"\n  Files packaged: {len(stats['file_details'])} "
+          f"({stats['files_copied']} changed, {stats['files_unchanged']} unchanged)")
     print(f"  Total size: {stats['total_bytes']:,} bytes ({stats['total_bytes']/1024:.1f} KB)")
 
     print("\n  Lens data files:")
@@ -198,6 +620,10 @@ def main():
         size = file_info.get("size", 0)
         print(f"    - {lens['name']}: {lens['data_file']} ({size:,} bytes)")
 
+    if compression:
+        print("\n  Compression (frontend siblings):")
+        print_compression_report(compression, compress_seconds)
+
     print("\n  Ready for frontend build!")
 
 
@@ -4,11 +4,12 @@ Parse the merged Otter.ai transcript into structured JSON format.
 Handles speaker attribution and timestamp extraction.
 """
 
-import json
 import re
 from pathlib import Path
 from datetime import datetime
 
+from serialization import write_json
+
 def parse_timestamp(timestamp_str: str) -> float:
     """Convert timestamp string to seconds."""
     # Handle formats like "0:00", "1:07", "1:29:38"
@@ -137,8 +138,7 @@ def main():
 
     # Write output
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    write_json(output_path, result)
 
     print(f"Parsed {result['metadata']['total_segments']} segments")
     print(f"Total duration: {result['metadata']['total_duration_seconds'] / 60:.1f} minutes")
@@ -4,29 +4,67 @@ Project embeddings to 3D using UMAP for semantic landscape visualization.
 Generates multiple projections with different parameters for comparison.
 """
 
+import argparse
 import json
+import os
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 
-try:
-    import umap
-except ImportError:
-    print("Installing umap-learn...")
-    import subprocess
-    subprocess.check_call(["pip", "install", "umap-learn"])
-    import umap
+from reduce_embeddings import METHODS, fit_reducer, transform, save_reducer, describe_reducer
+from cluster_landscape import (
+    CLUSTER_METHODS, KNN_GRAPH_PATH, cluster_points, build_clusters, label_clusters, save_knn_graph,
+)
+from trajectories import build_trajectories
+from serialization import copy_file, write_json_stream
+from instrumentation import step
+
+# Persist numba's JIT cache between runs so UMAP doesn't recompile every time
+NUMBA_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "numba"
+
+def load_umap():
+    """Import umap-learn on first use (pulls in numba/pynndescent, slow to import)."""
+    os.environ.setdefault("NUMBA_CACHE_DIR", str(NUMBA_CACHE_DIR))
+    try:
+        import umap
+    except ImportError as e:
+        raise ImportError("umap-learn is required for projection: pip install umap-learn") from e
+    return umap
+
+def nearest_neighbors(embeddings: np.ndarray, n_neighbors: int = 15):
+    """
+    Cosine kNN graph as UMAP builds it: (indices, distances, search index).
+    Computed up front because UMAP only keeps its own graph for large inputs.
+    """
+    load_umap()
+    from umap.umap_ import nearest_neighbors as umap_nearest_neighbors
+
+    return umap_nearest_neighbors(
+        embeddings,
+        n_neighbors=n_neighbors,
+        metric="cosine",
+        metric_kwds={},
+        angular=False,
+        random_state=np.random.RandomState(42),
+    )
 
-def project_umap(embeddings: np.ndarray, n_neighbors: int = 15, min_dist: float = 0.1) -> np.ndarray:
-    """Project embeddings to 3D using UMAP."""
+def fit_umap(embeddings: np.ndarray, n_neighbors: int = 15, min_dist: float = 0.1, knn=None):
+    """Fit a 3D UMAP model, on a precomputed `nearest_neighbors` graph when given."""
+    umap = load_umap()
     reducer = umap.UMAP(
         n_components=3,
         n_neighbors=n_neighbors,
         min_dist=min_dist,
         metric="cosine",
         random_state=42,  # For reproducibility
+        precomputed_knn=knn if knn is not None else (None, None, None),
     )
-    return reducer.fit_transform(embeddings)
+    reducer.fit(embeddings)
+    return reducer
+
+def project_umap(embeddings: np.ndarray, n_neighbors: int = 15, min_dist: float = 0.1) -> np.ndarray:
+    """Project embeddings to 3D using UMAP."""
+    return fit_umap(embeddings, n_neighbors, min_dist).embedding_
 
 def normalize_coordinates(coords: np.ndarray) -> np.ndarray:
     """Normalize coordinates to [-1, 1] range."""
@@ -34,20 +72,25 @@ def normalize_coordinates(coords: np.ndarray) -> np.ndarray:
     max_range = np.abs(coords).max()
     return coords / max_range if max_range > 0 else coords
 
-def main():
-    base_dir = Path(__file__).parent.parent
-    embeddings_path = base_dir / "data" / "processed" / "embeddings.npy"
-    chunks_path = base_dir / "data" / "processed" / "chunks.json"
-    output_path = base_dir / "data" / "processed" / "landscape.json"
-
-    print(f"Loading embeddings from: {embeddings_path}")
-    embeddings = np.load(embeddings_path)
-    print(f"Embeddings shape: {embeddings.shape}")
-
-    print(f"Loading chunks from: {chunks_path}")
-    with open(chunks_path, "r", encoding="utf-8") as f:
-        chunks_data = json.load(f)
-    chunks = chunks_data["chunks"]
+def build_landscape(
+    embeddings: np.ndarray,
+    chunks: list,
+    reduce: str | None = None,
+    reduce_dim: int = 50,
+    cluster_method: str = "kmeans",
+    n_clusters: int | None = None,
+    embedding_model: str = "nomic-embed-text",
+):
+    """Project, cluster and trace chunks; returns (landscape, pre-reducer or None, kNN graph)."""
+    reducer = None
+    pre_reduction = None
+    if reduce:
+        print(f"\nPre-reducing with {reduce} to {reduce_dim} dimensions...")
+        with step("pre_reduce"):
+            reducer = fit_reducer(embeddings, method=reduce, n_components=reduce_dim)
+            embeddings = transform(reducer, embeddings)
+        pre_reduction = describe_reducer(reducer)
+        print(f"Reduced shape: {embeddings.shape}")
 
     # UMAP parameters to try
     params = [
@@ -58,8 +101,13 @@ def main():
 
     # Use first parameter set for main projection
     print(f"\nProjecting with n_neighbors={params[0]['n_neighbors']}, min_dist={params[0]['min_dist']}...")
-    coords = project_umap(embeddings, **params[0])
-    coords = normalize_coordinates(coords)
+    # One neighbor graph for both UMAP and the clusterer
+    with step("knn"):
+        knn_indices, knn_dists, search_index = nearest_neighbors(embeddings, params[0]["n_neighbors"])
+    knn_graph = (knn_indices, knn_dists)
+    with step("fit_umap"):
+        umap_model = fit_umap(embeddings, **params[0], knn=(knn_indices, knn_dists, search_index))
+    coords = normalize_coordinates(umap_model.embedding_)
 
     print(f"Projected coordinates shape: {coords.shape}")
 
@@ -79,63 +127,102 @@ def main():
             "tokens": chunk["token_estimate"],
         })
 
-    # Simple clustering by speaker (we can do k-means later)
+    # Unsupervised clustering on the same feature space UMAP saw
+    print(f"Clustering with {cluster_method}...")
+    with step("cluster"):
+        labels = cluster_points(embeddings, cluster_method, n_clusters, knn_graph=knn_graph)
+    for point, label in zip(points, labels):
+        point["cluster_id"] = int(label)
+    clusters = build_clusters(
+        labels, coords, [p["speaker"] for p in points],
+        label_clusters([c["text"] for c in chunks], labels),
+    )
+
     marcus_points = [p for p in points if p["speaker"] == "marcus"]
     demartini_points = [p for p in points if p["speaker"] == "demartini"]
 
     marcus_centroid = np.mean([[p["x"], p["y"], p["z"]] for p in marcus_points], axis=0) if marcus_points else [0, 0, 0]
     demartini_centroid = np.mean([[p["x"], p["y"], p["z"]] for p in demartini_points], axis=0) if demartini_points else [0, 0, 0]
 
-    clusters = [
-        {
-            "id": 0,
-            "label": "Marcus",
-            "centroid": [float(c) for c in marcus_centroid],
-            "count": len(marcus_points),
-        },
-        {
-            "id": 1,
-            "label": "Demartini",
-            "centroid": [float(c) for c in demartini_centroid],
-            "count": len(demartini_points),
-        },
-    ]
-
-    # Build speaker trajectories (paths through time)
-    marcus_trajectory = sorted([p for p in points if p["speaker"] == "marcus"], key=lambda p: p["time"])
-    demartini_trajectory = sorted([p for p in points if p["speaker"] == "demartini"], key=lambda p: p["time"])
-
-    trajectories = {
-        "marcus": [[p["x"], p["y"], p["z"]] for p in marcus_trajectory],
-        "demartini": [[p["x"], p["y"], p["z"]] for p in demartini_trajectory],
+    speaker_centroids = {
+        "marcus": [float(c) for c in marcus_centroid],
+        "demartini": [float(c) for c in demartini_centroid],
     }
 
-    # Output
+    # Build speaker trajectories (paths through time) with levels of detail
+    with step("trajectories"):
+        trajectories, trajectory_levels = build_trajectories(
+            coords,
+            np.array([c["start_time"] for c in chunks], dtype=np.float64),
+            np.array([c["speaker"] for c in chunks]),
+            embeddings,
+        )
+
     landscape = {
         "metadata": {
             "created_at": datetime.now().isoformat(),
             "num_points": len(points),
+            "num_clusters": len(clusters),
             "umap_params": params[0],
-            "embedding_model": "nomic-embed-text",
+            "pre_reduction": pre_reduction,
+            "clustering": {"method": cluster_method, "reused_knn_graph": cluster_method == "hdbscan"},
+            "embedding_model": embedding_model,
             "dimensions": 3,
         },
         "points": points,
         "clusters": clusters,
+        "speaker_centroids": speaker_centroids,
         "trajectories": trajectories,
+        "trajectory_levels": trajectory_levels,
     }
+    return landscape, reducer, knn_graph
+
+def main():
+    parser = argparse.ArgumentParser(description="Project chunk embeddings to a 3D landscape")
+    parser.add_argument("--reduce", choices=METHODS, default=None,
+                        help="Optional linear pre-reduction before UMAP")
+    parser.add_argument("--reduce-dim", type=int, default=50, help="Target dimension for --reduce")
+    parser.add_argument("--cluster-method", choices=CLUSTER_METHODS, default="kmeans")
+    parser.add_argument("--clusters", type=int, default=None, help="k for k-means (default: sqrt(n/2))")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    embeddings_path = base_dir / "data" / "processed" / "embeddings.npy"
+    chunks_path = base_dir / "data" / "processed" / "chunks.json"
+    output_path = base_dir / "data" / "processed" / "landscape.json"
+    reducer_path = base_dir / "data" / "processed" / "reducer.npz"
+
+    print(f"Loading embeddings from: {embeddings_path}")
+    with step("load_embeddings"):
+        embeddings = np.load(embeddings_path)
+    print(f"Embeddings shape: {embeddings.shape}")
+
+    print(f"Loading chunks from: {chunks_path}")
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        chunks_data = json.load(f)
+    chunks = chunks_data["chunks"]
+
+    landscape, reducer, knn_graph = build_landscape(
+        embeddings, chunks, args.reduce, args.reduce_dim, args.cluster_method, args.clusters,
+    )
+    if reducer is not None:
+        save_reducer(reducer, reducer_path)
+        print(f"Reducer saved to {reducer_path}")
+    save_knn_graph(KNN_GRAPH_PATH, *knn_graph, space="reduced" if args.reduce else "embeddings")
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(landscape, f, indent=2)
+    with step("write"):
+        write_json_stream(output_path, landscape, "points", landscape["points"])
 
+    centroids = landscape["speaker_centroids"]
     print(f"\nSaved landscape to: {output_path}")
-    print(f"  Points: {len(points)}")
-    print(f"  Marcus centroid: {marcus_centroid}")
-    print(f"  Demartini centroid: {demartini_centroid}")
+    print(f"  Points: {len(landscape['points'])}")
+    print(f"  Clusters: {len(landscape['clusters'])}")
+    print(f"  Marcus centroid: {centroids['marcus']}")
+    print(f"  Demartini centroid: {centroids['demartini']}")
 
     # Also copy to frontend public folder
     frontend_path = base_dir / "frontend" / "public" / "data" / "landscape.json"
-    with open(frontend_path, "w", encoding="utf-8") as f:
-        json.dump(landscape, f)
+    copy_file(output_path, frontend_path)
     print(f"  Copied to: {frontend_path}")
 
 if __name__ == "__main__":
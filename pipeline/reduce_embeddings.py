@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Linear pre-reduction of chunk embeddings before UMAP and clustering.
+
+Fits a fast linear transform (PCA, randomized SVD, or sparse random
+projection) from the 768-d nomic-embed-text space down to a configurable
+target dimension. The fitted transform is saved alongside the embeddings
+so new vectors (claims, queries, later episodes) are reduced consistently.
+"""
+
+import argparse
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+
+from serialization import atomic_write, write_json
+
+METHODS = ("pca", "randomized_svd", "random_projection")
+DEFAULT_COMPONENTS = 50
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so Euclidean geometry matches cosine similarity."""
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+def fit_pca(embeddings: np.ndarray, n_components: int) -> dict:
+    """Exact PCA via eigendecomposition of the d x d covariance matrix.
+
+    Memory stays O(d^2) regardless of the number of rows, so this works for
+    large corpora as long as the embedding dimension is modest.
+    """
+    mean = embeddings.mean(axis=0)
+    centered = embeddings - mean
+    cov = (centered.T @ centered) / max(len(embeddings) - 1, 1)
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    order = np.argsort(eigvals)[::-1][:n_components]
+    total = eigvals.sum()
+    return {
+        "mean": mean,
+        "components": eigvecs[:, order],
+        "explained_variance_ratio": eigvals[order] / total if total > 0 else np.zeros(len(order)),
+    }
+
+
+def fit_randomized_svd(
+    embeddings: np.ndarray,
+    n_components: int,
+    n_oversamples: int = 10,
+    n_iter: int = 4,
+    seed: int = 42,
+) -> dict:
+    """Truncated PCA via randomized SVD (Halko et al.) with power iterations."""
+    rng = np.random.default_rng(seed)
+    mean = embeddings.mean(axis=0)
+    centered = embeddings - mean
+    n_random = min(n_components + n_oversamples, min(centered.shape))
+
+    q = centered @ rng.standard_normal((centered.shape[1], n_random)).astype(centered.dtype)
+    q, _ = np.linalg.qr(q)
+    for _ in range(n_iter):
+        q, _ = np.linalg.qr(centered.T @ q)
+        q, _ = np.linalg.qr(centered @ q)
+
+    _, s, vt = np.linalg.svd(q.T @ centered, full_matrices=False)
+    total = (centered ** 2).sum()
+    variance = s[:n_components] ** 2
+    return {
+        "mean": mean,
+        "components": vt[:n_components].T,
+        "explained_variance_ratio": variance / total if total > 0 else np.zeros(len(variance)),
+    }
+
+
+def fit_random_projection(dim: int, n_components: int, seed: int = 42) -> dict:
+    """Sparse random projection (Li et al.) with density 1/sqrt(d).
+
+    Data-independent, so fitting is free; only the seed and shape matter.
+    """
+    rng = np.random.default_rng(seed)
+    density = 1.0 / np.sqrt(dim)
+    scale = np.sqrt(1.0 / (density * n_components))
+    draws = rng.random((dim, n_components))
+    signs = np.where(rng.random((dim, n_components)) < 0.5, -1.0, 1.0)
+    components = np.where(draws < density, signs * scale, 0.0)
+    return {
+        "mean": np.zeros(dim),
+        "components": components,
+        "explained_variance_ratio": np.array([]),
+    }
+
+
+def fit_reducer(
+    embeddings: np.ndarray,
+    method: str = "pca",
+    n_components: int = DEFAULT_COMPONENTS,
+    seed: int = 42,
+) -> dict:
+    """Fit a linear reducer on row-normalized embeddings."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown reduction method: {method} (expected one of {METHODS})")
+    n_components = min(n_components, embeddings.shape[1])
+
+    data = normalize_rows(embeddings.astype(np.float64))
+    if method == "pca":
+        fitted = fit_pca(data, n_components)
+    elif method == "randomized_svd":
+        fitted = fit_randomized_svd(data, n_components, seed=seed)
+    else:
+        fitted = fit_random_projection(data.shape[1], n_components, seed=seed)
+
+    return {
+        "method": method,
+        "n_components": n_components,
+        "input_dim": embeddings.shape[1],
+        "seed": seed,
+        "mean": fitted["mean"].astype(np.float32),
+        "components": fitted["components"].astype(np.float32),
+        "explained_variance_ratio": fitted["explained_variance_ratio"].astype(np.float32),
+    }
+
+
+def transform(reducer: dict, embeddings: np.ndarray) -> np.ndarray:
+    """Apply a fitted reducer to new vectors."""
+    if embeddings.shape[1] != reducer["input_dim"]:
+        raise ValueError(
+            f"Reducer expects {reducer['input_dim']}-d vectors, got {embeddings.shape[1]}-d"
+        )
+    data = normalize_rows(embeddings.astype(np.float32))
+    return (data - reducer["mean"]) @ reducer["components"]
+
+
+def save_reducer(reducer: dict, path: Path):
+    """Persist a fitted reducer as .npz."""
+    with atomic_write(path) as f:
+        np.savez(
+            f,
+            method=np.array(reducer["method"]),
+            n_components=np.array(reducer["n_components"]),
+            input_dim=np.array(reducer["input_dim"]),
+            seed=np.array(reducer["seed"]),
+            mean=reducer["mean"],
+            components=reducer["components"],
+            explained_variance_ratio=reducer["explained_variance_ratio"],
+        )
+
+
+def load_reducer(path: Path) -> dict:
+    """Load a reducer written by save_reducer()."""
+    with np.load(path) as data:
+        return {
+            "method": str(data["method"]),
+            "n_components": int(data["n_components"]),
+            "input_dim": int(data["input_dim"]),
+            "seed": int(data["seed"]),
+            "mean": data["mean"],
+            "components": data["components"],
+            "explained_variance_ratio": data["explained_variance_ratio"],
+        }
+
+
+def describe_reducer(reducer: dict) -> dict:
+    """JSON-friendly summary for landscape metadata."""
+    ratio = reducer["explained_variance_ratio"]
+    return {
+        "method": reducer["method"],
+        "n_components": reducer["n_components"],
+        "input_dim": reducer["input_dim"],
+        "explained_variance": float(ratio.sum()) if len(ratio) else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit a linear pre-reduction for chunk embeddings")
+    parser.add_argument("--method", choices=METHODS, default="pca")
+    parser.add_argument("--dim", type=int, default=DEFAULT_COMPONENTS, help="Target dimension")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    embeddings_path = base_dir / "data" / "processed" / "embeddings.npy"
+    reducer_path = base_dir / "data" / "processed" / "reducer.npz"
+    reduced_path = base_dir / "data" / "processed" / "embeddings_reduced.npy"
+    meta_path = base_dir / "data" / "processed" / "reducer_meta.json"
+
+    print(f"Loading embeddings from: {embeddings_path}")
+    embeddings = np.load(embeddings_path)
+    print(f"Embeddings shape: {embeddings.shape}")
+
+    print(f"\nFitting {args.method} reducer to {args.dim} dimensions...")
+    reducer = fit_reducer(embeddings, method=args.method, n_components=args.dim, seed=args.seed)
+    reduced = transform(reducer, embeddings)
+
+    save_reducer(reducer, reducer_path)
+    with atomic_write(reduced_path) as f:
+        np.save(f, reduced)
+
+    meta = describe_reducer(reducer)
+    meta["created_at"] = datetime.now().isoformat()
+    write_json(meta_path, meta)
+
+    print(f"Reduced shape: {reduced.shape}")
+    if meta["explained_variance"] is not None:
+        print(f"Explained variance: {meta['explained_variance']:.3f}")
+    print(f"Saved reducer to: {reducer_path}")
+    print(f"Saved reduced embeddings to: {reduced_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Find where one speaker directly answers the other.
+
+For every chunk, scores the other speaker's chunks that begin within a
+time window after it and keeps the top-k most similar as "response" edges.
+Similarities are computed in time-ordered blocks with one matrix multiply
+per block, so cost grows with (chunks x chunks-in-window), never with the
+full cross-speaker product. In a multi-episode corpus, offsets restart
+with each episode, so pairs from different episodes are never candidates
+(chunks without an `episode` field share time_shards.DEFAULT_EPISODE).
+
+Output is a compact columnar edge list for the Dialectical Flow lens.
+"""
+
+import argparse
+import json
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+
+from reduce_embeddings import normalize_rows
+from serialization import write_json
+from time_shards import DEFAULT_EPISODE
+
+WINDOW_SECONDS = 300   # how far ahead a response may start
+TOP_K = 3              # responses kept per chunk
+MIN_SIMILARITY = 0.5
+BLOCK_SIZE = 512
+
+EDGE_DTYPE = np.dtype([("source", np.int64), ("target", np.int64), ("score", np.float32), ("lag", np.float64)])
+
+
+def response_edges(
+    vectors: np.ndarray,
+    times: np.ndarray,
+    source_rows: np.ndarray,
+    target_rows: np.ndarray,
+    window: float = WINDOW_SECONDS,
+    k: int = TOP_K,
+    min_similarity: float = MIN_SIMILARITY,
+    block_size: int = BLOCK_SIZE,
+    episodes: np.ndarray | None = None,
+) -> np.ndarray:
+    """Top-k response edges from source rows to target rows.
+
+    A target chunk is a candidate response when it starts strictly after
+    the source chunk, no more than `window` seconds later, and (when
+    `episodes` is given) in the same episode. Returns a structured array
+    of (source, target, score, lag) sorted by source time.
+    """
+    source_rows = source_rows[np.argsort(times[source_rows], kind="stable")]
+    target_rows = target_rows[np.argsort(times[target_rows], kind="stable")]
+    source_times, target_times = times[source_rows], times[target_rows]
+    source_vecs, target_vecs = vectors[source_rows], vectors[target_rows]
+
+    edges = []
+    for start in range(0, len(source_rows), block_size):
+        block_times = source_times[start:start + block_size]
+        # Targets that can answer anything in this block form one contiguous run
+        lo = np.searchsorted(target_times, block_times[0], side="right")
+        hi = np.searchsorted(target_times, block_times[-1] + window, side="right")
+        if lo >= hi:
+            continue
+
+        sims = source_vecs[start:start + block_size] @ target_vecs[lo:hi].T
+        lag = target_times[lo:hi][None, :] - block_times[:, None]
+        invalid = (lag <= 0) | (lag > window) | (sims < min_similarity)
+        if episodes is not None:
+            invalid |= episodes[source_rows[start:start + block_size]][:, None] != episodes[target_rows[lo:hi]][None, :]
+        sims[invalid] = -np.inf
+
+        kk = min(k, sims.shape[1])
+        top = np.argpartition(-sims, kk - 1, axis=1)[:, :kk]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        rows, cols = np.nonzero(np.isfinite(top_scores))
+        targets = top[rows, cols]
+        block_edges = np.empty(len(rows), dtype=EDGE_DTYPE)
+        block_edges["source"] = source_rows[start + rows]
+        block_edges["target"] = target_rows[lo + targets]
+        block_edges["score"] = top_scores[rows, cols]
+        block_edges["lag"] = lag[rows, targets]
+        edges.append(block_edges)
+
+    result = np.concatenate(edges) if edges else np.empty(0, dtype=EDGE_DTYPE)
+    return result[np.lexsort((-result["score"], times[result["source"]]))]
+
+
+def cross_speaker_edges(vectors, times, speakers, speaker_ids=("marcus", "demartini"), episodes=None,
+                        **kwargs) -> np.ndarray:
+    """Response edges in both directions between two speakers."""
+    vectors = normalize_rows(vectors.astype(np.float32))
+    a = np.flatnonzero(speakers == speaker_ids[0])
+    b = np.flatnonzero(speakers == speaker_ids[1])
+    both = np.concatenate([
+        response_edges(vectors, times, a, b, episodes=episodes, **kwargs),
+        response_edges(vectors, times, b, a, episodes=episodes, **kwargs),
+    ])
+    return both[np.lexsort((-both["score"], times[both["source"]]))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute cross-speaker response edges")
+    parser.add_argument("--window", type=float, default=WINDOW_SECONDS, help="Seconds after a chunk to search")
+    parser.add_argument("-k", type=int, default=TOP_K, help="Responses kept per chunk")
+    parser.add_argument("--min-similarity", type=float, default=MIN_SIMILARITY)
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    embeddings_path = base_dir / "data" / "processed" / "embeddings.npy"
+    chunks_path = base_dir / "data" / "processed" / "chunks.json"
+    output_path = base_dir / "data" / "processed" / "responses.json"
+
+    print(f"Loading embeddings from: {embeddings_path}")
+    embeddings = np.load(embeddings_path)
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        chunks = json.load(f)["chunks"]
+
+    ids = np.array([c["id"] for c in chunks])
+    times = np.array([c["start_time"] for c in chunks], dtype=np.float64)
+    speakers = np.array([c["speaker"] for c in chunks])
+    episodes = np.array([str(c.get("episode", DEFAULT_EPISODE)) for c in chunks])
+
+    edges = cross_speaker_edges(
+        embeddings, times, speakers, episodes=episodes,
+        window=args.window, k=args.k, min_similarity=args.min_similarity,
+    )
+
+    result = {
+        "metadata": {
+            "created_at": datetime.now().isoformat(),
+            "num_chunks": len(chunks),
+            "num_edges": len(edges),
+            "window_seconds": args.window,
+            "top_k": args.k,
+            "min_similarity": args.min_similarity,
+        },
+        # Columnar edge list: edge i is (source[i] -> target[i]); time and
+        # speaker are the source chunk's, so the flow lens needs no chunk lookup
+        "edges": {
+            "source": ids[edges["source"]].tolist(),
+            "target": ids[edges["target"]].tolist(),
+            "score": np.round(edges["score"].astype(np.float64), 4).tolist(),
+            "lag": np.round(edges["lag"], 1).tolist(),
+            "time": times[edges["source"]].tolist(),
+            "speaker": speakers[edges["source"]].tolist(),
+        },
+    }
+
+    write_json(output_path, result)
+
+    print(f"  Edges: {len(edges)} across {len(np.unique(edges['source']))} source chunks")
+    print(f"Saved responses to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
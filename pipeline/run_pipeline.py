@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware pipeline runner.
+
+Each stage declares the files it reads and writes. The runner hashes them,
+stores the hashes in _index/pipeline-state.json, and on the next run skips
+every stage whose inputs and outputs are unchanged. Stages run as a DAG:
+independent stages run concurrently (each in its own process), and a stage
+that re-runs but produces identical output does not trigger its
+dependents. A timing report shows each stage and the critical path.
+
+Every stage runs under instrumentation.py, which records wall time, CPU
+time, peak RSS and bytes read/written for the stage and its sub-steps
+(--profile adds cProfile stats, --tracemalloc peak allocations). Each run
+that does work is appended to run_history in the state file.
+
+Editing data/processed/claims.json, for example, re-runs only wiki,
+search indexing, the link graph, dialogue, claim clustering and packaging.
+
+inprocess.py runs parse through clustering in a single process instead
+(no JSON round-trips between stages) and records those stages here.
+
+Usage:
+    python pipeline/run_pipeline.py              # run whatever is stale
+    python pipeline/run_pipeline.py --dry-run    # show what would run
+    python pipeline/run_pipeline.py wiki --force # force one stage
+    python pipeline/run_pipeline.py --mark-current  # adopt existing outputs
+"""
+
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from serialization import dumps, read_json, write_json
+from instrumentation import format_step_table, table_header
+
+PROJECT_DIR = Path(__file__).parent.parent
+PIPELINE_DIR = PROJECT_DIR / "pipeline"
+STATE_PATH = PROJECT_DIR / "_index" / "pipeline-state.json"
+
+PROFILE_DIR = PROJECT_DIR / ".cache" / "profiles"
+
+HASH_CHUNK_BYTES = 1 << 20
+RUN_HISTORY_LIMIT = 50
+
+# Paths are relative to the project root. Directories are hashed as a whole.
+# Dependencies come from matching outputs to inputs; `after` adds ordering
+# for stages that write the same untracked file.
+# claims/ontology/flow are produced by the LLM analysis passes and are
+# treated as source inputs here.
+STAGES = [
+    {
+        "name": "parse",
+        "script": "parse_transcript.py",
+        "inputs": [".claude/merged-transcript.txt"],
+        "outputs": ["data/processed/transcript_diarized.json"],
+        "status": "transcript_parsed",
+    },
+    {
+        "name": "chunks",
+        "script": "create_chunks.py",
+        "inputs": ["data/processed/transcript_diarized.json"],
+        "outputs": ["data/processed/chunks.json"],
+        "status": "chunks_generated",
+    },
+    {
+        "name": "chunks_v2",
+        "script": "create_chunks_v2.py",
+        "inputs": ["data/processed/transcript_diarized.json"],
+        "outputs": ["data/processed/chunks_v2.json"],
+    },
+    {
+        "name": "embeddings",
+        "script": "generate_embeddings.py",
+        "inputs": ["data/processed/chunks.json"],
+        "outputs": ["data/processed/embeddings.npy", "data/processed/embeddings_meta.json"],
+        "status": "embeddings_computed",
+    },
+    {
+        "name": "landscape",
+        "script": "project_umap.py",
+        "inputs": ["data/processed/embeddings.npy", "data/processed/chunks.json"],
+        "outputs": ["data/processed/landscape.json"],
+        "status": "umap_projected",
+    },
+    {
+        "name": "responses",
+        "script": "response_edges.py",
+        "inputs": ["data/processed/embeddings.npy", "data/processed/chunks.json"],
+        "outputs": ["data/processed/responses.json"],
+    },
+    {
+        "name": "wiki",
+        "script": "generate_wiki.py",
+        "inputs": ["data/processed/claims.json", "data/processed/ontology.json", "data/processed/flow.json",
+                   ".opal/templates"],
+        "outputs": ["wiki/index.json"],
+        "status": "wiki_generated",
+    },
+    {
+        "name": "search",
+        "script": "search_index.py",
+        "inputs": ["wiki", "data/processed/claims.json", "data/processed/chunks.json"],
+        "outputs": ["data/processed/search/search_index.json"],
+        # wiki/ pages are not declared outputs of the wiki stage (only its index is)
+        "after": ["wiki"],
+        "status": "search_indexed",
+        "status_group": "opal_enrichment",
+    },
+    {
+        "name": "links",
+        "script": "link_graph.py",
+        "inputs": ["wiki"],
+        "outputs": ["data/processed/links/link_graph.json"],
+        "after": ["wiki"],
+    },
+    {
+        "name": "dialogue",
+        "script": "generate_dialogue.py",
+        "inputs": ["data/processed/claims.json", "data/processed/ontology.json", "data/processed/flow.json"],
+        "outputs": ["data/processed/dialogue.json"],
+        "status": "generative_dialogue_created",
+    },
+    {
+        "name": "clustering",
+        "script": "cluster_by_claims.py",
+        "inputs": ["data/processed/chunks_v2.json", "data/processed/claims.json"],
+        "outputs": ["data/processed/landscape_v2.json"],
+        # Both projections also write frontend/public/data/landscape.json
+        "after": ["landscape"],
+    },
+    {
+        "name": "package",
+        "script": "package_bundle.py",
+        "inputs": [
+            "data/processed/transcript_diarized.json",
+            "data/processed/chunks.json",
+            "data/processed/embeddings_meta.json",
+            "data/processed/landscape.json",
+            "data/processed/claims.json",
+            "data/processed/ontology.json",
+            "data/processed/flow.json",
+            "data/processed/responses.json",
+            "data/processed/dialogue.json",
+            "data/processed/landscape_v2.json",
+            "data/processed/search",
+            "data/processed/links",
+            "wiki/index.json",
+        ],
+        "outputs": ["frontend/public/data/manifest.json"],
+        "status": "bundles_packaged",
+    },
+]
+
+
+def file_hash(path: Path, cache: dict) -> str | None:
+    """SHA-256 of a file (None if missing), reusing the cached hash when size and mtime match."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    key = str(path.relative_to(PROJECT_DIR))
+    cached = cache.get(key)
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        return cached["hash"]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    cache[key] = {"hash": digest.hexdigest(), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return cache[key]["hash"]
+
+
+def path_hash(rel: str, cache: dict) -> str | None:
+    """Hash of a file, or of every file under a directory (names and contents)."""
+    path = PROJECT_DIR / rel
+    if not path.is_dir():
+        return file_hash(path, cache)
+    digest = hashlib.sha256()
+    for child in sorted(p for p in path.rglob("*") if p.is_file()):
+        digest.update(str(child.relative_to(path)).encode())
+        digest.update((file_hash(child, cache) or "").encode())
+    return digest.hexdigest()
+
+
+def hash_paths(paths: list, cache: dict) -> dict:
+    return {rel: path_hash(rel, cache) for rel in paths}
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    try:
+        return read_json(path)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: dict, path: Path = STATE_PATH):
+    state["last_updated"] = datetime.now().date().isoformat()
+    write_json(path, state, pretty=True)
+
+
+def stale_reason(record: dict | None, inputs: dict, outputs: dict) -> str | None:
+    """Why a stage must run, or None if it is up to date."""
+    if record is None:
+        return "never run"
+    changed = [p for p, h in inputs.items() if record.get("inputs", {}).get(p) != h]
+    if changed:
+        return "input changed: " + ", ".join(changed)
+    missing = [p for p, h in outputs.items() if h is None]
+    if missing:
+        return "output missing: " + ", ".join(missing)
+    changed = [p for p, h in outputs.items() if record.get("outputs", {}).get(p) != h]
+    if changed:
+        return "output modified: " + ", ".join(changed)
+    return None
+
+
+def run_stage(stage: dict, extra_args: list = (), profile: bool = False,
+              trace_memory: bool = False) -> tuple[int, str, float, list]:
+    """Run one stage script in its own instrumented process.
+
+    Returns (exit code, output, wall seconds, step metrics).
+    """
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_path = Path(tmp) / "metrics.json"
+        command = [sys.executable, str(PIPELINE_DIR / "instrumentation.py"), "--metrics", str(metrics_path)]
+        if profile:
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            command += ["--profile", str(PROFILE_DIR / f"{stage['name']}.prof")]
+        if trace_memory:
+            command.append("--tracemalloc")
+        proc = subprocess.run(
+            [*command, str(PIPELINE_DIR / stage["script"]), *extra_args],
+            cwd=PROJECT_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+        try:
+            steps = read_json(metrics_path)["steps"]
+        except (OSError, ValueError, KeyError):
+            steps = []
+    return proc.returncode, proc.stdout, time.perf_counter() - start, steps
+
+
+def stage_dependencies(stages: list) -> dict:
+    """{stage: upstream stages} from declared inputs/outputs plus explicit `after` ordering."""
+    producers = {out: s["name"] for s in stages for out in s["outputs"]}
+    names = {s["name"] for s in stages}
+    return {
+        s["name"]: (
+            {producers[i] for i in s["inputs"] if i in producers}
+            | {a for a in s.get("after", []) if a in names}
+        ) - {s["name"]}
+        for s in stages
+    }
+
+
+def critical_path(timings: dict, deps: dict) -> tuple[list, float]:
+    """Longest chain of stage durations through the DAG; returns (stages, seconds)."""
+    finish, previous = {}, {}
+    for name in timings:  # timings is in completion order, so upstream comes first
+        upstream = max(deps[name], key=lambda d: finish.get(d, 0.0), default=None)
+        base = finish.get(upstream, 0.0) if upstream else 0.0
+        finish[name] = base + timings[name]["seconds"]
+        previous[name] = upstream
+    if not finish:
+        return [], 0.0
+    node = max(finish, key=finish.get)
+    total = finish[node]
+    path = []
+    while node:
+        path.append(node)
+        node = previous[node]
+    return path[::-1], total
+
+
+def print_timing_report(timings: dict, deps: dict, wall: float):
+    """Per-stage start/end offsets and the critical path."""
+    ran = {n: t for n, t in timings.items() if t["ran"]}
+    if not ran:
+        return
+    print("\nTiming:")
+    print(f"  {'stage':<14}{'start':>8}{'end':>8}{'seconds':>9}")
+    for name, t in sorted(ran.items(), key=lambda item: item[1]["start"]):
+        print(f"  {name:<14}{t['start']:>8.1f}{t['end']:>8.1f}{t['seconds']:>9.1f}")
+    path, length = critical_path(timings, deps)
+    serial = sum(t["seconds"] for t in ran.values())
+    print(f"  Critical path: {' -> '.join(n for n in path if timings[n]['ran'])} ({length:.1f}s)")
+    print(f"  Serial total {serial:.1f}s, wall {wall:.1f}s ({serial / max(wall, 1e-9):.1f}x parallel speedup)")
+
+    steps = [s for t in ran.values() for s in t.get("steps", [])]
+    if steps:
+        traced = any("peak_traced_bytes" in s for s in steps)
+        print("\nResources (per stage and step):")
+        print(table_header(traced=traced))
+        for row in format_step_table(steps):
+            print(row)
+
+
+def history_entry(started_at: str, wall: float, timings: dict, failed: list) -> dict:
+    """One run_history record: what ran, how long, and its top-level stage metrics."""
+    stages = {}
+    for name, t in timings.items():
+        if not t["ran"]:
+            continue
+        root = t["steps"][0] if t.get("steps") else {}
+        stages[name] = {
+            "seconds": round(t["seconds"], 3),
+            **{k: root[k] for k in ("cpu_seconds", "peak_rss_bytes", "bytes_read", "bytes_written",
+                                    "peak_traced_bytes") if k in root},
+            "steps": {s["name"]: s["wall_seconds"] for s in root.get("children", [])},
+        }
+    return {
+        "started_at": started_at,
+        "wall_seconds": round(wall, 3),
+        "stages": stages,
+        "failed": failed,
+    }
+
+
+def record_stage(state: dict, stage: dict, cache: dict, seconds: float | None):
+    """Store a stage's current input/output hashes as its up-to-date state."""
+    state.setdefault("stages", {})[stage["name"]] = {
+        "inputs": hash_paths(stage["inputs"], cache),
+        "outputs": hash_paths(stage["outputs"], cache),
+        "completed_at": datetime.now().isoformat(),
+        "seconds": None if seconds is None else round(seconds, 3),
+    }
+    if stage.get("status"):
+        state.setdefault(stage.get("status_group", "pipeline_status"), {})[stage["status"]] = True
+
+
+def select_stages(names: list) -> list:
+    known = {s["name"] for s in STAGES}
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(sorted(known))})")
+    return [s for s in STAGES if not names or s["name"] in names]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pipeline, skipping stages whose inputs are unchanged")
+    parser.add_argument("stages", nargs="*", help="Only consider these stages (default: all)")
+    parser.add_argument("--force", action="store_true", help="Run the selected stages even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would run without running it")
+    parser.add_argument("--mark-current", action="store_true",
+                        help="Record existing outputs as up to date without running anything")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Stages run concurrently (default: one per CPU)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"cProfile each stage that runs (stats in {PROFILE_DIR.relative_to(PROJECT_DIR)}/)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Record peak Python allocations per step")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    started_at = datetime.now().isoformat()
+    state = load_state()
+    original = dumps(state)
+    cache = state.setdefault("hash_cache", {})
+    records = state.setdefault("stages", {})
+    stages = {s["name"]: s for s in select_stages(args.stages)}
+    deps = stage_dependencies(list(stages.values()))
+
+    if args.mark_current:
+        for name, stage in stages.items():
+            if all(h is not None for h in hash_paths(stage["outputs"], cache).values()):
+                record_stage(state, stage, cache, None)
+                print(f"  = {name}: marked current")
+            else:
+                print(f"  ✗ {name}: outputs missing, not marked")
+        save_state(state)
+        return
+
+    pending = dict(stages)
+    done, ran, skipped, failed = set(), [], [], []
+    timings = {}
+
+    def elapsed():
+        return time.perf_counter() - start
+
+    def finish(name, ran_stage, stage_start=None):
+        now = elapsed()
+        began = now if stage_start is None else stage_start
+        timings[name] = {"start": began, "end": now, "seconds": now - began, "ran": ran_stage}
+        done.add(name)
+
+    def decide(name):
+        """Reason to run a ready stage, or None to skip it (printing why)."""
+        stage = stages[name]
+        inputs = hash_paths(stage["inputs"], cache)
+        outputs = hash_paths(stage["outputs"], cache)
+        if args.dry_run and deps[name] & set(ran):
+            return "upstream will run: " + ", ".join(sorted(deps[name] & set(ran)))
+        reason = "forced" if args.force else stale_reason(records.get(name), inputs, outputs)
+        if reason is None:
+            print(f"  = {name}: up to date")
+            return None
+        missing = [p for p, h in inputs.items() if h is None]
+        if missing:
+            if all(h is not None for h in outputs.values()):
+                # e.g. the raw transcript is not checked in; keep the committed outputs
+                print(f"  ! {name}: missing input(s) {', '.join(missing)}; keeping existing outputs")
+                return None
+            print(f"  ✗ {name}: cannot run, missing input(s): {', '.join(missing)}")
+            failed.append(name)
+            return None
+        return reason
+
+    # Independent stages run side by side; each stage is its own process
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+        running = {}
+        while pending or running:
+            progressed = True
+            while progressed and not failed:
+                progressed = False
+                for name in [n for n in pending if deps[n] <= done]:
+                    del pending[name]
+                    progressed = True
+                    reason = decide(name)
+                    if reason is None:
+                        skipped.append(name)
+                        finish(name, False)
+                    elif args.dry_run:
+                        print(f"  ▶ {name}: {reason}")
+                        ran.append(name)
+                        finish(name, False)
+                    else:
+                        print(f"  ▶ {name}: {reason}")
+                        future = pool.submit(run_stage, stages[name], (), args.profile, args.tracemalloc)
+                        running[future] = (name, elapsed())
+            if failed:
+                pending.clear()
+            if not running:
+                if pending:  # only reachable when upstream stages were deselected
+                    raise SystemExit(f"Unresolvable dependencies for: {', '.join(pending)}")
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, stage_start = running.pop(future)
+                returncode, output, seconds, steps = future.result()
+                finish(name, True, stage_start)
+                timings[name]["steps"] = steps
+                print(f"\n----- {name} -----\n{output.rstrip()}\n")
+                if returncode != 0:
+                    print(f"  ✗ {name} failed (exit {returncode})")
+                    failed.append(name)
+                    continue
+                record_stage(state, stages[name], cache, seconds)
+                save_state(state)
+                ran.append(name)
+                print(f"  ✓ {name} ({seconds:.1f}s)")
+
+    if not args.dry_run and any(t["ran"] for t in timings.values()):
+        history = state.setdefault("run_history", [])
+        history.append(history_entry(started_at, elapsed(), timings, failed))
+        del history[:-RUN_HISTORY_LIMIT]
+
+    # A no-op run leaves the state file untouched
+    if not args.dry_run and dumps(state) != original:
+        save_state(state)
+    if not args.dry_run:
+        print_timing_report(timings, deps, elapsed())
+    verb = "Would run" if args.dry_run else "Ran"
+    print(f"\n{verb} {len(ran)} stage(s), {len(skipped)} up to date ({elapsed():.2f}s)")
+    if failed:
+        raise SystemExit(f"Failed: {', '.join(failed)}; completed stages were recorded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Semantic search over transcript chunks.
+
+Embeds a natural-language query with the same model used for the chunks
+(nomic-embed-text via Ollama) and ranks chunks by cosine similarity against
+an in-memory, pre-normalized copy of embeddings.npy. Query embeddings and
+results are cached so repeated queries cost a dictionary lookup.
+
+Usage:
+    python pipeline/search_chunks.py "where do they discuss forgiveness?" -k 5
+    python pipeline/search_chunks.py -i          # interactive, index stays loaded
+"""
+
+import argparse
+import json
+import re
+import time
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+
+from generate_embeddings import get_embedding
+
+BASE_DIR = Path(__file__).parent.parent
+EMBEDDINGS_PATH = BASE_DIR / "data" / "processed" / "embeddings.npy"
+CHUNKS_PATH = BASE_DIR / "data" / "processed" / "chunks.json"
+
+SNIPPET_CHARS = 240
+
+
+def make_snippet(text: str, query: str, width: int = SNIPPET_CHARS) -> str:
+    """Cut a window of text around the first query term it contains."""
+    if len(text) <= width:
+        return text
+    terms = [t for t in re.findall(r"\w+", query.lower()) if len(t) > 3]
+    lowered = text.lower()
+    hits = [lowered.find(t) for t in terms if t in lowered]
+    start = max(0, min(hits) - width // 3) if hits else 0
+    end = min(len(text), start + width)
+    snippet = text[start:end].strip()
+    return ("..." if start > 0 else "") + snippet + ("..." if end < len(text) else "")
+
+
+class ChunkIndex:
+    """In-memory cosine index over chunk embeddings with an LRU result cache."""
+
+    def __init__(self, embeddings: np.ndarray, chunks: list, embed_fn=get_embedding, cache_size: int = 256):
+        if len(embeddings) != len(chunks):
+            raise ValueError(f"{len(embeddings)} embeddings for {len(chunks)} chunks")
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0  # zero-vector fallbacks simply score 0
+        self.matrix = np.ascontiguousarray(embeddings / norms, dtype=np.float32)
+        self.chunks = chunks
+        self.embed_fn = embed_fn
+        self.cache_size = cache_size
+        self._query_vectors = OrderedDict()
+        self._results = OrderedDict()
+
+    @classmethod
+    def load(cls, embeddings_path: Path = EMBEDDINGS_PATH, chunks_path: Path = CHUNKS_PATH, **kwargs):
+        """Load embeddings.npy and the matching chunks file."""
+        embeddings = np.load(embeddings_path)
+        with open(chunks_path, "r", encoding="utf-8") as f:
+            chunks = json.load(f)["chunks"]
+        return cls(embeddings, chunks, **kwargs)
+
+    def _remember(self, cache: OrderedDict, key, value):
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed and normalize a query, reusing cached vectors."""
+        if query in self._query_vectors:
+            self._query_vectors.move_to_end(query)
+            return self._query_vectors[query]
+        vector = np.asarray(self.embed_fn(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        vector = vector / norm if norm > 0 else vector.copy()
+        vector.flags.writeable = False  # shared by every later hit
+        self._remember(self._query_vectors, query, vector)
+        return vector
+
+    def search_vector(self, vector: np.ndarray, k: int = 10) -> list[tuple[int, float]]:
+        """Top-k (row, score) pairs for an already-normalized query vector."""
+        scores = self.matrix @ vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def search(self, query: str, k: int = 10) -> list[dict]:
+        """Ranked chunks for a natural-language query."""
+        key = (" ".join(query.lower().split()), k)
+        if key in self._results:
+            self._results.move_to_end(key)
+            return [dict(r) for r in self._results[key]]
+
+        results = []
+        for row, score in self.search_vector(self.embed_query(key[0]), k):
+            chunk = self.chunks[row]
+            results.append({
+                "chunk_id": chunk["id"],
+                "score": round(score, 4),
+                "speaker": chunk.get("speaker", chunk.get("primary_speaker")),
+                "time": chunk["start_time"],
+                "time_label": chunk["time_label"],
+                "snippet": make_snippet(chunk["text"], query),
+            })
+        # Cached as a tuple of copies so callers can't alter later hits
+        self._remember(self._results, key, tuple(dict(r) for r in results))
+        return results
+
+
+def print_results(query: str, results: list, elapsed: float):
+    print(f"\n\"{query}\" ({len(results)} results, {elapsed * 1000:.1f} ms)")
+    for rank, r in enumerate(results, 1):
+        print(f"  {rank:>2}. [{r['time_label']:>7}] {r['speaker']:<10} {r['score']:.3f}  {r['snippet']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic search over transcript chunks")
+    parser.add_argument("query", nargs="?", help="Natural-language query")
+    parser.add_argument("-k", type=int, default=5, help="Number of results")
+    parser.add_argument("-i", "--interactive", action="store_true", help="Keep the index loaded and read queries from stdin")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if not args.query and not args.interactive:
+        parser.error("provide a query or use --interactive")
+
+    index = ChunkIndex.load()
+
+    def run(query: str):
+        start = time.perf_counter()
+        results = index.search(query, k=args.k)
+        elapsed = time.perf_counter() - start
+        if args.json:
+            print(json.dumps({"query": query, "results": results}, ensure_ascii=False))
+        else:
+            print_results(query, results, elapsed)
+
+    if args.query:
+        run(args.query)
+    if args.interactive:
+        print(f"Index loaded: {len(index.chunks)} chunks. Empty line to quit.")
+        while True:
+            try:
+                query = input("\nquery> ").strip()
+            except EOFError:
+                break
+            if not query:
+                break
+            run(query)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Build-time full-text search index over the wiki, claims and transcript chunks.
+
+search_chunks.py needs Ollama and the embedding matrix at query time; this
+index needs neither. Every claim, chunk and wiki page becomes a document
+(except wiki/claims/, which renders the claims again), and the terms go into a BM25 inverted index that the frontend can query
+client-side, loading only the shards holding the query's terms:
+
+- search_index.json   tokenizer settings, BM25 parameters, the document
+                      table ([kind, ref, title, length] per document) and
+                      the shard directory
+- search.<prefix>.bin one shard per term prefix (the first PREFIX_LENGTH
+                      characters of the term)
+
+Shards are a stream of unsigned LEB128 varints:
+
+    n_terms
+    per term (sorted): term byte length, UTF-8 term, document frequency,
+                       postings byte length, postings
+
+and postings are (document ID gap, term frequency) pairs in ascending
+document order, so common terms cost one or two bytes per posting.
+
+SearchIndex is the Python query API over the same files.
+
+Usage:
+    python pipeline/search_index.py                  # build data/processed/search/
+    python pipeline/search_index.py --query "gratitude and pain" -k 5
+"""
+
+import argparse
+import heapq
+import math
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from serialization import read_json, write_if_changed, write_json
+
+PROJECT_DIR = Path(__file__).parent.parent
+DATA_DIR = PROJECT_DIR / "data" / "processed"
+WIKI_DIR = PROJECT_DIR / "wiki"
+SEARCH_DIR = DATA_DIR / "search"
+
+INDEX_FILE = "search_index.json"
+PREFIX_LENGTH = 1
+
+K1 = 1.2
+B = 0.75
+
+DOC_KINDS = ["wiki", "claim", "chunk"]
+WIKI_SKIP = ("claims",)  # rendered from claims.json, already indexed as claim documents
+TOKEN_PATTERN = r"[a-z0-9]+"
+TOKEN_RE = re.compile(TOKEN_PATTERN)
+MIN_TOKEN_LENGTH = 2
+STOPWORDS = frozenset((
+    "a an and are as at be but by do for from had has have he her his i if in into is it its me my "
+    "no not of on or our she so than that the their them then there these they this to too was we "
+    "were what when which who will with you your"
+).split())
+
+FRONTMATTER_RE = re.compile(r"\A---\n.*?\n---\n", re.DOTALL)
+COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+
+
+def tokenize(text: str) -> list:
+    """Lowercased alphanumeric terms, minus stopwords and single characters."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) >= MIN_TOKEN_LENGTH and t not in STOPWORDS]
+
+
+def wiki_documents(wiki_dir: Path = WIKI_DIR, skip: tuple = WIKI_SKIP):
+    """(ref, title, text) per wiki page; ref is the page path without .md."""
+    for path in sorted(wiki_dir.glob("*/*.md")):
+        if path.parent.name in skip:
+            continue
+        text = COMMENT_RE.sub("", FRONTMATTER_RE.sub("", path.read_text(encoding="utf-8")))
+        title = next((line[2:] for line in text.splitlines() if line.startswith("# ")), path.stem)
+        yield f"{path.parent.name}/{path.stem}", title, text
+
+
+def claim_documents(claims: list):
+    for claim in claims:
+        text = " ".join([claim["text"], *claim.get("warrants", []), *claim.get("evidence", [])])
+        yield claim["id"], f"{claim['id']}: {claim['speaker'].title()}", text
+
+
+def chunk_documents(chunks: list):
+    for chunk in chunks:
+        speaker = chunk.get("speaker", chunk.get("primary_speaker", ""))
+        yield str(chunk["id"]), f"{chunk['time_label']} {speaker.title()}", chunk["text"]
+
+
+def encode_varints(values, out: bytearray):
+    """Append unsigned LEB128 encodings of values to out."""
+    for v in values:
+        while v >= 0x80:
+            out.append((v & 0x7F) | 0x80)
+            v >>= 7
+        out.append(v)
+
+
+def decode_varints(data, pos: int = 0, count: int | None = None) -> tuple[list, int]:
+    """Decode `count` varints (all if None) starting at pos; returns (values, end position)."""
+    values = []
+    end = len(data)
+    while pos < end and (count is None or len(values) < count):
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append(value)
+    return values, pos
+
+
+def build_index(sources: dict) -> tuple[list, dict]:
+    """
+    Invert {kind: iterable of (ref, title, text)}.
+
+    Returns (docs, postings): docs[i] = [kind code, ref, title, length] and
+    postings[term] = [(doc id, term frequency), ...] in doc id order.
+    """
+    docs = []
+    postings = {}
+    for kind, documents in sources.items():
+        code = DOC_KINDS.index(kind)
+        for ref, title, text in documents:
+            doc_id = len(docs)
+            terms = tokenize(text)
+            docs.append([code, ref, title, len(terms)])
+            for term, tf in Counter(terms).items():
+                postings.setdefault(term, []).append((doc_id, tf))
+    return docs, postings
+
+
+def encode_shard(terms: list, postings: dict) -> bytes:
+    """One shard file for the given (sorted) terms."""
+    out = bytearray()
+    encode_varints((len(terms),), out)
+    for term in terms:
+        encoded = term.encode("utf-8")
+        plist = bytearray()
+        previous = 0
+        for doc_id, tf in postings[term]:
+            encode_varints((doc_id - previous, tf), plist)
+            previous = doc_id
+        encode_varints((len(encoded),), out)
+        out += encoded
+        encode_varints((len(postings[term]), len(plist)), out)
+        out += plist
+    return bytes(out)
+
+
+def shard_file(prefix: str) -> str:
+    return f"search.{prefix}.bin"
+
+
+def write_index(docs: list, postings: dict, out_dir: Path, prefix_length: int = PREFIX_LENGTH) -> dict:
+    """Write the shards and search_index.json; returns the index document."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    by_prefix = {}
+    for term in sorted(postings):
+        by_prefix.setdefault(term[:prefix_length], []).append(term)
+
+    shards = {}
+    for prefix, terms in by_prefix.items():
+        data = encode_shard(terms, postings)
+        write_if_changed(out_dir / shard_file(prefix), data)
+        shards[prefix] = {"file": shard_file(prefix), "terms": len(terms), "bytes": len(data)}
+    for stale in out_dir.glob(shard_file("*")):
+        if stale.name not in {s["file"] for s in shards.values()}:
+            stale.unlink()
+
+    total_length = sum(doc[3] for doc in docs)
+    index = {
+        "metadata": {
+            "version": "1.0",
+            "created_at": datetime.now().isoformat(),
+            "num_docs": len(docs),
+            "num_terms": len(postings),
+            "num_postings": sum(len(p) for p in postings.values()),
+        },
+        "tokenizer": {
+            "pattern": TOKEN_PATTERN,
+            "lowercase": True,
+            "min_length": MIN_TOKEN_LENGTH,
+            "stopwords": sorted(STOPWORDS),
+        },
+        "bm25": {"k1": K1, "b": B, "avg_length": total_length / max(len(docs), 1)},
+        "kinds": DOC_KINDS,
+        # docs[i] = [kind code, ref, title, length in terms]
+        "docs": docs,
+        "prefix_length": prefix_length,
+        "shards": shards,
+    }
+    # Keep the file (and its packaged copy) when only the timestamp would change
+    path = out_dir / INDEX_FILE
+    if path.exists():
+        previous = read_json(path)
+        if {**previous, "metadata": {**previous["metadata"], "created_at": index["metadata"]["created_at"]}} == index:
+            return previous
+    write_json(path, index)
+    return index
+
+
+class SearchIndex:
+    """BM25 queries over a built index; shards are read on first use and kept."""
+
+    def __init__(self, index_dir: Path = SEARCH_DIR):
+        self.index_dir = Path(index_dir)
+        self.index = read_json(self.index_dir / INDEX_FILE)
+        self.docs = self.index["docs"]
+        self.kinds = self.index["kinds"]
+        self.prefix_length = self.index["prefix_length"]
+        self._terms = {}  # prefix -> {term: (df, postings bytes)}
+
+    def _shard(self, prefix: str) -> dict:
+        if prefix not in self._terms:
+            entry = self.index["shards"].get(prefix)
+            self._terms[prefix] = self._read_shard(self.index_dir / entry["file"]) if entry else {}
+        return self._terms[prefix]
+
+    @staticmethod
+    def _read_shard(path: Path) -> dict:
+        data = path.read_bytes()
+        (n_terms,), pos = decode_varints(data, 0, 1)
+        terms = {}
+        for _ in range(n_terms):
+            (length,), pos = decode_varints(data, pos, 1)
+            term = data[pos:pos + length].decode("utf-8")
+            (df, size), pos = decode_varints(data, pos + length, 2)
+            terms[term] = (df, data[pos:pos + size])
+            pos += size
+        return terms
+
+    def postings(self, term: str) -> list:
+        """[(doc id, term frequency), ...] for one term."""
+        df, data = self._shard(term[:self.prefix_length]).get(term, (0, b""))
+        values, _ = decode_varints(data)
+        result = []
+        doc_id = 0
+        for gap, tf in zip(values[::2], values[1::2]):
+            doc_id += gap
+            result.append((doc_id, tf))
+        return result
+
+    def search(self, query: str, k: int = 10, kinds: list | None = None) -> list:
+        """Top-k documents by BM25 score; `kinds` restricts to e.g. ["claim", "chunk"]."""
+        bm25 = self.index["bm25"]
+        n_docs = len(self.docs)
+        allowed = None if kinds is None else {self.kinds.index(kind) for kind in kinds}
+        scores = {}
+        for term in set(tokenize(query)):
+            plist = self.postings(term)
+            if not plist:
+                continue
+            idf = math.log(1 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            for doc_id, tf in plist:
+                doc = self.docs[doc_id]
+                if allowed is not None and doc[0] not in allowed:
+                    continue
+                norm = bm25["k1"] * (1 - bm25["b"] + bm25["b"] * doc[3] / bm25["avg_length"])
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (bm25["k1"] + 1) / (tf + norm)
+
+        return [
+            {"kind": self.kinds[self.docs[d][0]], "ref": self.docs[d][1], "title": self.docs[d][2],
+             "score": round(score, 4)}
+            for d, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the full-text search index")
+    parser.add_argument("--output", type=Path, default=SEARCH_DIR, help="Index directory")
+    parser.add_argument("--prefix-length", type=int, default=PREFIX_LENGTH, help="Term prefix characters per shard")
+    parser.add_argument("--query", help="Query the existing index instead of building it")
+    parser.add_argument("-k", type=int, default=10, help="Results for --query")
+    args = parser.parse_args()
+
+    if args.query:
+        index = SearchIndex(args.output)
+        start = time.perf_counter()
+        results = index.search(args.query, args.k)
+        print(f"\"{args.query}\" ({len(results)} results, {(time.perf_counter() - start) * 1000:.1f} ms)")
+        for rank, r in enumerate(results, 1):
+            print(f"  {rank:>2}. {r['score']:>7.3f}  {r['kind']:<6} {r['ref']:<32} {r['title']}")
+        return
+
+    print("Building search index...")
+    sources = {
+        "wiki": wiki_documents(),
+        "claim": claim_documents(read_json(DATA_DIR / "claims.json")["claims"]),
+        "chunk": chunk_documents(read_json(DATA_DIR / "chunks.json")["chunks"]),
+    }
+    docs, postings = build_index(sources)
+    index = write_index(docs, postings, args.output, args.prefix_length)
+
+    counts = Counter(index["kinds"][doc[0]] for doc in docs)
+    shard_bytes = sum(s["bytes"] for s in index["shards"].values())
+    print(f"  {len(docs):,} documents ({', '.join(f'{kind}: {counts[kind]:,}' for kind in DOC_KINDS)})")
+    print(f"  {index['metadata']['num_terms']:,} terms, {index['metadata']['num_postings']:,} postings")
+    print(f"  {len(index['shards'])} shards, {shard_bytes:,} bytes; "
+          f"{INDEX_FILE} {(args.output / INDEX_FILE).stat().st_size:,} bytes")
+    print(f"  Output: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
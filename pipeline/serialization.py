@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Shared JSON serialization for pipeline outputs.
+
+Every stage writes through this module so there is one canonical encoding:
+
+- compact UTF-8 JSON by default; pretty-printed (indent=2) only in debug
+  mode, enabled with PIPELINE_JSON_PRETTY=1 or pretty=True
+- orjson when installed (several times faster, native numpy support),
+  falling back to the stdlib json module. The fallback writes the same
+  bytes: floats use orjson's formatting (0.00001, 1e-7, 1e16), float32
+  values keep their shortest float32 digits, and NaN/Infinity become null
+  (the stdlib would write NaN, which JSON.parse rejects)
+- streaming writers for large arrays (landscape points, chunks) so the
+  whole document never has to be encoded into one string
+- atomic writes (temp file + rename), so readers and hardlinked bundle
+  copies never see a half-written or rewritten-in-place file
+"""
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional fast backend
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+PRETTY_ENV = "PIPELINE_JSON_PRETTY"
+STREAM_BATCH = 512  # items encoded per write in streaming mode
+
+
+def pretty_default() -> bool:
+    """Whether debug pretty-printing is switched on via the environment."""
+    return os.environ.get(PRETTY_ENV, "").lower() in ("1", "true", "yes")
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "wb"):
+    """Open a temp file next to path and rename it over path on success."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def copy_file(src: Path, dst: Path, chunk_size: int = 1 << 20):
+    """Copy src to dst atomically (never rewrites dst's existing inode)."""
+    with open(src, "rb") as fsrc, atomic_write(dst) as fdst:
+        while block := fsrc.read(chunk_size):
+            fdst.write(block)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically write data unless path already holds the same bytes (by SHA-256); True if written."""
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and \
+                hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest():
+            return False
+    except FileNotFoundError:
+        pass
+    with atomic_write(path) as f:
+        f.write(data)
+    return True
+
+
+class _Float32(float):
+    """A float32 value carried through the stdlib encoder (formatted with orjson's float32 rules)."""
+
+
+def _to_builtin(value):
+    """Stdlib fallback for numpy scalars/arrays (orjson handles these natively)."""
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None and dtype.kind == "f" and dtype.itemsize < 8:
+        # float32 (and float16) by their own shortest digits: 0.1, not 0.10000000149011612
+        if getattr(value, "ndim", 0):
+            return [_to_builtin(v) for v in value]
+        return _Float32(str(value))
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _float_repr(value: float) -> str:
+    """
+    A float as orjson writes it (the ryu crate's format): shortest
+    round-trip digits, positional from 0.00001 (float32: 0.000001) up to
+    16 integer digits (float32: 13), exponent form otherwise (1e-7,
+    1.5e16), and null for NaN and infinities.
+    """
+    if value != value or value in (float("inf"), float("-inf")):
+        return "null"
+    if value == 0:
+        return float.__repr__(value)
+    sign, digits, exponent = Decimal(float.__repr__(value)).normalize().as_tuple()
+    digits = "".join(map(str, digits))
+    sign = "-" if sign else ""
+    point = len(digits) + exponent  # position of the decimal point relative to the digits
+    lowest, limit = (-5, 13) if isinstance(value, _Float32) else (-4, 16)
+    if 0 <= exponent and point <= limit:
+        return f"{sign}{digits}{'0' * exponent}.0"
+    if 0 < point <= limit:
+        return f"{sign}{digits[:point]}.{digits[point:]}"
+    if lowest <= point <= 0:
+        return f"{sign}0.{'0' * -point}{digits}"
+    mantissa = digits if len(digits) == 1 else f"{digits[0]}.{digits[1:]}"
+    return f"{sign}{mantissa}e{point - 1}"
+
+
+class _Encoder(json.JSONEncoder):
+    """Stdlib encoder with orjson's float formatting."""
+
+    def iterencode(self, o, _one_shot=False):
+        indent = " " * self.indent if isinstance(self.indent, int) else self.indent
+        return json.encoder._make_iterencode(
+            {} if self.check_circular else None, self.default, json.encoder.encode_basestring, indent,
+            _float_repr, self.key_separator, self.item_separator, self.sort_keys, self.skipkeys, _one_shot,
+        )(o, 0)
+
+
+def dumps(obj, pretty: bool | None = None) -> bytes:
+    """Encode obj as UTF-8 JSON bytes (compact unless pretty)."""
+    pretty = pretty_default() if pretty is None else pretty
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_to_builtin, option=option)
+    if pretty:
+        encoder = _Encoder(indent=2, ensure_ascii=False, allow_nan=False, default=_to_builtin)
+    else:
+        encoder = _Encoder(separators=(",", ":"), ensure_ascii=False, allow_nan=False, default=_to_builtin)
+    return encoder.encode(obj).encode("utf-8")
+
+
+def loads(data):
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Path):
+    """Load a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_json(path: Path, obj, pretty: bool | None = None) -> int:
+    """Write obj to path in the canonical encoding; returns bytes written."""
+    data = dumps(obj, pretty)
+    with atomic_write(path) as f:
+        f.write(data)
+    return len(data)
+
+
+def _batches(items, size: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_json_stream(path: Path, obj: dict, stream_key: str, items, pretty: bool | None = None,
+                      batch_size: int = STREAM_BATCH) -> int:
+    """Write obj with one large array streamed item by item.
+
+    Produces the same document as write_json(path, {**obj, stream_key: list(items)})
+    (keys of obj first, the streamed array last) while only ever holding one
+    batch of encoded items in memory. `items` may be any iterable, including
+    a generator.
+    """
+    pretty = pretty_default() if pretty is None else pretty
+    head = {k: v for k, v in obj.items() if k != stream_key}
+    written = 0
+    with atomic_write(path) as f:
+        def emit(data: bytes):
+            nonlocal written
+            f.write(data)
+            written += len(data)
+
+        if pretty:
+            head_text = dumps(head, pretty=True)[:-2] if head else b"{"
+            emit(head_text + (b",\n" if head else b"\n") + b'  ' + dumps(stream_key) + b": [")
+            first = True
+            for item in items:
+                encoded = dumps(item, pretty=True).replace(b"\n", b"\n    ")
+                emit((b"\n    " if first else b",\n    ") + encoded)
+                first = False
+            emit(b"]\n}" if first else b"\n  ]\n}")
+        else:
+            head_text = dumps(head, pretty=False)[:-1]
+            emit(head_text + (b"," if head else b"") + dumps(stream_key) + b":[")
+            first = True
+            for batch in _batches(items, batch_size):
+                # Encode a batch as one array and drop its brackets
+                emit((b"" if first else b",") + dumps(batch, pretty=False)[1:-1])
+                first = False
+            emit(b"]}")
+    return written
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Split landscape.json into a slim first-paint bundle.
+
+landscape.json stores every point as a JSON object with a text preview and
+the full chunk text, so it grows to tens of MB at corpus scale. The slim
+bundle separates what the 3D view needs to draw from what it shows on
+hover/selection:
+
+- landscape_geometry.bin  packed little-endian columns, each loadable as a
+                          typed array (Float32Array / Uint32Array / ...)
+- landscape_index.json    column layout, speaker and cluster dictionaries,
+                          clusters, centroids and trajectories
+- landscape_text.json     per-chunk text and detail fields keyed by chunk ID,
+                          fetched after first paint
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+
+from serialization import atomic_write, write_json
+
+GEOMETRY_FILE = "landscape_geometry.bin"
+INDEX_FILE = "landscape_index.json"
+TEXT_FILE = "landscape_text.json"
+
+# Column order keeps every typed-array view aligned to its element size
+COLUMNS = [
+    ("position", "<f4", 3),
+    ("time", "<f4", 1),
+    ("duration", "<f4", 1),
+    ("id", "<u4", 1),
+    ("cluster", "<i2", 1),
+    ("speaker", "<u1", 1),
+]
+
+# Point fields that move to the text store (everything not in the geometry)
+GEOMETRY_FIELDS = {"id", "x", "y", "z", "time", "duration", "speaker", "cluster_id", "text", "full_text"}
+
+
+def pack_geometry(points: list, speakers: list, cluster_codes: dict) -> tuple[bytes, list]:
+    """Pack point geometry into one buffer; returns (bytes, layout)."""
+    speaker_codes = {s: i for i, s in enumerate(speakers)}
+    columns = {
+        "position": np.array([[p["x"], p["y"], p["z"]] for p in points], dtype="<f4").reshape(-1),
+        "time": np.array([p.get("time", 0) for p in points], dtype="<f4"),
+        "duration": np.array([p.get("duration", 0) for p in points], dtype="<f4"),
+        "id": np.array([p["id"] for p in points], dtype="<u4"),
+        "cluster": np.array([cluster_codes.get(p.get("cluster_id"), -1) for p in points], dtype="<i2"),
+        "speaker": np.array([speaker_codes[p["speaker"]] for p in points], dtype="<u1"),
+    }
+
+    layout, parts, offset = [], [], 0
+    for name, dtype, width in COLUMNS:
+        data = columns[name]
+        layout.append({"name": name, "dtype": dtype, "components": width,
+                       "byte_offset": offset, "length": int(data.size)})
+        parts.append(data.tobytes())
+        offset += data.nbytes
+    return b"".join(parts), layout
+
+
+def build_text_store(points: list) -> dict:
+    """Full text plus non-geometry detail fields, keyed by chunk ID."""
+    store = {}
+    for p in points:
+        entry = {"text": p.get("full_text", p.get("text", ""))}
+        entry.update({k: v for k, v in p.items() if k not in GEOMETRY_FIELDS})
+        store[str(p["id"])] = entry
+    return store
+
+
+def split_landscape(landscape: dict) -> tuple[dict, bytes, dict]:
+    """Split a landscape dict into (index, geometry bytes, text store)."""
+    points = landscape["points"]
+    speakers = sorted({p["speaker"] for p in points})
+    clusters = landscape.get("clusters", [])
+    cluster_codes = {c["id"]: i for i, c in enumerate(clusters)}
+
+    geometry, layout = pack_geometry(points, speakers, cluster_codes)
+    index = {
+        "metadata": landscape.get("metadata", {}),
+        "count": len(points),
+        "geometry": {"file": GEOMETRY_FILE, "byte_length": len(geometry), "columns": layout},
+        "text_file": TEXT_FILE,
+        "speakers": speakers,
+        # cluster code i refers to clusters[i]; -1 = unclustered/noise
+        "clusters": clusters,
+    }
+    for key in ("claim_landmarks", "speaker_centroids", "trajectories", "trajectory_levels"):
+        if key in landscape:
+            index[key] = landscape[key]
+    return index, geometry, build_text_store(points)
+
+
+def write_slim_landscape(landscape: dict, out_dir: Path) -> dict:
+    """Write the three slim files; returns {filename: size in bytes}."""
+    index, geometry, text_store = split_landscape(landscape)
+    with atomic_write(out_dir / GEOMETRY_FILE) as f:
+        f.write(geometry)
+    write_json(out_dir / INDEX_FILE, index, pretty=False)
+    write_json(out_dir / TEXT_FILE, text_store, pretty=False)
+    return {name: (out_dir / name).stat().st_size for name in (GEOMETRY_FILE, INDEX_FILE, TEXT_FILE)}
+
+
+def main():
+    base_dir = Path(__file__).parent.parent
+    landscape_path = base_dir / "frontend" / "public" / "data" / "landscape.json"
+    out_dir = landscape_path.parent
+
+    print(f"Loading landscape from: {landscape_path}")
+    with open(landscape_path, "r", encoding="utf-8") as f:
+        landscape = json.load(f)
+
+    sizes = write_slim_landscape(landscape, out_dir)
+    original = landscape_path.stat().st_size
+    first_paint = sizes[GEOMETRY_FILE] + sizes[INDEX_FILE]
+
+    print(f"\nSlim landscape written at {datetime.now().isoformat()}")
+    for name, size in sizes.items():
+        print(f"  {name}: {size:,} bytes")
+    print(f"  First paint: {first_paint:,} bytes vs {original:,} bytes "
+          f"({original / max(first_paint, 1):.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
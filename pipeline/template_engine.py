@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Compiled Mustache-style templates for the wiki layer.
+
+Supported syntax (a Mustache subset; no HTML escaping, pages are markdown):
+
+    {{name}}               value from the context, innermost section first
+    {{.}}                  the current list item
+    {{#name}}...{{/name}}  repeat for each item of a list, or once if truthy
+    {{^name}}...{{/name}}  render when name is missing, empty or false
+    {{! comment }}         dropped (may span lines)
+
+A line holding only a section or comment tag is dropped whole, so sections
+leave no blank lines behind, and a template file's final newline is
+dropped so pages end the way they always have.
+
+Each template compiles once into a Python function (the template becomes
+straight-line appends and for-loops), cached per file and keyed on the
+file's mtime and size. Editing one template recompiles only that template.
+"""
+
+import re
+from pathlib import Path
+
+TAG_RE = re.compile(
+    r"(?P<standalone>^[ \t]*\{\{(?P<skind>[#^/!])(?P<sname>.*?)\}\}[ \t]*(?:\n|\Z))"
+    r"|\{\{(?P<kind>[#^/!]?)(?P<name>.*?)\}\}",
+    re.MULTILINE | re.DOTALL,
+)
+
+_cache = {}  # path -> ((mtime_ns, size), render function)
+
+
+class TemplateError(ValueError):
+    pass
+
+
+def tokenize(source: str, name: str = "<template>") -> list:
+    """Parse into a tree of ("text", s) / ("var", name) / ("section", name, inverted, children)."""
+    root = []
+    stack = [(None, root)]
+    pos = 0
+    for m in TAG_RE.finditer(source):
+        if m.start() > pos:
+            stack[-1][1].append(("text", source[pos:m.start()]))
+        pos = m.end()
+        kind = m.group("skind") if m.group("standalone") else m.group("kind")
+        tag = (m.group("sname") if m.group("standalone") else m.group("name")).strip()
+        line = source.count("\n", 0, m.start()) + 1
+
+        if kind == "!":
+            continue
+        if kind in ("#", "^"):
+            children = []
+            stack[-1][1].append(("section", tag, kind == "^", children))
+            stack.append((tag, children))
+        elif kind == "/":
+            if stack[-1][0] != tag:
+                raise TemplateError(f"{name}:{line}: {{{{/{tag}}}}} closes {stack[-1][0] or 'nothing'}")
+            stack.pop()
+        else:
+            if not tag:
+                raise TemplateError(f"{name}:{line}: empty tag")
+            stack[-1][1].append(("var", tag))
+    if len(stack) > 1:
+        raise TemplateError(f"{name}: unclosed section {{{{#{stack[-1][0]}}}}}")
+    if pos < len(source):
+        root.append(("text", source[pos:]))
+    return root
+
+
+def _items(value):
+    """What a {{#section}} iterates: a list's items, or the value once if truthy."""
+    if isinstance(value, (list, tuple)):
+        return value
+    return (value,) if value else ()
+
+
+def _value_expr(name: str, scopes: list) -> str:
+    """Expression resolving `name` innermost scope first; section items that aren't dicts are skipped."""
+    if name == ".":
+        return scopes[0]
+    expr = f"get({name!r}, '')"
+    for item in reversed(scopes[:-1]):
+        expr = f"({item}[{name!r}] if type({item}) is dict and {name!r} in {item} else {expr})"
+    return expr
+
+
+def _generate(nodes, scopes: list, indent: int, code: list):
+    """Append Python source for `nodes`; each run of text and variables becomes one append."""
+    pad = "    " * indent
+    run = []
+
+    def flush():
+        if not run:
+            return
+        fmt = "".join(text.replace("%", "%%") if expr is None else "%s" for text, expr in run)
+        exprs = [expr for _, expr in run if expr is not None]
+        if exprs:
+            code.append(f"{pad}emit({fmt!r} % ({', '.join(exprs)},))")
+        else:
+            code.append(f"{pad}emit({''.join(text for text, _ in run)!r})")
+        run.clear()
+
+    for node in nodes:
+        if node[0] == "text":
+            run.append((node[1], None))
+        elif node[0] == "var":
+            run.append((None, _value_expr(node[1], scopes)))
+        else:
+            flush()
+            _, name, inverted, children = node
+            if inverted:
+                code.append(f"{pad}if not {_value_expr(name, scopes)}:")
+                _generate(children, scopes, indent + 1, code)
+            else:
+                item = f"_i{len(scopes)}"
+                code.append(f"{pad}for {item} in _items({_value_expr(name, scopes)}):")
+                _generate(children, [item] + scopes, indent + 1, code)
+            if not children:
+                code.append(f"{pad}    pass")
+    flush()
+
+
+def compile_template(source: str, name: str = "<template>"):
+    """Compile template source into render(context: dict) -> str."""
+    code = ["def render(ctx):", "    out = []", "    emit = out.append", "    get = ctx.get"]
+    _generate(tokenize(source, name), ["ctx"], 1, code)
+    code.append("    return ''.join(out)")
+    namespace = {"_items": _items}
+    exec(compile("\n".join(code), f"<template {name}>", "exec"), namespace)
+    return namespace["render"]
+
+
+def load_template(path: Path):
+    """Compiled render function for a template file, recompiled only when the file changes."""
+    path = Path(path)
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    source = path.read_text(encoding="utf-8")
+    if source.endswith("\n"):
+        source = source[:-1]
+    render = compile_template(source, path.name)
+    _cache[path] = (stamp, render)
+    return render
+
+
+def render_file(path: Path, context: dict) -> str:
+    return load_template(path)(context)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Time-shard the landscape and transcript for progressive loading.
+
+A multi-episode corpus makes landscape.json and transcript_diarized.json
+too large to fetch up front. This stage splits their record arrays into
+shards by episode and fixed time window, so the frontend can load the
+window the user is looking at first and stream the rest. Each shard is a
+self-contained JSON document; the shard index (time range, record count,
+byte size per shard) goes into manifest.json.
+
+Records without an `episode` field belong to DEFAULT_EPISODE.
+"""
+
+import argparse
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+
+from serialization import read_json, write_json
+
+SHARD_SECONDS = 900  # 15-minute windows
+DEFAULT_EPISODE = "main"
+
+# Shardable documents: (record array key, record time key)
+SHARD_SOURCES = {
+    "landscape.json": ("points", "time"),
+    "transcript_diarized.json": ("segments", "start_time"),
+}
+
+
+def shard_assignments(times: np.ndarray, episodes: np.ndarray, window: float = SHARD_SECONDS) -> list:
+    """Group record indices by (episode, time window), in episode then time order."""
+    windows = (np.asarray(times, dtype=np.float64) // window).astype(np.int64)
+    order = np.lexsort((times, windows, episodes))
+    keys = np.stack([episodes[order], windows[order].astype(str)], axis=1)
+    boundaries = np.flatnonzero((keys[1:] != keys[:-1]).any(axis=1)) + 1
+    return [
+        (str(episodes[group[0]]), int(windows[group[0]]), group)
+        for group in np.split(order, boundaries)
+        if len(group)
+    ]
+
+
+def shard_name(filename: str, n: int) -> str:
+    """landscape.json -> landscape.shard-003.json"""
+    path = Path(filename)
+    return f"{path.stem}.shard-{n:03d}{path.suffix}"
+
+
+def write_shards(filename: str, doc: dict, out_dir: Path, window: float = SHARD_SECONDS) -> list:
+    """Write the shards of one document; returns the shard index entries."""
+    records_key, time_key = SHARD_SOURCES[filename]
+    records = doc[records_key]
+    times = np.array([r.get(time_key, 0) for r in records], dtype=np.float64)
+    episodes = np.array([str(r.get("episode", DEFAULT_EPISODE)) for r in records])
+
+    index = []
+    for n, (episode, window_id, rows) in enumerate(shard_assignments(times, episodes, window)):
+        name = shard_name(filename, n)
+        shard_times = times[rows]
+        entry = {
+            "file": name,
+            "episode": episode,
+            "window": window_id,
+            "start": float(shard_times.min()),
+            "end": float(shard_times.max()),
+            "count": int(len(rows)),
+        }
+        entry["bytes"] = write_json(out_dir / name, {
+            "metadata": {"source_file": filename, **entry},
+            records_key: [records[i] for i in rows],
+        })
+        index.append(entry)
+    return index
+
+
+def remove_stale_shards(filename: str, out_dir: Path, keep: int):
+    """Delete shard files beyond the current shard count."""
+    path = Path(filename)
+    for shard in out_dir.glob(f"{path.stem}.shard-*{path.suffix}"):
+        if int(shard.stem.rsplit("-", 1)[1]) >= keep:
+            shard.unlink()
+
+
+def shard_document(filename: str, src: Path, out_dir: Path, window: float = SHARD_SECONDS) -> dict:
+    """Shard one source file; returns its manifest shard index."""
+    index = write_shards(filename, read_json(src), out_dir, window)
+    remove_stale_shards(filename, out_dir, len(index))
+    return {
+        "window_seconds": window,
+        "records_key": SHARD_SOURCES[filename][0],
+        "total_bytes": sum(s["bytes"] for s in index),
+        "shards": index,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split landscape and transcript into time shards")
+    parser.add_argument("--window", type=float, default=SHARD_SECONDS, help="Shard width in seconds")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    data_dir = base_dir / "frontend" / "public" / "data"
+
+    print(f"Sharding at {args.window:.0f}s windows ({datetime.now().isoformat()})")
+    for filename in SHARD_SOURCES:
+        src = data_dir / filename
+        if not src.exists():
+            print(f"  ✗ {filename} (not found)")
+            continue
+        shard_index = shard_document(filename, src, data_dir, args.window)
+        print(f"  {filename}: {len(shard_index['shards'])} shards, {shard_index['total_bytes']:,} bytes")
+        for s in shard_index["shards"]:
+            print(f"    {s['file']}: {s['start']:.0f}-{s['end']:.0f}s, {s['count']} records, {s['bytes']:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
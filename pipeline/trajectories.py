@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Speaker trajectories through the semantic landscape.
+
+Builds each speaker's path through the 3D landscape in time order (NumPy,
+no per-point dicts), computes rolling-window semantic drift and velocity,
+and emits several simplified levels of detail so the frontend can draw
+multi-episode trajectories without shipping every vertex:
+
+- level 0: every point
+- levels 1-2: Douglas-Peucker simplification at increasing tolerance
+- level 3: time-bucket averages
+"""
+
+import argparse
+import json
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+
+from reduce_embeddings import normalize_rows
+from serialization import write_json_stream
+
+DRIFT_WINDOW = 5            # points in the trailing window for drift
+DP_TOLERANCES = (0.05, 0.15)  # in normalized [-1, 1] landscape units
+BUCKET_SECONDS = 300        # time-bucket width for the coarsest level
+MAX_VERTICES = 2000         # largest level shipped as the default path
+
+
+def speaker_paths(speakers: np.ndarray, times: np.ndarray) -> dict:
+    """Row indices per speaker, ordered by time."""
+    order = np.lexsort((times, speakers))
+    sorted_speakers = speakers[order]
+    boundaries = np.flatnonzero(sorted_speakers[1:] != sorted_speakers[:-1]) + 1
+    return {
+        str(group[0]): idx
+        for group, idx in zip(np.split(sorted_speakers, boundaries), np.split(order, boundaries))
+        if len(idx)
+    }
+
+
+def rolling_drift(vectors: np.ndarray, window: int = DRIFT_WINDOW) -> np.ndarray:
+    """Cosine distance of each vector from the mean of the previous `window` vectors.
+
+    Uses a cumulative sum so the cost is O(n * d) regardless of window size.
+    The first point has no history and gets drift 0.
+    """
+    unit = normalize_rows(vectors.astype(np.float64))
+    csum = np.vstack([np.zeros((1, unit.shape[1])), np.cumsum(unit, axis=0)])
+    idx = np.arange(len(unit))
+    start = np.maximum(idx - window, 0)
+    history = csum[idx] - csum[start]
+    history = normalize_rows(history)
+    drift = 1.0 - (unit * history).sum(axis=1)
+    drift[0] = 0.0
+    return drift
+
+
+def velocity(path: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """Landscape distance travelled per minute between consecutive points."""
+    if len(path) < 2:
+        return np.zeros(len(path))
+    step = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    dt = np.maximum(np.diff(times), 1.0) / 60.0
+    return np.concatenate([[0.0], step / dt])
+
+
+def douglas_peucker(path: np.ndarray, tolerance: float) -> np.ndarray:
+    """Indices of vertices kept by Douglas-Peucker simplification (iterative)."""
+    n = len(path)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        segment = path[last] - path[first]
+        interior = path[first + 1:last] - path[first]
+        length = np.linalg.norm(segment)
+        if length == 0:
+            dists = np.linalg.norm(interior, axis=1)
+        else:
+            dists = np.linalg.norm(np.cross(interior, segment), axis=1) / length
+        farthest = int(dists.argmax())
+        if dists[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+def time_bucket_average(times: np.ndarray, columns: np.ndarray, bucket_seconds: float = BUCKET_SECONDS):
+    """Average rows of `columns` within fixed-width time buckets; returns (times, columns)."""
+    buckets = ((times - times.min()) // bucket_seconds).astype(np.int64)
+    _, inverse, counts = np.unique(buckets, return_inverse=True, return_counts=True)
+    sums = np.zeros((len(counts), columns.shape[1]))
+    np.add.at(sums, inverse, columns)
+    bucket_times = np.bincount(inverse, weights=times) / counts
+    return bucket_times, sums / counts[:, None]
+
+
+def _level(level: int, method: str, times, path, drift, speed, **params) -> dict:
+    return {
+        "level": level,
+        "method": method,
+        **params,
+        "vertices": int(len(path)),
+        "time": np.round(times, 1).tolist(),
+        "path": np.round(path, 4).tolist(),
+        "drift": np.round(drift, 4).tolist(),
+        "velocity": np.round(speed, 4).tolist(),
+    }
+
+
+def build_trajectory(
+    path: np.ndarray,
+    times: np.ndarray,
+    vectors: np.ndarray,
+    window: int = DRIFT_WINDOW,
+    tolerances=DP_TOLERANCES,
+    bucket_seconds: float = BUCKET_SECONDS,
+) -> list:
+    """All levels of detail for one time-ordered speaker path."""
+    drift = rolling_drift(vectors, window)
+    speed = velocity(path, times)
+    levels = [_level(0, "full", times, path, drift, speed)]
+    for i, tolerance in enumerate(tolerances, 1):
+        kept = douglas_peucker(path, tolerance)
+        levels.append(_level(i, "douglas_peucker", times[kept], path[kept], drift[kept], speed[kept],
+                             tolerance=tolerance))
+    bucket_times, averaged = time_bucket_average(times, np.column_stack([path, drift, speed]), bucket_seconds)
+    levels.append(_level(len(tolerances) + 1, "time_bucket", bucket_times, averaged[:, :3],
+                         averaged[:, 3], averaged[:, 4], bucket_seconds=bucket_seconds))
+    return levels
+
+
+def build_trajectories(
+    coords: np.ndarray,
+    times: np.ndarray,
+    speakers: np.ndarray,
+    vectors: np.ndarray,
+    max_vertices: int = MAX_VERTICES,
+    speaker_ids=("marcus", "demartini"),
+) -> tuple[dict, dict]:
+    """Default per-speaker paths plus every level of detail.
+
+    Returns (trajectories, trajectory_levels). `trajectories` keeps the
+    existing {speaker: [[x, y, z], ...]} shape using the finest level that
+    fits within `max_vertices`; levels above the budget are not emitted.
+    """
+    trajectories, trajectory_levels = {}, {}
+    for speaker, idx in speaker_paths(np.asarray(speakers), np.asarray(times, dtype=np.float64)).items():
+        if speaker not in speaker_ids:
+            continue
+        levels = build_trajectory(coords[idx], np.asarray(times, dtype=np.float64)[idx], vectors[idx])
+        shipped = [lvl for lvl in levels if lvl["vertices"] <= max_vertices] or levels[-1:]
+        trajectories[speaker] = shipped[0]["path"]
+        trajectory_levels[speaker] = shipped
+    return trajectories, trajectory_levels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build speaker trajectories with levels of detail")
+    parser.add_argument("--max-vertices", type=int, default=MAX_VERTICES,
+                        help="Largest level of detail to ship")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).parent.parent
+    embeddings_path = base_dir / "data" / "processed" / "embeddings.npy"
+    landscape_path = base_dir / "data" / "processed" / "landscape.json"
+
+    print(f"Loading landscape from: {landscape_path}")
+    with open(landscape_path, "r", encoding="utf-8") as f:
+        landscape = json.load(f)
+    points = landscape["points"]
+
+    embeddings = np.load(embeddings_path)
+    ids = np.array([p["id"] for p in points])
+    coords = np.array([[p["x"], p["y"], p["z"]] for p in points])
+    times = np.array([p["time"] for p in points], dtype=np.float64)
+    speakers = np.array([p["speaker"] for p in points])
+
+    trajectories, levels = build_trajectories(coords, times, speakers, embeddings[ids], args.max_vertices)
+    landscape["trajectories"] = trajectories
+    landscape["trajectory_levels"] = levels
+    landscape["metadata"]["trajectories_built_at"] = datetime.now().isoformat()
+
+    write_json_stream(landscape_path, landscape, "points", points)
+
+    for speaker, speaker_levels in levels.items():
+        counts = ", ".join(f"L{lvl['level']}={lvl['vertices']}" for lvl in speaker_levels)
+        print(f"  {speaker}: {counts}")
+    print(f"\nSaved landscape to: {landscape_path}")
+
+
+if __name__ == "__main__":
+    main()